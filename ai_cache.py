@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Version du format des entrées : à incrémenter si le contenu mis en cache change de nature
+CACHE_VERSION = 1
+
+# Fichier du cache partagé : AI_CACHE_PATH le remplace, XDG_CACHE_HOME déplace le dossier de cache
+DEFAULT_CACHE_DIR = os.getenv('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+DEFAULT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, 'text_to_teamwork', 'ai_responses.sqlite')
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_MEMORY_ENTRIES = 128
+
+
+def normalize_text(text: str) -> str:
+    """Normalise le texte avant hachage (fins de ligne, espaces en fin de ligne, lignes vides autour)."""
+    lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    return '\n'.join(line.rstrip() for line in lines).strip('\n')
+
+
+def make_cache_key(text: str, system_prompt: str, model: str, temperature: float, max_tokens: int,
+                   base_url: Optional[str] = None) -> str:
+    """Construit la clé (SHA-256) d'une requête à partir de tout ce qui influence la réponse."""
+    key_parts = [CACHE_VERSION, text, system_prompt, model, temperature, max_tokens]
+    # Un autre serveur (ex: faux serveur local) ne partage pas les réponses de l'API OpenAI
+    if base_url:
+        key_parts.append(base_url)
+    payload = json.dumps(key_parts, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AIResponseCache:
+    """
+    Cache des réponses OpenAI adressé par le contenu de la requête.
+
+    Deux niveaux : un LRU en mémoire (partagé par le processus) et une base SQLite
+    sur disque qui survit aux redémarrages. Les entrées expirent après `ttl` secondes
+    et les moins récemment utilisées sont supprimées quand la base dépasse `max_bytes`.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_CACHE_PATH, ttl: Optional[float] = DEFAULT_TTL_SECONDS,
+                 max_bytes: int = DEFAULT_MAX_BYTES, memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        """
+        Initialise le cache.
+
+        Args:
+            path: Fichier SQLite (None pour un cache uniquement en mémoire)
+            ttl: Durée de vie d'une entrée en secondes (None = sans expiration)
+            max_bytes: Taille maximale des réponses stockées sur disque
+            memory_entries: Nombre d'entrées gardées dans le LRU en mémoire
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        if path:
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    'CREATE TABLE IF NOT EXISTS responses ('
+                    ' key TEXT PRIMARY KEY, content TEXT NOT NULL, size INTEGER NOT NULL,'
+                    ' created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+                )
+                self._db.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at)')
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"⚠️ Cache IA sur disque indisponible - cache mémoire uniquement: {e}")
+                self._db = None
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """Retourne la réponse en cache pour cette clé, ou None."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                content, created_at = entry
+                if not self._is_expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self.memory_hits += 1
+                    return content
+                del self._memory[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        'SELECT content, created_at FROM responses WHERE key = ?', (key,)
+                    ).fetchone()
+                    if row is not None:
+                        content, created_at = row
+                        if not self._is_expired(created_at, now):
+                            self._db.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+                            self._db.commit()
+                            self._remember(key, content, created_at)
+                            self.hits += 1
+                            self.disk_hits += 1
+                            return content
+                        self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                        self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Erreur lecture cache IA: {e}")
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, content: str) -> None:
+        """Enregistre une réponse dans le cache (mémoire et disque)."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, content, now)
+            self.stores += 1
+
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        'INSERT OR REPLACE INTO responses (key, content, size, created_at, accessed_at)'
+                        ' VALUES (?, ?, ?, ?, ?)',
+                        (key, content, len(content.encode('utf-8')), now, now)
+                    )
+                    self._evict_disk(now)
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Erreur écriture cache IA: {e}")
+
+    def _remember(self, key: str, content: str, created_at: float) -> None:
+        """Ajoute une entrée au LRU mémoire en respectant sa capacité."""
+        self._memory[key] = (content, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_disk(self, now: float) -> None:
+        """Supprime les entrées expirées puis les moins récemment utilisées au-delà de max_bytes."""
+        if self.ttl is not None:
+            cursor = self._db.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl,))
+            self.evictions += max(cursor.rowcount, 0)
+
+        total = self._db.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute('SELECT key, size FROM responses ORDER BY accessed_at').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._db.execute('DELETE FROM responses WHERE key = ?', (key,))
+            total -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Vide le cache (mémoire et disque)."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM responses')
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du cache."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'evictions': self.evictions,
+                'memory_entries': len(self._memory),
+            }
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> AIResponseCache:
+    """
+    Retourne le cache partagé par tout le processus, configuré par les variables d'environnement :
+    AI_CACHE_PATH (vide pour désactiver le disque), AI_CACHE_TTL (secondes),
+    AI_CACHE_MAX_MB et AI_CACHE_MEMORY_ENTRIES.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            ttl = float(os.getenv('AI_CACHE_TTL', DEFAULT_TTL_SECONDS))
+            _default_cache = AIResponseCache(
+                path=os.path.expanduser(os.getenv('AI_CACHE_PATH', DEFAULT_CACHE_PATH)) or None,
+                ttl=ttl if ttl > 0 else None,
+                max_bytes=int(float(os.getenv('AI_CACHE_MAX_MB', DEFAULT_MAX_BYTES / (1024 * 1024))) * 1024 * 1024),
+                memory_entries=int(os.getenv('AI_CACHE_MEMORY_ENTRIES', DEFAULT_MEMORY_ENTRIES)),
+            )
+        return _default_cache
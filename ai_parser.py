@@ -1,36 +1,195 @@
-import openai
+import asyncio
 import json
 import os
-from typing import List, Dict, Optional
-from dotenv import load_dotenv
-import pandas as pd
+import queue
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterator, List, Dict, Optional, Tuple
+from ai_cache import AIResponseCache, get_default_cache, make_cache_key, normalize_text
+from instrumentation import (COUNTER_CACHE_HITS, COUNTER_CACHED_PROMPT_TOKENS, COUNTER_COMPLETION_TOKENS,
+                             COUNTER_PROMPT_TOKENS, STAGE_AI_REQUEST, STAGE_AI_VALIDATE, stage)
+from json_stream import JSONArrayStreamParser
+from line_classifier import LineClassifier, HEADER
+from openai_clients import OpenAIClientRegistry, get_client_registry
+from rate_limiter import RequestScheduler, get_default_scheduler
+from teamwork_row import COLUMNS, TeamworkRow, rows_to_dataframe
+from text_to_teamwork import HYBRID_CONFIDENCE_THRESHOLD, TextToTeamworkConverter
 
-# Charger les variables d'environnement
-load_dotenv()
+# openai, pandas et python-dotenv ne sont importés qu'au moment où ils servent
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Estimation grossière du nombre de caractères par token (texte français)
+CHARS_PER_TOKEN = 4
+
+# Limites des modèles : (fenêtre de contexte, tokens de sortie maximum)
+MODEL_TOKEN_LIMITS = {
+    'gpt-4o-mini': (128000, 16384),
+    'gpt-4o': (128000, 16384),
+    'gpt-4-turbo': (128000, 4096),
+    'gpt-4': (8192, 4096),
+    'gpt-3.5-turbo': (16385, 4096),
+}
+DEFAULT_MODEL_TOKEN_LIMITS = (8192, 4096)
+
+# max_tokens adaptatif : marge sur la taille de réponse estimée, plancher, et surcoût fixe (enveloppe JSON)
+OUTPUT_TOKEN_MARGIN = 1.3
+MIN_OUTPUT_TOKENS = 256
+OUTPUT_OVERHEAD_TOKENS = 16
+
+# Texte peu structuré (prose, e-mail) : le parser classique n'y trouve presque rien et sous-estime la
+# réponse. max_tokens suit alors la taille du texte, sans descendre sous le max_tokens fixe
+UNSTRUCTURED_OUTPUT_RATIO = 1.5
+
+# Estimations (parse classique) gardées par texte : le découpage puis la requête d'une partie
+# réutilisent le même parse
+REQUEST_ESTIMATE_ENTRIES = 128
+
+# Fin du flux d'une partie du document (voir iter_with_ai)
+_STREAM_END = object()
+
+
+class _StreamState:
+    """État de lecture d'une réponse en streaming (voir AITaskParser._stream_rows)."""
+    
+    def __init__(self):
+        self.parser = JSONArrayStreamParser()
+        self.parts = []
+        self.index = 0
+        self.finish_reason = None
+        self.usage = None
+
+# Nombre d'appels dont l'usage des tokens (estimé / réel) est conservé
+TOKEN_USAGE_HISTORY = 256
+
+# Frontières de morceaux définies par le contenu : un groupe de tâche sur N environ
+# (selon l'empreinte de son en-tête) peut ouvrir un morceau une fois la moitié du budget atteinte
+CHUNK_ANCHOR_MODULUS = 8
+
+# Stratégies de parsing IA : document entier (découpé en morceaux si besoin), groupe de tâche par groupe,
+# ou hybride (parser classique, IA pour les seuls groupes peu fiables)
+AI_STRATEGIES = ('document', 'groups', 'hybrid')
+
+# Marqueurs d'un groupe dans les requêtes de la stratégie « groups »
+GROUPS_START_MARKER = 'GROUPES À ANALYSER :\n'
+GROUP_HEADER_PATTERN = re.compile(r'^### GROUPE (\d+)$', re.MULTILINE)
+
+# Mots-clés des lignes qui ne sont pas de vraies tâches (critères, dépendances...)
+NON_TASK_KEYWORDS = ('critère', 'dépendance', 'livrable', 'risque')
+
+# Priorités acceptées dans les réponses de l'IA (en minuscules)
+AI_PRIORITY_NORMALIZATION = {
+    'élevée': 'High', 'haute': 'High', 'high': 'High', 'elevee': 'High', 'urgent': 'High', 'urgente': 'High',
+    'moyenne': 'Medium', 'medium': 'Medium', 'moyen': 'Medium', 'normale': 'Medium', 'normal': 'Medium',
+    'faible': 'Low', 'basse': 'Low', 'low': 'Low', 'bas': 'Low',
+}
+
+# Temps estimé renvoyé par l'IA (ex: "3h", "30 min")
+ESTIMATED_TIME_PATTERN = re.compile(r'(\d+)\s*(h|hr|hour|heure|heures|mn|min|minutes?)')
+
+_environment_loaded = False
+
+def load_environment() -> None:
+    """Charge les variables d'environnement du fichier .env (une seule fois par processus)."""
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _environment_loaded = True
+
+def _clean_value(value) -> str:
+    """Convertit une valeur de la réponse IA en texte sans espaces superflus."""
+    if isinstance(value, str):
+        return value.strip()
+    if value is None:
+        return ''
+    return str(value).strip()
 
 class AITaskParser:
     """
     Parser intelligent utilisant OpenAI pour mapper les tâches vers le format Teamwork.
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True, cache: Optional[AIResponseCache] = None,
+                 base_url: Optional[str] = None, strategy: Optional[str] = None,
+                 scheduler: Optional[RequestScheduler] = None, client_registry: Optional[OpenAIClientRegistry] = None,
+                 classic_converter: Optional[TextToTeamworkConverter] = None):
         """
         Initialise le parser IA.
         
         Args:
             api_key: Clé API OpenAI (optionnel, peut être dans .env)
+            use_cache: Réutiliser les réponses déjà obtenues pour une requête identique
+            cache: Cache à utiliser (par défaut, le cache partagé du processus)
+            base_url: URL d'un serveur compatible OpenAI (optionnel, OPENAI_BASE_URL dans .env)
+            strategy: 'document' (défaut), 'groups' ou 'hybrid' (AI_STRATEGY dans .env), voir
+                      parse_groups_with_ai et parse_hybrid_with_ai
+            scheduler: Ordonnanceur des appels (quotas, nouvelles tentatives ; par défaut, celui du processus)
+            client_registry: Registre des clients OpenAI (pool de connexions ; par défaut, celui du processus)
+            classic_converter: Convertisseur dont les règles (schéma des champs, mots-clés de priorité...)
+                               servent aux estimations et au mode hybride (par défaut, un convertisseur standard)
         """
+        load_environment()
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.base_url = base_url or os.getenv('OPENAI_BASE_URL') or None
+        self.strategy = strategy or os.getenv('AI_STRATEGY') or 'document'
+        if self.strategy not in AI_STRATEGIES:
+            raise ValueError(f"Stratégie IA inconnue : {self.strategy} (attendu : {', '.join(AI_STRATEGIES)})")
         self.client = None
         
+        # Paramètres de la requête (font partie de la clé de cache)
+        self.model = "gpt-4o-mini"  # Plus rapide et moins cher que gpt-4
+        self.temperature = 0.1  # Faible pour consistance
+        self.max_tokens = 2000  # Utilisé tel quel si le max_tokens adaptatif est désactivé
+        
+        # max_tokens calculé pour chaque requête à partir des lignes que produit le parser classique
+        self.adaptive_max_tokens = os.getenv('AI_ADAPTIVE_MAX_TOKENS', '1').lower() not in ('0', 'false', 'no')
+        self.token_usage = deque(maxlen=TOKEN_USAGE_HISTORY)
+        
+        # Mesure des étapes (PipelineMetrics branché par TextToTeamworkConverter.enable_instrumentation)
+        self.instrumentation = None
+        self._classic_converter = classic_converter
+        self._request_estimates = OrderedDict()
+        self._request_estimates_lock = threading.Lock()
+        
+        # Découpage des longs documents : taille d'un morceau et nombre d'appels simultanés
+        self.chunk_tokens = int(os.getenv('AI_CHUNK_TOKENS', 1000))
+        self.max_workers = int(os.getenv('AI_MAX_WORKERS', 4))
+        self.line_classifier = LineClassifier()
+        
+        # Stratégie « groups » : nombre de groupes de tâche par requête
+        self.group_batch_size = int(os.getenv('AI_GROUP_BATCH_SIZE', 8))
+        self.group_stats = {'groups': 0, 'cached_groups': 0, 'requests': 0}
+        
+        # Stratégie « hybrid » : confiance du parser classique sous laquelle un groupe est confié à l'IA
+        self.hybrid_threshold = float(os.getenv('AI_HYBRID_THRESHOLD', HYBRID_CONFIDENCE_THRESHOLD))
+        self.hybrid_stats = {'groups': 0, 'ai_groups': 0, 'failed_groups': 0}
+        
+        self.cache = None
+        if use_cache:
+            self.cache = cache or get_default_cache()
+        
+        # Quotas RPM/TPM et nouvelles tentatives, partagés par tous les parsers du processus
+        self.scheduler = scheduler or get_default_scheduler()
+        
+        # Client partagé entre parsers : connexions keep-alive réutilisées
+        self.client_registry = client_registry or get_client_registry()
         if self.api_key:
             try:
-                self.client = openai.OpenAI(api_key=self.api_key)
+                self.client = self._create_client()
             except Exception as e:
                 print(f"Erreur initialisation client OpenAI: {e}")
                 self.client = None
         
         self.system_prompt = self._build_system_prompt()
+    
+    def _create_client(self):
+        """Client OpenAI synchrone partagé par le processus pour cette clé et ce serveur."""
+        return self.client_registry.get(self.api_key, self.base_url)
         
     def _build_system_prompt(self) -> str:
         """Construit le prompt système optimisé pour Teamwork."""
@@ -102,23 +261,574 @@ COLONNES TEAMWORK :
 
 RETOURNE UNIQUEMENT UN TABLEAU JSON VALIDE."""
 
-    def parse_with_ai(self, text: str, project_title: Optional[str] = None) -> List[Dict[str, str]]:
+    def parse_with_ai(self, text: str, project_title: Optional[str] = None,
+                      on_row: Optional[Callable[[TeamworkRow], None]] = None) -> List[TeamworkRow]:
         """
         Parse le texte en utilisant OpenAI pour un mapping intelligent.
         
+        Les longs documents sont découpés aux frontières des groupes de tâches
+        (mêmes en-têtes que le parser classique) en morceaux de `chunk_tokens`
+        tokens environ, envoyés en parallèle puis réassemblés dans l'ordre.
+        
         Args:
             text: Texte contenant les tâches
             project_title: Titre du projet (optionnel)
+            on_row: Appelée avec chaque tâche validée dès sa réception (réponses en streaming,
+                    stratégie « document » uniquement)
             
         Returns:
             Liste de dictionnaires représentant les tâches
         """
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        if self.strategy == 'groups':
+            return self.parse_groups_with_ai(text, project_title)
+        if self.strategy == 'hybrid':
+            return self.parse_hybrid_with_ai(text, project_title)
+        if on_row is not None:
+            rows = []
+            try:
+                for row in self.iter_with_ai(text, project_title):
+                    rows.append(row)
+                    on_row(row)
+            except Exception as e:
+                print(f"Erreur OpenAI API (streaming): {e}")
+                # Fallback vers parser manuel
+                return []
+            return rows
+        
+        # Même texte (aux espaces et fins de ligne près) → même requête → même clé de cache
+        text = normalize_text(text)
+        
+        chunks = self._fit_chunks(self.split_into_chunks(text))
+        if len(chunks) <= 1:
+            return self._parse_chunk(text, project_title) or []
+        
+        print(f"✂️ Document découpé en {len(chunks)} parties pour l'IA")
+        workers = max(1, min(self.max_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                # Le titre du projet ne sert de fallback que pour la première tâche du document
+                pool.submit(self._parse_chunk, chunk_text, project_title if i == 0 else None, context)
+                for i, (chunk_text, context) in enumerate(chunks)
+            ]
+            results = [future.result() for future in futures]
+        
+        return self._merge_chunk_results(results)
+    
+    def split_into_chunks(self, text: str, chunk_tokens: Optional[int] = None) -> List[Tuple[str, Optional[str]]]:
+        """
+        Découpe le texte en morceaux d'environ `chunk_tokens` tokens, sans couper
+        un groupe de tâche (en-tête + lignes de détail).
+        
+        Returns:
+            Liste de (texte du morceau, tâche principale en cours au début du morceau)
+        """
+        budget_chars = (chunk_tokens or self.chunk_tokens) * CHARS_PER_TOKEN
+        if len(text) <= budget_chars:
+            return [(text, None)]
+        
+        groups = self._split_task_groups(text)
+        
+        # Assembler les groupes en morceaux dans la limite du budget. Les coupures se font
+        # de préférence devant des en-têtes « ancres » : après une modification locale, les
+        # morceaux suivants retombent sur les mêmes frontières et restent dans le cache.
+        chunks = []
+        chunk_lines = []
+        chunk_size = 0
+        chunk_context = None
+        current_tasklist = None
+        for lines, main_task, header in groups:
+            group_size = sum(len(line) + 1 for line in lines)
+            is_anchor = zlib.crc32(header.encode('utf-8')) % CHUNK_ANCHOR_MODULUS == 0
+            if chunk_lines and (chunk_size + group_size > budget_chars
+                                or (is_anchor and chunk_size >= budget_chars // 2)):
+                chunks.append(('\n'.join(chunk_lines).strip('\n'), chunk_context))
+                chunk_lines = []
+                chunk_size = 0
+            if not chunk_lines:
+                # Rappeler la tâche principale en cours, sauf si le morceau commence par une nouvelle
+                chunk_context = None if main_task else current_tasklist
+            chunk_lines.extend(lines)
+            chunk_size += group_size
+            if main_task:
+                current_tasklist = main_task
+        if chunk_lines:
+            chunks.append(('\n'.join(chunk_lines).strip('\n'), chunk_context))
+        
+        return chunks
+    
+    def iter_with_ai(self, text: str, project_title: Optional[str] = None) -> Iterator[TeamworkRow]:
+        """
+        Variante en flux de parse_with_ai : chaque tâche est validée et produite dès
+        que son objet JSON est complet dans la réponse en streaming.
+        
+        Les parties d'un long document sont demandées en parallèle ; leurs tâches sont
+        produites dans l'ordre du document (les parties suivantes sont mises en attente).
+        
+        Raises:
+            ValueError: Si une partie n'a pas pu être parsée (réponse tronquée, JSON invalide,
+                        erreur d'API) ; les tâches déjà produites sont alors incomplètes
+        """
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        
+        text = normalize_text(text)
+        chunks = self._fit_chunks(self.split_into_chunks(text))
+        if len(chunks) > 1:
+            print(f"✂️ Document découpé en {len(chunks)} parties pour l'IA")
+        
+        queues = [queue.Queue() for _ in chunks]
+        workers = max(1, min(self.max_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for i, ((chunk_text, context), rows) in enumerate(zip(chunks, queues)):
+                # Le titre du projet ne sert de fallback que pour la première tâche du document
+                pool.submit(self._stream_chunk_into, rows, chunk_text, project_title if i == 0 else None, context)
+            for i, rows in enumerate(queues):
+                while True:
+                    row = rows.get()
+                    if row is _STREAM_END:
+                        break
+                    if isinstance(row, Exception):
+                        raise ValueError(f"Partie {i + 1}/{len(chunks)} non parsée : {row}") from row
+                    yield row
+    
+    def _stream_chunk_into(self, rows: 'queue.Queue', text: str, project_title: Optional[str],
+                           context: Optional[str]) -> None:
+        """Exécute _stream_chunk dans un thread : tâches, puis erreur éventuelle, puis _STREAM_END."""
+        try:
+            for row in self._stream_chunk(text, project_title, context):
+                rows.put(row)
+        except Exception as e:
+            rows.put(e)
+        finally:
+            rows.put(_STREAM_END)
+    
+    def _stream_chunk(self, text: str, project_title: Optional[str] = None,
+                      context: Optional[str] = None) -> Iterator[TeamworkRow]:
+        """Demande une partie du document en streaming et produit ses tâches validées une à une."""
+        user_prompt = self._build_user_prompt(text, context)
+        budget = self._request_budget(text, user_prompt)
+        if budget is None:
+            raise ValueError("requête trop grande pour le modèle")
+        expected, max_tokens = budget
+        cache_key, content = self._lookup_cache(user_prompt, max_tokens)
+        if content is not None:
+            yield from self._cached_rows(content, project_title)
+            return
+        
+        kwargs = self._stream_kwargs(user_prompt, max_tokens)
+        start = time.perf_counter()
+        stream = self.scheduler.call(lambda: self.client.chat.completions.create(**kwargs),
+                                     self._estimate_prompt_tokens(user_prompt) + max_tokens)
+        
+        state = _StreamState()
+        for chunk in stream:
+            yield from self._stream_rows(chunk, state, project_title)
+        
+        self._finish_stream(state, user_prompt, max_tokens, expected, cache_key, start)
+    
+    def _cached_rows(self, content: str, project_title: Optional[str]) -> Iterator[TeamworkRow]:
+        """Tâches validées d'une réponse servie par le cache."""
+        tasks = self._unwrap_tasks(json.loads(content))
+        for index, task in enumerate(tasks if isinstance(tasks, list) else []):
+            row = self._validate_task(task, index, project_title)
+            if row is not None:
+                yield row
+    
+    def _stream_kwargs(self, user_prompt: str, max_tokens: int) -> Dict:
+        """Paramètres de l'appel chat.completions.create en streaming (usage des tokens en fin de flux)."""
+        kwargs = self._request_kwargs(user_prompt, max_tokens)
+        kwargs.update(stream=True, stream_options={"include_usage": True})
+        return kwargs
+    
+    def _stream_rows(self, chunk, state: '_StreamState', project_title: Optional[str]) -> Iterator[TeamworkRow]:
+        """Tâches validées complétées par un événement du flux de réponse."""
+        state.usage = getattr(chunk, 'usage', None) or state.usage
+        if not chunk.choices:
+            return
+        choice = chunk.choices[0]
+        state.finish_reason = choice.finish_reason or state.finish_reason
+        piece = choice.delta.content
+        if not piece:
+            return
+        state.parts.append(piece)
+        for task in state.parser.feed(piece):
+            row = self._validate_task(task, state.index, project_title)
+            state.index += 1
+            if row is not None:
+                yield row
+    
+    def _finish_stream(self, state: '_StreamState', user_prompt: str, max_tokens: int, expected: int,
+                       cache_key: Optional[str], start: float) -> None:
+        """Enregistre la durée et les tokens d'une réponse en streaming, la vérifie et la met en cache."""
+        # Durée de la réponse complète (mesurée à part : le flux est entrecoupé par le code appelant)
+        if self.instrumentation is not None:
+            self.instrumentation.record(STAGE_AI_REQUEST, time.perf_counter() - start)
+        
+        # Tokens utilisés (dernier événement du flux) ; pas de nouvelle demande, des tâches sont déjà produites
+        usage = state.usage
+        self._check_completion(user_prompt, max_tokens, expected, state.finish_reason, usage, attempt=1)
+        if usage is not None and getattr(usage, 'total_tokens', None) is not None:
+            self.scheduler.record_usage(self._estimate_prompt_tokens(user_prompt) + max_tokens, usage.total_tokens)
+        
+        content = ''.join(state.parts)
+        if state.finish_reason == 'length' or not state.parser.done:
+            raise ValueError(f"réponse incomplète (finish_reason={state.finish_reason})")
+        json.loads(content)
+        # Ne mettre en cache que les réponses JSON valides et complètes
+        if cache_key:
+            self.cache.set(cache_key, content)
+    
+    def _fit_chunks(self, chunks: List[Tuple[str, Optional[str]]]) -> List[Tuple[str, Optional[str]]]:
+        """
+        Redécoupe les morceaux dont la requête dépasserait les limites du modèle
+        (réponse estimée au-delà des tokens de sortie, ou prompt + réponse au-delà de la fenêtre).
+        """
+        fitted = []
+        for chunk_text, context in chunks:
+            if self._fits_model(chunk_text, context):
+                fitted.append((chunk_text, context))
+                continue
+            sub_chunks = self.split_into_chunks(chunk_text, max(1, len(chunk_text) // CHARS_PER_TOKEN // 2))
+            if len(sub_chunks) <= 1:
+                # Un seul groupe de tâche trop grand : la requête sera refusée par _parse_chunk
+                fitted.append((chunk_text, context))
+                continue
+            print(f"✂️ Partie trop grande pour {self.model} : redécoupée en {len(sub_chunks)}")
+            # La première sous-partie commence là où commençait la partie : même contexte
+            sub_chunks[0] = (sub_chunks[0][0], context)
+            fitted.extend(self._fit_chunks(sub_chunks))
+        return fitted
+    
+    def _fits_model(self, text: str, context: Optional[str] = None) -> bool:
+        """Vérifie que la requête d'un texte tient dans les limites du modèle."""
+        context_window, max_output_tokens = MODEL_TOKEN_LIMITS.get(self.model, DEFAULT_MODEL_TOKEN_LIMITS)
+        expected = self._estimate_request(text)[0]
+        prompt_tokens = self._estimate_prompt_tokens(self._build_user_prompt(text, context))
+        max_tokens = self._max_tokens_for(expected, text, prompt_tokens)
+        return expected * OUTPUT_TOKEN_MARGIN <= max_output_tokens and prompt_tokens + max_tokens <= context_window
+    
+    def estimate_output_tokens(self, text: str, group: bool = False) -> int:
+        """
+        Estime la taille (en tokens) de la réponse de l'IA pour un texte.
+        
+        Le parser classique produit les mêmes lignes que l'IA à peu de chose près : la
+        réponse attendue est estimée d'après le JSON de ces lignes, avec les clés du prompt.
+        
+        Args:
+            text: Texte envoyé à l'IA (document, partie ou groupe de tâche)
+            group: Le texte est un groupe de tâche isolé (stratégie « groups »)
+        """
+        converter = self._get_classic_converter()
+        return self._rows_output_tokens(converter.parse_task_group(text) if group else converter.iter_rows(text))
+    
+    @staticmethod
+    def _rows_output_tokens(rows) -> int:
+        """Tokens de la réponse JSON correspondant à des lignes Teamwork (clés du prompt)."""
+        chars = sum(
+            len(json.dumps({'TASKLIST': row.tasklist, 'TASK': row.task, 'DESCRIPTION': row.description,
+                            'PRIORITY': row.priority, 'ESTIMATED_TIME': row.estimated_time}, ensure_ascii=False)) + 2
+            for row in rows
+        )
+        return OUTPUT_OVERHEAD_TOKENS + chars // CHARS_PER_TOKEN
+    
+    def _estimate_request(self, text: str) -> Tuple[int, bool]:
+        """
+        (tokens de réponse estimés, texte bien structuré) d'après un seul parse classique par
+        groupe (plan_hybrid), gardé pour les REQUEST_ESTIMATE_ENTRIES derniers textes : le
+        découpage (_fits_model) et le budget de la requête (_request_budget) ne le refont pas.
+        """
+        with self._request_estimates_lock:
+            estimate = self._request_estimates.get(text)
+            if estimate is not None:
+                self._request_estimates.move_to_end(text)
+                return estimate
+        group_rows, uncertain = self._get_classic_converter().plan_hybrid(text)
+        estimate = (self._rows_output_tokens(row for rows in group_rows for row in rows),
+                    bool(group_rows) and not uncertain)
+        with self._request_estimates_lock:
+            self._request_estimates[text] = estimate
+            while len(self._request_estimates) > REQUEST_ESTIMATE_ENTRIES:
+                self._request_estimates.popitem(last=False)
+        return estimate
+    
+    def _get_classic_converter(self) -> TextToTeamworkConverter:
+        """Parser classique utilisé pour les estimations et le mode hybride (standard, créé à la demande, s'il n'a pas été fourni)."""
+        if self._classic_converter is None:
+            self._classic_converter = TextToTeamworkConverter(use_ai=False)
+        return self._classic_converter
+    
+    def _max_tokens_for(self, expected_tokens: int, text: Optional[str] = None, prompt_tokens: int = 0) -> int:
+        """
+        max_tokens d'une requête dont la réponse attendue fait `expected_tokens` tokens.
+        
+        L'estimation ne vaut que pour un texte bien structuré : si le parse classique de `text`
+        est vide ou peu fiable, max_tokens suit la taille du texte (au moins le max_tokens fixe),
+        dans la place que le prompt (`prompt_tokens`) laisse dans la fenêtre de contexte.
+        """
+        if not self.adaptive_max_tokens:
+            return self.max_tokens
+        context_window, max_output_tokens = MODEL_TOKEN_LIMITS.get(self.model, DEFAULT_MODEL_TOKEN_LIMITS)
+        floor = MIN_OUTPUT_TOKENS
+        if text is not None and not self._is_structured(text):
+            unstructured = max(self.max_tokens, int(len(text) // CHARS_PER_TOKEN * UNSTRUCTURED_OUTPUT_RATIO))
+            floor = max(floor, min(unstructured, context_window - prompt_tokens))
+        return min(max_output_tokens, max(floor, int(expected_tokens * OUTPUT_TOKEN_MARGIN)))
+    
+    def _is_structured(self, text: str) -> bool:
+        """Le parser classique trouve des groupes de tâche dans `text`, tous avec une bonne confiance."""
+        return self._estimate_request(text)[1]
+    
+    def _split_task_groups(self, text: str) -> List[Tuple[List[str], Optional[str], str]]:
+        """
+        Regroupe les lignes par groupe de tâche (le préambule reste avec le premier groupe).
+        
+        Returns:
+            Liste de (lignes, nom de la tâche principale si l'en-tête en est une, en-tête)
+        """
+        groups = []
+        current_lines = []
+        current_main = None
+        current_header = ''
+        seen_header = False
+        for line in text.split('\n'):
+            stripped = line.strip()
+            if stripped:
+                classified = self.line_classifier.classify(stripped)
+                if classified.kind == HEADER:
+                    if seen_header:
+                        groups.append((current_lines, current_main, current_header))
+                        current_lines = []
+                    seen_header = True
+                    current_main = classified.name if classified.is_main else None
+                    current_header = stripped
+            current_lines.append(line)
+        groups.append((current_lines, current_main, current_header))
+        return groups
+    
+    def parse_groups_with_ai(self, text: str, project_title: Optional[str] = None) -> List[TeamworkRow]:
+        """
+        Parse le texte groupe de tâche par groupe de tâche (stratégie « groups »).
+        
+        Chaque groupe (en-tête + lignes de détail, mêmes frontières que le parser classique)
+        est une unité indépendante : les groupes sont envoyés par lots de `group_batch_size`
+        en parallèle et la réponse de chaque groupe est mise en cache séparément. Modifier
+        une tâche ne renvoie que son groupe, les tâches communes à plusieurs documents
+        sont réutilisées, et la taille de chaque réponse reste bornée.
+        
+        Args:
+            text: Texte contenant les tâches
+            project_title: Titre du projet (optionnel)
+            
+        Returns:
+            Liste des tâches validées (vide si un groupe n'a pas pu être parsé)
+        """
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        
+        return self._assemble_group_results(self._run_group_batches(self.split_into_groups(text)), project_title)
+    
+    def parse_task_groups(self, group_texts: List[str],
+                          project_title: Optional[str] = None) -> List[Optional[List[TeamworkRow]]]:
+        """
+        Parse des groupes de tâche indépendants (utilisé par le mode hybride).
+        
+        Args:
+            group_texts: Textes des groupes (en-tête + lignes de détail)
+            project_title: Titre du projet, appliqué au premier groupe de la liste
+            
+        Returns:
+            Tâches validées de chaque groupe, dans l'ordre, ou None pour un groupe non parsé
+        """
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        
+        return self._validate_group_results(self._run_group_batches(group_texts), project_title)
+    
+    def _run_group_batches(self, group_texts: List[str]) -> List[Optional[list]]:
+        """Tâches brutes de chaque groupe : cache, puis lots envoyés en parallèle."""
+        keys, results, batches = self._plan_group_batches(group_texts)
+        if batches:
+            workers = max(1, min(self.max_workers, len(batches)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                contents = list(pool.map(self._send_group_batch, batches))
+            for batch, content in zip(batches, contents):
+                self._store_group_batch(batch, content, keys, results)
+        return results
+    
+    def parse_hybrid_with_ai(self, text: str, project_title: Optional[str] = None) -> List[TeamworkRow]:
+        """
+        Parse le texte avec le parser classique et confie à l'IA les seuls groupes peu fiables
+        (stratégie « hybrid »).
+        
+        Le parser classique note chaque groupe de tâche (voir
+        TextToTeamworkConverter.group_confidence) ; les groupes sous `hybrid_threshold` sont
+        envoyés comme dans la stratégie « groups » (lots, cache par groupe) et leurs tâches
+        remplacent celles du parser classique, dans l'ordre du document. Un groupe que l'IA
+        ne parse pas garde ses lignes classiques : le résultat n'est jamais vide à cause de l'IA.
+        
+        Args:
+            text: Texte contenant les tâches
+            project_title: Titre du projet (optionnel)
+            
+        Returns:
+            Liste des tâches validées
+        """
         if not self.client:
             raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
         
+        converter = self._get_classic_converter()
+        group_rows, uncertain = converter.plan_hybrid(text, self.hybrid_threshold)
+        ai_results = []
+        if uncertain:
+            ai_results = self.parse_task_groups([group_text for _, group_text in uncertain],
+                                                project_title if uncertain[0][0] == 0 else None)
+        return self._merge_hybrid(converter, group_rows, uncertain, ai_results)
+    
+    def _merge_hybrid(self, converter, group_rows: List[List[TeamworkRow]], uncertain: List[Tuple[int, str]],
+                      ai_results: List[Optional[List[TeamworkRow]]]) -> List[TeamworkRow]:
+        """Fusionne les lignes classiques et celles de l'IA et met à jour hybrid_stats."""
+        failed = sum(1 for rows in ai_results if rows is None)
+        self.hybrid_stats = {'groups': len(group_rows), 'ai_groups': len(uncertain), 'failed_groups': failed}
+        print(f"🧠 Mode hybride : {len(uncertain)}/{len(group_rows)} groupes de tâche confiés à l'IA"
+              + (f", {failed} gardé(s) du parser classique" if failed else ""))
+        return converter.merge_hybrid(group_rows, uncertain, ai_results)
+    
+    def split_into_groups(self, text: str) -> List[str]:
+        """Textes des groupes de tâche du document (le préambule reste avec le premier groupe)."""
+        groups = ('\n'.join(lines).strip('\n') for lines, _, _ in self._split_task_groups(normalize_text(text)))
+        return [group for group in groups if group]
+    
+    def _build_group_batch_prompt(self, group_texts: List[str]) -> str:
+        """Construit le prompt utilisateur d'un lot de groupes de tâche."""
+        groups_block = '\n\n'.join(f"### GROUPE {i}\n{group}" for i, group in enumerate(group_texts, 1))
+        return f"""Convertis chacun des groupes de tâches suivants au format Teamwork Excel, indépendamment les uns des autres, en respectant STRICTEMENT les règles :
+
+{GROUPS_START_MARKER}{groups_block}
+
+RÈGLES CRITIQUES :
+1. Tâches principales (code sans point, ex: DC-DM-001) → TASKLIST rempli, TASK = ""
+2. Sous-tâches (code avec point, ex: DC-DM-001.1) → TASKLIST = "", TASK rempli  
+3. Supprimer TOUS les codes (DC-DM-001, DC-DM-001.1, etc.) et numérotation
+4. Extraire temps estimé au format "Xhr" ou "Xmn"
+5. Description consolidée selon type de tâche
+6. Priorités en anglais (High/Medium/Low)
+
+Retourne le JSON : {{"groups": [{{"id": <numéro du groupe>, "tasks": [...]}}, ...]}} avec une entrée par groupe"""
+    
+    def _plan_group_batches(self, group_texts: List[str]) -> Tuple[List[Optional[str]], List[Optional[list]],
+                                                                   List[List[Tuple[int, str]]]]:
+        """
+        Consulte le cache de chaque groupe et répartit les groupes manquants en lots.
+        
+        Returns:
+            (clé de cache de chaque groupe, tâches brutes de chaque groupe ou None, lots de (index, texte))
+        """
+        keys = []
+        results = []
+        missing = []
+        for index, group_text in enumerate(group_texts):
+            # Clé de cache : la requête qu'on enverrait pour ce groupe seul
+            prompt = self._build_group_batch_prompt([group_text])
+            cache_key, content = self._lookup_cache(prompt, self._group_max_tokens([group_text], prompt))
+            keys.append(cache_key)
+            results.append(json.loads(content) if content is not None else None)
+            if content is None:
+                missing.append((index, group_text))
+        
+        # Lots de `group_batch_size` groupes au plus, dont la réponse estimée tient dans la sortie du modèle
+        size = max(1, self.group_batch_size)
+        output_budget = MODEL_TOKEN_LIMITS.get(self.model, DEFAULT_MODEL_TOKEN_LIMITS)[1] / OUTPUT_TOKEN_MARGIN
+        batches = []
+        batch_tokens = 0
+        for index, group_text in missing:
+            group_tokens = self.estimate_output_tokens(group_text, group=True)
+            if not batches or len(batches[-1]) >= size or batch_tokens + group_tokens > output_budget:
+                batches.append([])
+                batch_tokens = 0
+            batches[-1].append((index, group_text))
+            batch_tokens += group_tokens
+        self.group_stats = {'groups': len(group_texts), 'cached_groups': len(group_texts) - len(missing),
+                            'requests': len(batches)}
+        if batches:
+            print(f"🧩 {len(missing)}/{len(group_texts)} groupes de tâche envoyés à l'IA en {len(batches)} requête(s)")
+        return keys, results, batches
+    
+    def _group_expected_tokens(self, group_texts: List[str]) -> int:
+        """Tokens de réponse estimés d'un lot de groupes (somme des réponses de chaque groupe)."""
+        return sum(self.estimate_output_tokens(group_text, group=True) for group_text in group_texts)
+    
+    def _group_max_tokens(self, group_texts: List[str], prompt: str) -> int:
+        """max_tokens de la requête d'un lot de groupes."""
+        return self._max_tokens_for(self._group_expected_tokens(group_texts), '\n\n'.join(group_texts),
+                                    self._estimate_prompt_tokens(prompt))
+    
+    def _send_group_batch(self, batch: List[Tuple[int, str]]) -> Optional[str]:
+        """Envoie un lot de groupes à OpenAI et retourne le contenu de la réponse (None en cas d'erreur)."""
         try:
-            # Prompt utilisateur avec contexte renforcé
-            user_prompt = f"""Convertis ce texte au format Teamwork Excel en respectant STRICTEMENT les règles :
+            group_texts = [group_text for _, group_text in batch]
+            expected = self._group_expected_tokens(group_texts)
+            prompt = self._build_group_batch_prompt(group_texts)
+            return self._complete(prompt, self._group_max_tokens(group_texts, prompt), expected)
+        except Exception as e:
+            print(f"Erreur OpenAI API: {e}")
+            return None
+    
+    def _store_group_batch(self, batch: List[Tuple[int, str]], content: Optional[str],
+                           keys: List[Optional[str]], results: List[Optional[list]]) -> None:
+        """Répartit la réponse d'un lot entre ses groupes et met chaque groupe en cache."""
+        if content is None:
+            return
+        try:
+            parsed = json.loads(content)
+        except json.JSONDecodeError as e:
+            print(f"Erreur parsing JSON: {e}")
+            return
+        
+        entries = parsed.get('groups') if isinstance(parsed, dict) else parsed
+        if not isinstance(entries, list):
+            return
+        tasks_by_id = {}
+        for entry in entries:
+            if isinstance(entry, dict) and isinstance(entry.get('tasks'), list):
+                tasks_by_id[str(entry.get('id'))] = entry['tasks']
+        
+        for position, (index, _) in enumerate(batch, 1):
+            tasks = tasks_by_id.get(str(position))
+            if tasks is None:
+                continue
+            results[index] = tasks
+            if keys[index]:
+                self.cache.set(keys[index], json.dumps(tasks, ensure_ascii=False))
+    
+    def _assemble_group_results(self, results: List[Optional[list]], project_title: Optional[str]) -> List[TeamworkRow]:
+        """Réassemble les tâches des groupes dans l'ordre du document."""
+        # Un groupe manquant rendrait le résultat incomplet : fallback vers le parser classique
+        if any(tasks is None for tasks in results):
+            print("⚠️ Au moins un groupe de tâche n'a pas pu être parsé par l'IA")
+            return []
+        
+        return self._validate_and_clean_tasks([task for tasks in results for task in tasks], project_title)
+    
+    def _validate_group_results(self, results: List[Optional[list]],
+                                project_title: Optional[str]) -> List[Optional[List[TeamworkRow]]]:
+        """Valide les tâches de chaque groupe séparément (None pour un groupe non parsé)."""
+        return [None if tasks is None else self._validate_and_clean_tasks(tasks, project_title if i == 0 else None)
+                for i, tasks in enumerate(results)]
+    
+    def _build_user_prompt(self, text: str, context: Optional[str] = None) -> str:
+        """Construit le prompt utilisateur pour un texte (ou une partie de document)."""
+        context_block = ""
+        if context:
+            context_block = f"""CONTEXTE :
+Ce texte est la suite d'un document plus long. La tâche principale (TASKLIST) en cours est « {context} ».
+Les tâches du début de ce texte en sont des sous-tâches : ne PAS recréer de ligne pour « {context} ».
+
+"""
+        
+        # Prompt utilisateur avec contexte renforcé
+        return f"""{context_block}Convertis ce texte au format Teamwork Excel en respectant STRICTEMENT les règles :
 
 TEXTE À ANALYSER :
 {text}
@@ -138,54 +848,178 @@ VALIDATION :
 - Format temps : "3hr" pas "3h", "30mn" pas "30min"
 
 Retourne le JSON :"""
-
-            # Appel à OpenAI GPT-4 avec le nouveau client
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Plus rapide et moins cher que gpt-4
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.1,  # Faible pour consistance
-                max_tokens=2000,
-                response_format={"type": "json_object"}  # Force JSON
-            )
+    
+    def _parse_chunk(self, text: str, project_title: Optional[str] = None,
+                     context: Optional[str] = None) -> Optional[List[TeamworkRow]]:
+        """
+        Envoie un texte (ou une partie de document) à OpenAI et valide les tâches retournées.
+        
+        Returns:
+            Tâches validées (liste vide si la partie n'en contient aucune), ou None en cas d'échec
+        """
+        try:
+            user_prompt = self._build_user_prompt(text, context)
+            budget = self._request_budget(text, user_prompt)
+            if budget is None:
+                return None
+            expected, max_tokens = budget
+            cache_key, content = self._lookup_cache(user_prompt, max_tokens)
+            from_cache = content is not None
             
-            # Extraire et parser la réponse
-            content = response.choices[0].message.content
+            if not from_cache:
+                # Appel à OpenAI dans les quotas de l'ordonnanceur
+                content = self._complete(user_prompt, max_tokens, expected)
             
-            # Parser le JSON
-            try:
-                parsed_tasks = json.loads(content)
-                
-                # Si la réponse est dans un wrapper
-                if isinstance(parsed_tasks, dict):
-                    if 'tasks' in parsed_tasks:
-                        parsed_tasks = parsed_tasks['tasks']
-                    elif 'data' in parsed_tasks:
-                        parsed_tasks = parsed_tasks['data']
-                    else:
-                        # Prendre la première liste trouvée
-                        for value in parsed_tasks.values():
-                            if isinstance(value, list):
-                                parsed_tasks = value
-                                break
-                
-                # Valider et nettoyer les résultats
-                return self._validate_and_clean_tasks(parsed_tasks, project_title)
-                
-            except json.JSONDecodeError as e:
-                print(f"Erreur parsing JSON: {e}")
-                print(f"Contenu reçu: {content}")
-                # Fallback vers parser manuel
-                return []
+            return self._tasks_from_content(content, project_title, cache_key, from_cache)
                 
         except Exception as e:
             print(f"Erreur OpenAI API: {e}")
             # Fallback vers parser manuel
+            return None
+    
+    def _request_budget(self, text: str, user_prompt: str) -> Optional[Tuple[int, int]]:
+        """
+        (tokens de réponse estimés, max_tokens) de la requête d'un texte, ou None si elle
+        dépasse les limites du modèle (requête refusée : fallback vers le parser classique).
+        """
+        context_window, max_output_tokens = MODEL_TOKEN_LIMITS.get(self.model, DEFAULT_MODEL_TOKEN_LIMITS)
+        expected = self._estimate_request(text)[0]
+        prompt_tokens = self._estimate_prompt_tokens(user_prompt)
+        max_tokens = self._max_tokens_for(expected, text, prompt_tokens)
+        if expected > max_output_tokens or prompt_tokens + max_tokens > context_window:
+            print(f"❌ Requête refusée : ~{prompt_tokens} tokens de prompt et ~{expected} tokens de réponse "
+                  f"dépassent les limites de {self.model} ({context_window} / {max_output_tokens})")
+            return None
+        return expected, max_tokens
+    
+    def _lookup_cache(self, user_prompt: str, max_tokens: int) -> Tuple[Optional[str], Optional[str]]:
+        """Retourne (clé de cache, réponse en cache ou None)."""
+        if not self.cache:
+            return None, None
+        cache_key = make_cache_key(user_prompt, self.system_prompt, self.model, self.temperature, max_tokens,
+                                   self.base_url)
+        content = self.cache.get(cache_key)
+        if content is not None and self.instrumentation is not None:
+            self.instrumentation.count(COUNTER_CACHE_HITS)
+        return cache_key, content
+    
+    def _complete(self, user_prompt: str, max_tokens: int, expected_tokens: Optional[int] = None) -> str:
+        """
+        Envoie la requête via l'ordonnanceur (quotas, nouvelles tentatives) et retourne le contenu.
+        
+        Une réponse coupée par max_tokens (finish_reason = length) est redemandée une fois
+        avec un max_tokens doublé.
+        """
+        for attempt in range(2):
+            kwargs = self._request_kwargs(user_prompt, max_tokens)
+            with stage(self.instrumentation, STAGE_AI_REQUEST):
+                response = self.scheduler.call(lambda: self.client.chat.completions.create(**kwargs),
+                                               self._estimate_prompt_tokens(user_prompt) + max_tokens)
+            max_tokens = self._check_completion(user_prompt, max_tokens, expected_tokens,
+                                                getattr(response.choices[0], 'finish_reason', None),
+                                                getattr(response, 'usage', None), attempt)
+            if max_tokens is None:
+                break
+        return response.choices[0].message.content
+    
+    def _check_completion(self, user_prompt: str, max_tokens: int, expected_tokens: Optional[int],
+                          finish_reason: Optional[str], usage, attempt: int) -> Optional[int]:
+        """
+        Enregistre l'usage des tokens d'une réponse (estimé / réel).
+        
+        Returns:
+            Nouveau max_tokens si la réponse a été coupée et peut être redemandée, sinon None
+        """
+        details = getattr(usage, 'prompt_tokens_details', None)
+        report = {
+            'prompt_estimated': self._estimate_prompt_tokens(user_prompt),
+            'prompt_actual': getattr(usage, 'prompt_tokens', None),
+            'prompt_cached': getattr(details, 'cached_tokens', None),
+            'completion_estimated': expected_tokens,
+            'completion_actual': getattr(usage, 'completion_tokens', None),
+            'max_tokens': max_tokens,
+            'finish_reason': finish_reason,
+        }
+        self.token_usage.append(report)
+        metrics = self.instrumentation
+        if metrics is not None:
+            metrics.count(COUNTER_PROMPT_TOKENS, report['prompt_actual'] or 0)
+            metrics.count(COUNTER_CACHED_PROMPT_TOKENS, report['prompt_cached'] or 0)
+            metrics.count(COUNTER_COMPLETION_TOKENS, report['completion_actual'] or 0)
+        if report['prompt_actual'] is not None:
+            print(f"🔢 Tokens : prompt {report['prompt_actual']} (estimé {report['prompt_estimated']}), "
+                  f"réponse {report['completion_actual']}/{max_tokens} (estimé {report['completion_estimated']})")
+        
+        max_output_tokens = MODEL_TOKEN_LIMITS.get(self.model, DEFAULT_MODEL_TOKEN_LIMITS)[1]
+        if finish_reason == 'length' and attempt == 0 and max_tokens < max_output_tokens:
+            print(f"⚠️ Réponse coupée à {max_tokens} tokens - nouvelle demande avec {min(max_output_tokens, max_tokens * 2)}")
+            return min(max_output_tokens, max_tokens * 2)
+        return None
+    
+    def _estimate_prompt_tokens(self, user_prompt: str) -> int:
+        """Tokens estimés du prompt (système + utilisateur)."""
+        return (len(self.system_prompt) + len(user_prompt)) // CHARS_PER_TOKEN
+    
+    def _request_kwargs(self, user_prompt: str, max_tokens: Optional[int] = None) -> Dict:
+        """Paramètres de l'appel chat.completions.create."""
+        return dict(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=self.temperature,
+            max_tokens=max_tokens or self.max_tokens,
+            response_format={"type": "json_object"}  # Force JSON
+        )
+    
+    def _tasks_from_content(self, content: str, project_title: Optional[str], cache_key: Optional[str],
+                            from_cache: bool) -> Optional[List[TeamworkRow]]:
+        """Décode la réponse JSON, la met en cache si valide et valide les tâches (None si JSON invalide)."""
+        # Parser le JSON
+        try:
+            parsed_tasks = json.loads(content)
+        except json.JSONDecodeError as e:
+            print(f"Erreur parsing JSON: {e}")
+            print(f"Contenu reçu: {content}")
+            # Fallback vers parser manuel
+            return None
+        
+        # Ne mettre en cache que les réponses JSON valides
+        if cache_key and not from_cache:
+            self.cache.set(cache_key, content)
+        
+        # Valider et nettoyer les résultats
+        return self._validate_and_clean_tasks(self._unwrap_tasks(parsed_tasks), project_title)
+    
+    @staticmethod
+    def _merge_chunk_results(results: List[Optional[List[TeamworkRow]]]) -> List[TeamworkRow]:
+        """Réassemble les tâches des morceaux dans l'ordre du document."""
+        # Une partie en échec (None) rendrait le résultat incomplet : fallback vers le parser classique.
+        # Une partie sans tâche (préambule, notes) est un résultat valide.
+        if any(tasks is None for tasks in results):
+            print("⚠️ Au moins une partie du document n'a pas pu être parsée par l'IA")
             return []
+        
+        return [task for tasks in results for task in tasks]
+    
+    @staticmethod
+    def _unwrap_tasks(parsed_tasks):
+        """Extrait la liste de tâches si la réponse est dans un wrapper JSON."""
+        if isinstance(parsed_tasks, dict):
+            if 'tasks' in parsed_tasks:
+                parsed_tasks = parsed_tasks['tasks']
+            elif 'data' in parsed_tasks:
+                parsed_tasks = parsed_tasks['data']
+            else:
+                # Prendre la première liste trouvée
+                for value in parsed_tasks.values():
+                    if isinstance(value, list):
+                        parsed_tasks = value
+                        break
+        return parsed_tasks
     
-    def _validate_and_clean_tasks(self, tasks: List[Dict], project_title: Optional[str] = None) -> List[Dict[str, str]]:
+    def _validate_and_clean_tasks(self, tasks: List[Dict], project_title: Optional[str] = None) -> List[TeamworkRow]:
         """
         Valide et nettoie les tâches retournées par l'IA avec corrections automatiques.
         
@@ -200,92 +1034,81 @@ Retourne le JSON :"""
             return []
         
         validated_tasks = []
-        required_columns = [
-            'TASKLIST', 'TASK', 'DESCRIPTION', 'ASSIGN TO', 
-            'START DATE', 'DUE DATE', 'PRIORITY', 'ESTIMATED TIME', 
-            'TAGS', 'STATUS'
-        ]
         
-        for i, task in enumerate(tasks):
-            if not isinstance(task, dict):
-                continue
-            
-            # Créer une tâche validée avec toutes les colonnes
-            validated_task = {}
-            
-            for col in required_columns:
-                # Récupérer la valeur ou vide
-                value = task.get(col, '')
-                
-                # Nettoyer les valeurs
-                if isinstance(value, str):
-                    value = value.strip()
-                elif value is None:
-                    value = ''
-                else:
-                    value = str(value).strip()
-                
-                validated_task[col] = value
-            
-            # VALIDATION CRITÈRES D'ACCEPTATION - Filtrer les tâches qui ne sont que des critères
-            task_name = validated_task['TASK'].lower() if validated_task['TASK'] else ''
-            tasklist_name = validated_task['TASKLIST'].lower() if validated_task['TASKLIST'] else ''
-            
-            # Ignorer les lignes qui sont juste des critères/descriptions
-            if any(keyword in task_name for keyword in ['critère', 'dépendance', 'livrable', 'risque']) and len(task_name) < 50:
-                print(f"⚠️ Ligne ignorée (critère non-tâche) : {validated_task['TASK']}")
-                continue
-                
-            if any(keyword in tasklist_name for keyword in ['critère', 'dépendance', 'livrable', 'risque']) and len(tasklist_name) < 50:
-                print(f"⚠️ Ligne ignorée (critère non-tâche) : {validated_task['TASKLIST']}")
-                continue
-            
-            # CORRECTION HIÉRARCHIE - Règle exclusive TASKLIST vs TASK
-            if validated_task['TASKLIST'] and validated_task['TASK']:
-                print(f"🔧 Correction hiérarchie : {validated_task['TASKLIST']} | {validated_task['TASK']}")
-                # Si les deux sont remplis, priorité au TASKLIST (tâche principale)
-                validated_task['TASK'] = ''
-            
-            # Si c'est la première tâche et pas de TASKLIST, utiliser project_title
-            if i == 0 and not validated_task['TASKLIST'] and not validated_task['TASK'] and project_title:
-                validated_task['TASKLIST'] = project_title
-            
-            # Ignorer les tâches complètement vides
-            if not validated_task['TASKLIST'] and not validated_task['TASK']:
-                continue
-            
-            # Valider les priorités
-            priority = validated_task['PRIORITY'].lower()
-            if priority in ['élevée', 'haute', 'high', 'elevee', 'urgent', 'urgente']:
-                validated_task['PRIORITY'] = 'High'
-            elif priority in ['moyenne', 'medium', 'moyen', 'normale', 'normal']:
-                validated_task['PRIORITY'] = 'Medium'
-            elif priority in ['faible', 'basse', 'low', 'bas']:
-                validated_task['PRIORITY'] = 'Low'
-            elif priority:
-                # Garder tel quel si pas reconnu mais pas vide
-                validated_task['PRIORITY'] = validated_task['PRIORITY']
-            else:
-                validated_task['PRIORITY'] = ''
+        with stage(self.instrumentation, STAGE_AI_VALIDATE, len(tasks)):
+            for i, task in enumerate(tasks):
+                row = self._validate_task(task, i, project_title)
+                if row is not None:
+                    validated_tasks.append(row)
+        
+        return validated_tasks
+
+    def _validate_task(self, task: Dict, i: int, project_title: Optional[str] = None) -> Optional[TeamworkRow]:
+        """
+        Valide et nettoie une tâche retournée par l'IA (utilisé aussi pendant le streaming).
+        
+        Args:
+            task: Tâche brute de l'IA
+            i: Position de la tâche dans la réponse
+            project_title: Titre du projet pour fallback (première tâche)
             
-            # Valider et normaliser le temps estimé
-            estimated_time = validated_task.get('ESTIMATED_TIME', '').strip()
-            if estimated_time:
-                # Normaliser le format du temps
-                # "3h" → "3hr", "30min" → "30mn", etc.
-                import re
-                time_match = re.search(r'(\d+)\s*(h|hr|hour|heure|heures|mn|min|minutes?)', estimated_time.lower())
-                if time_match:
-                    number = time_match.group(1)
-                    unit = time_match.group(2)
-                    if unit in ['h', 'hr', 'hour', 'heure', 'heures']:
-                        validated_task['ESTIMATED_TIME'] = f"{number}hr"
-                    elif unit in ['mn', 'min', 'minute', 'minutes']:
-                        validated_task['ESTIMATED_TIME'] = f"{number}mn"
+        Returns:
+            Tâche validée et corrigée, ou None si la ligne est ignorée
+        """
+        if not isinstance(task, dict):
+            return None
+        
+        # Récupérer chaque colonne (ou vide) et nettoyer les valeurs
+        values = [_clean_value(task.get(col, '')) for col in COLUMNS]
+        tasklist, task_name, description, assign_to, start_date, due_date, priority, estimated_time, tags, status = values
+        
+        # VALIDATION CRITÈRES D'ACCEPTATION - Filtrer les tâches qui ne sont que des critères
+        task_lower = task_name.lower()
+        tasklist_lower = tasklist.lower()
+        
+        # Ignorer les lignes qui sont juste des critères/descriptions
+        if any(keyword in task_lower for keyword in NON_TASK_KEYWORDS) and len(task_lower) < 50:
+            print(f"⚠️ Ligne ignorée (critère non-tâche) : {task_name}")
+            return None
             
-            validated_tasks.append(validated_task)
+        if any(keyword in tasklist_lower for keyword in NON_TASK_KEYWORDS) and len(tasklist_lower) < 50:
+            print(f"⚠️ Ligne ignorée (critère non-tâche) : {tasklist}")
+            return None
         
-        return validated_tasks
+        # CORRECTION HIÉRARCHIE - Règle exclusive TASKLIST vs TASK
+        if tasklist and task_name:
+            print(f"🔧 Correction hiérarchie : {tasklist} | {task_name}")
+            # Si les deux sont remplis, priorité au TASKLIST (tâche principale)
+            task_name = ''
+        
+        # Si c'est la première tâche et pas de TASKLIST, utiliser project_title
+        if i == 0 and not tasklist and not task_name and project_title:
+            tasklist = project_title
+        
+        # Ignorer les tâches complètement vides
+        if not tasklist and not task_name:
+            return None
+        
+        # Valider les priorités (les valeurs non reconnues sont gardées telles quelles)
+        priority = AI_PRIORITY_NORMALIZATION.get(priority.lower(), priority)
+        
+        # Valider et normaliser le temps estimé : "3h" → "3hr", "30min" → "30mn", etc.
+        # (le prompt demande la clé ESTIMATED_TIME, la colonne Teamwork est ESTIMATED TIME)
+        estimated_time = estimated_time or _clean_value(task.get('ESTIMATED_TIME', ''))
+        if estimated_time:
+            time_match = ESTIMATED_TIME_PATTERN.search(estimated_time.lower())
+            if time_match:
+                number = time_match.group(1)
+                unit = time_match.group(2)
+                if unit in ['h', 'hr', 'hour', 'heure', 'heures']:
+                    estimated_time = f"{number}hr"
+                elif unit in ['mn', 'min', 'minute', 'minutes']:
+                    estimated_time = f"{number}mn"
+        
+        return TeamworkRow(
+            tasklist, task_name, description, assign_to, start_date, due_date,
+            priority, estimated_time, tags, status
+        )
 
     def is_available(self) -> bool:
         """Vérifie si l'API OpenAI est disponible."""
@@ -298,7 +1121,7 @@ Retourne le JSON :"""
         
         try:
             response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
+                model=self.model,
                 messages=[{"role": "user", "content": "Hello"}],
                 max_tokens=5
             )
@@ -306,12 +1129,350 @@ Retourne le JSON :"""
         except Exception:
             return False
 
+class AsyncAITaskParser(AITaskParser):
+    """
+    Variante asynchrone du parser IA, basée sur openai.AsyncOpenAI.
+    
+    Partage avec AITaskParser la construction des prompts, le découpage, le cache
+    et la validation des tâches. Chaque requête est bornée par `request_timeout`,
+    l'annulation de la tâche asyncio annule les requêtes en cours, et parse_many()
+    convertit plusieurs documents en parallèle sous un sémaphore.
+    """
+    
+    def __init__(self, api_key: Optional[str] = None, use_cache: bool = True, cache: Optional[AIResponseCache] = None,
+                 request_timeout: float = 60.0, max_concurrency: int = 8, base_url: Optional[str] = None,
+                 strategy: Optional[str] = None, scheduler: Optional[RequestScheduler] = None,
+                 client_registry: Optional[OpenAIClientRegistry] = None,
+                 classic_converter: Optional[TextToTeamworkConverter] = None):
+        """
+        Initialise le parser IA asynchrone.
+        
+        Args:
+            api_key: Clé API OpenAI (optionnel, peut être dans .env)
+            use_cache: Réutiliser les réponses déjà obtenues pour une requête identique
+            cache: Cache à utiliser (par défaut, le cache partagé du processus)
+            request_timeout: Délai maximal d'une requête OpenAI en secondes
+            max_concurrency: Nombre maximal de requêtes OpenAI simultanées
+            base_url: URL d'un serveur compatible OpenAI (optionnel, OPENAI_BASE_URL dans .env)
+            strategy: 'document' (défaut), 'groups' ou 'hybrid' (AI_STRATEGY dans .env)
+            scheduler: Ordonnanceur des appels (quotas, nouvelles tentatives ; par défaut, celui du processus)
+            client_registry: Registre des clients OpenAI (configuration du pool de connexions)
+            classic_converter: Convertisseur dont les règles servent aux estimations et au mode hybride
+        """
+        self.request_timeout = request_timeout
+        self.max_concurrency = max_concurrency
+        super().__init__(api_key=api_key, use_cache=use_cache, cache=cache, base_url=base_url, strategy=strategy,
+                         scheduler=scheduler, client_registry=client_registry, classic_converter=classic_converter)
+    
+    def _create_client(self):
+        """Crée le client OpenAI asynchrone (propre au parser : ses connexions sont liées à une boucle asyncio)."""
+        return self.client_registry.create_async(self.api_key, self.base_url, self.request_timeout)
+    
+    async def aclose(self) -> None:
+        """
+        Ferme les connexions du client asynchrone, liées à la boucle asyncio en cours.
+        
+        Le client est remplacé par un client neuf (sans connexion ouverte) : le parser
+        reste utilisable dans une autre boucle, par exemple un nouvel asyncio.run.
+        """
+        if self.client:
+            client, self.client = self.client, self._create_client()
+            await client.close()
+    
+    async def __aenter__(self) -> 'AsyncAITaskParser':
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def parse_with_ai(self, text: str, project_title: Optional[str] = None,
+                            semaphore: Optional[asyncio.Semaphore] = None) -> List[TeamworkRow]:
+        """
+        Parse le texte avec OpenAI sans bloquer la boucle d'événements.
+        
+        Args:
+            text: Texte contenant les tâches
+            project_title: Titre du projet (optionnel)
+            semaphore: Sémaphore limitant les requêtes simultanées (partagé par parse_many)
+            
+        Returns:
+            Liste de dictionnaires représentant les tâches
+        """
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self.strategy == 'groups':
+            return await self.parse_groups_with_ai(text, project_title, semaphore)
+        if self.strategy == 'hybrid':
+            return await self.parse_hybrid_with_ai(text, project_title, semaphore)
+        
+        text = normalize_text(text)
+        chunks = self._fit_chunks(self.split_into_chunks(text))
+        if len(chunks) <= 1:
+            return await self._parse_chunk(text, project_title, None, semaphore) or []
+        
+        print(f"✂️ Document découpé en {len(chunks)} parties pour l'IA")
+        results = await asyncio.gather(*(
+            self._parse_chunk(chunk_text, project_title if i == 0 else None, context, semaphore)
+            for i, (chunk_text, context) in enumerate(chunks)
+        ))
+        return self._merge_chunk_results(list(results))
+    
+    async def iter_with_ai(self, text: str, project_title: Optional[str] = None,
+                           semaphore: Optional[asyncio.Semaphore] = None) -> AsyncIterator[TeamworkRow]:
+        """
+        Variante asynchrone de AITaskParser.iter_with_ai (`async for row in parser.iter_with_ai(text)`).
+        
+        Les parties sont demandées en parallèle sous le sémaphore ; leurs tâches sont produites
+        dans l'ordre du document. Quitter la boucle annule les requêtes encore en cours.
+        
+        Raises:
+            ValueError: Si une partie n'a pas pu être parsée ; les tâches déjà produites sont alors incomplètes
+        """
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        text = normalize_text(text)
+        chunks = self._fit_chunks(self.split_into_chunks(text))
+        if len(chunks) > 1:
+            print(f"✂️ Document découpé en {len(chunks)} parties pour l'IA")
+        
+        queues = [asyncio.Queue() for _ in chunks]
+        producers = [
+            # Le titre du projet ne sert de fallback que pour la première tâche du document
+            asyncio.ensure_future(self._stream_chunk_into(rows, chunk_text, project_title if i == 0 else None,
+                                                          context, semaphore))
+            for i, ((chunk_text, context), rows) in enumerate(zip(chunks, queues))
+        ]
+        try:
+            for i, rows in enumerate(queues):
+                while True:
+                    row = await rows.get()
+                    if row is _STREAM_END:
+                        break
+                    if isinstance(row, Exception):
+                        raise ValueError(f"Partie {i + 1}/{len(chunks)} non parsée : {row}") from row
+                    yield row
+        finally:
+            for producer in producers:
+                producer.cancel()
+            await asyncio.gather(*producers, return_exceptions=True)
+    
+    async def _stream_chunk_into(self, rows: asyncio.Queue, text: str, project_title: Optional[str],
+                                 context: Optional[str], semaphore: asyncio.Semaphore) -> None:
+        """Exécute _stream_chunk dans une tâche asyncio : tâches, puis erreur éventuelle, puis _STREAM_END."""
+        try:
+            async for row in self._stream_chunk(text, project_title, context, semaphore):
+                rows.put_nowait(row)
+        except asyncio.TimeoutError:
+            rows.put_nowait(ValueError(f"requête abandonnée après {self.request_timeout}s"))
+        except Exception as e:
+            rows.put_nowait(e)
+        finally:
+            rows.put_nowait(_STREAM_END)
+    
+    async def _stream_chunk(self, text: str, project_title: Optional[str] = None, context: Optional[str] = None,
+                            semaphore: Optional[asyncio.Semaphore] = None) -> AsyncIterator[TeamworkRow]:
+        """Variante asynchrone de AITaskParser._stream_chunk."""
+        user_prompt = self._build_user_prompt(text, context)
+        budget = self._request_budget(text, user_prompt)
+        if budget is None:
+            raise ValueError("requête trop grande pour le modèle")
+        expected, max_tokens = budget
+        cache_key, content = self._lookup_cache(user_prompt, max_tokens)
+        if content is not None:
+            for row in self._cached_rows(content, project_title):
+                yield row
+            return
+        
+        kwargs = self._stream_kwargs(user_prompt, max_tokens)
+        
+        semaphore = semaphore or asyncio.Semaphore(self.max_concurrency)
+        
+        async def attempt():
+            # Sémaphore pris à chaque tentative, comme dans _complete (pas pendant l'attente du quota
+            # ni le backoff) ; une tentative réussie le garde pour la lecture du flux
+            await semaphore.acquire()
+            try:
+                return await asyncio.wait_for(self.client.chat.completions.create(**kwargs),
+                                              timeout=self.request_timeout)
+            except BaseException:
+                semaphore.release()
+                raise
+        
+        start = time.perf_counter()
+        state = _StreamState()
+        stream = await self.scheduler.call_async(attempt, self._estimate_prompt_tokens(user_prompt) + max_tokens)
+        # La connexion reste occupée jusqu'à la fin de la réponse : sémaphore rendu après la lecture
+        try:
+            async for chunk in stream:
+                for row in self._stream_rows(chunk, state, project_title):
+                    yield row
+        finally:
+            semaphore.release()
+        
+        self._finish_stream(state, user_prompt, max_tokens, expected, cache_key, start)
+    
+    async def parse_groups_with_ai(self, text: str, project_title: Optional[str] = None,
+                                   semaphore: Optional[asyncio.Semaphore] = None) -> List[TeamworkRow]:
+        """Variante asynchrone de AITaskParser.parse_groups_with_ai (lots envoyés sous le sémaphore)."""
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        results = await self._run_group_batches(self.split_into_groups(text), semaphore)
+        return self._assemble_group_results(results, project_title)
+    
+    async def parse_hybrid_with_ai(self, text: str, project_title: Optional[str] = None,
+                                   semaphore: Optional[asyncio.Semaphore] = None) -> List[TeamworkRow]:
+        """Variante asynchrone de AITaskParser.parse_hybrid_with_ai."""
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        
+        converter = self._get_classic_converter()
+        group_rows, uncertain = converter.plan_hybrid(text, self.hybrid_threshold)
+        ai_results = []
+        if uncertain:
+            ai_results = await self.parse_task_groups([group_text for _, group_text in uncertain],
+                                                      project_title if uncertain[0][0] == 0 else None, semaphore)
+        return self._merge_hybrid(converter, group_rows, uncertain, ai_results)
+    
+    async def parse_task_groups(self, group_texts: List[str], project_title: Optional[str] = None,
+                                semaphore: Optional[asyncio.Semaphore] = None) -> List[Optional[List[TeamworkRow]]]:
+        """Variante asynchrone de AITaskParser.parse_task_groups."""
+        if not self.client:
+            raise ValueError("Client OpenAI non initialisé. Vérifiez votre clé API.")
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        results = await self._run_group_batches(group_texts, semaphore)
+        return self._validate_group_results(results, project_title)
+    
+    async def _run_group_batches(self, group_texts: List[str], semaphore: asyncio.Semaphore) -> List[Optional[list]]:
+        keys, results, batches = self._plan_group_batches(group_texts)
+        contents = await asyncio.gather(*(self._send_group_batch(batch, semaphore) for batch in batches))
+        for batch, content in zip(batches, contents):
+            self._store_group_batch(batch, content, keys, results)
+        return results
+    
+    async def _send_group_batch(self, batch: List[Tuple[int, str]],
+                                semaphore: Optional[asyncio.Semaphore] = None) -> Optional[str]:
+        """Envoie un lot de groupes à OpenAI et retourne le contenu de la réponse (None en cas d'erreur)."""
+        try:
+            group_texts = [group_text for _, group_text in batch]
+            expected = self._group_expected_tokens(group_texts)
+            prompt = self._build_group_batch_prompt(group_texts)
+            return await self._complete(prompt, self._group_max_tokens(group_texts, prompt), expected, semaphore)
+        except asyncio.TimeoutError:
+            print(f"⏱️ Requête OpenAI abandonnée après {self.request_timeout}s")
+            return None
+        except Exception as e:
+            print(f"Erreur OpenAI API: {e}")
+            return None
+    
+    async def parse_many(self, texts: List[str], project_titles: Optional[List[Optional[str]]] = None) -> List[List[TeamworkRow]]:
+        """
+        Parse plusieurs documents en parallèle (au plus `max_concurrency` requêtes à la fois).
+        
+        Args:
+            texts: Textes à convertir
+            project_titles: Titre du projet de chaque texte (optionnel)
+            
+        Returns:
+            Liste des tâches de chaque document, dans l'ordre des textes
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        titles = project_titles or [None] * len(texts)
+        results = await asyncio.gather(*(
+            self.parse_with_ai(text, title, semaphore)
+            for text, title in zip(texts, titles)
+        ))
+        return list(results)
+    
+    async def _parse_chunk(self, text: str, project_title: Optional[str] = None, context: Optional[str] = None,
+                           semaphore: Optional[asyncio.Semaphore] = None) -> Optional[List[TeamworkRow]]:
+        """Variante asynchrone de AITaskParser._parse_chunk (None en cas d'échec)."""
+        try:
+            user_prompt = self._build_user_prompt(text, context)
+            budget = self._request_budget(text, user_prompt)
+            if budget is None:
+                return None
+            expected, max_tokens = budget
+            cache_key, content = self._lookup_cache(user_prompt, max_tokens)
+            from_cache = content is not None
+            
+            if not from_cache:
+                content = await self._complete(user_prompt, max_tokens, expected, semaphore)
+            
+            return self._tasks_from_content(content, project_title, cache_key, from_cache)
+        
+        except asyncio.TimeoutError:
+            print(f"⏱️ Requête OpenAI abandonnée après {self.request_timeout}s")
+            return None
+        except Exception as e:
+            print(f"Erreur OpenAI API: {e}")
+            # Fallback vers parser manuel
+            return None
+    
+    async def _complete(self, user_prompt: str, max_tokens: int, expected_tokens: Optional[int] = None,
+                        semaphore: Optional[asyncio.Semaphore] = None) -> str:
+        """
+        Envoie la requête via l'ordonnanceur et retourne le contenu.
+        
+        Le sémaphore n'est tenu que pendant chaque tentative (pas pendant l'attente du
+        quota ni le backoff) ; chaque tentative est bornée par `request_timeout`.
+        """
+        semaphore = semaphore or asyncio.Semaphore(self.max_concurrency)
+        
+        for retry in range(2):
+            kwargs = self._request_kwargs(user_prompt, max_tokens)
+            
+            async def attempt():
+                async with semaphore:
+                    return await asyncio.wait_for(self.client.chat.completions.create(**kwargs),
+                                                  timeout=self.request_timeout)
+            
+            # Mesure sans imbrication : les requêtes concurrentes s'entrecroisent sur le même thread
+            start = time.perf_counter()
+            response = await self.scheduler.call_async(attempt, self._estimate_prompt_tokens(user_prompt) + max_tokens)
+            if self.instrumentation is not None:
+                self.instrumentation.record(STAGE_AI_REQUEST, time.perf_counter() - start)
+            max_tokens = self._check_completion(user_prompt, max_tokens, expected_tokens,
+                                                getattr(response.choices[0], 'finish_reason', None),
+                                                getattr(response, 'usage', None), retry)
+            if max_tokens is None:
+                break
+        return response.choices[0].message.content
+    
+    async def test_connection(self) -> bool:
+        """Teste la connexion à l'API OpenAI."""
+        if not self.client:
+            return False
+        
+        try:
+            await asyncio.wait_for(
+                self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": "Hello"}],
+                    max_tokens=5
+                ),
+                timeout=self.request_timeout
+            )
+            return True
+        except Exception:
+            return False
+
 # Fonctions utilitaires pour l'interface
-def create_ai_parser(api_key: str = None) -> AITaskParser:
+def create_ai_parser(api_key: str = None, base_url: str = None, strategy: str = None) -> AITaskParser:
     """Créer une instance du parser IA."""
-    return AITaskParser(api_key=api_key)
+    return AITaskParser(api_key=api_key, base_url=base_url, strategy=strategy)
 
-def parse_text_with_ai(text: str, api_key: str = None, project_title: str = None) -> pd.DataFrame:
+def parse_text_with_ai(text: str, api_key: str = None, project_title: str = None) -> 'pd.DataFrame':
     """
     Parse un texte avec l'IA et retourne un DataFrame.
     
@@ -321,29 +1482,13 @@ def parse_text_with_ai(text: str, api_key: str = None, project_title: str = None
         project_title: Titre du projet
         
     Returns:
-        DataFrame avec les tâches
+        DataFrame avec les tâches (vide, avec les bonnes colonnes, en cas d'échec)
     """
     try:
         parser = AITaskParser(api_key=api_key)
         tasks = parser.parse_with_ai(text, project_title)
-        
-        if tasks:
-            return pd.DataFrame(tasks)
-        else:
-            # Retourner DataFrame vide avec bonnes colonnes
-            columns = [
-                'TASKLIST', 'TASK', 'DESCRIPTION', 'ASSIGN TO', 
-                'START DATE', 'DUE DATE', 'PRIORITY', 'ESTIMATED TIME', 
-                'TAGS', 'STATUS'
-            ]
-            return pd.DataFrame(columns=columns)
-            
     except Exception as e:
         print(f"Erreur parsing IA: {e}")
-        # Retourner DataFrame vide
-        columns = [
-            'TASKLIST', 'TASK', 'DESCRIPTION', 'ASSIGN TO', 
-            'START DATE', 'DUE DATE', 'PRIORITY', 'ESTIMATED TIME', 
-            'TAGS', 'STATUS'
-        ]
-        return pd.DataFrame(columns=columns) 
\ No newline at end of file
+        tasks = []
+    
+    return rows_to_dataframe(tasks)
@@ -1,7 +1,24 @@
 import streamlit as st
 import pandas as pd
-import io
-from text_to_teamwork import TextToTeamworkConverter
+import hashlib
+import hmac
+import os
+import threading
+import time
+from collections import OrderedDict
+from ai_parser import load_environment
+from exporters import DEFAULT_FORMAT, EXPORTERS, available_formats, dataframe_rows, export_bytes
+from instrumentation import STAGE_EXCEL, STAGE_EXPORT, PipelineMetrics, stage
+from openai_clients import get_client_registry
+from sampling_profiler import get_profiler
+from teamwork_row import rows_to_dataframe
+from text_to_teamwork import PREVIEW_FALLBACK, IncrementalState, TextToTeamworkConverter
+
+# Variables du fichier .env (PROFILER_ENABLED, AI_HTTP_WARMUP...) avant toute lecture de l'environnement
+load_environment()
+
+# Intervalle minimal entre deux rafraîchissements du tableau pendant le streaming IA (secondes)
+STREAM_REFRESH_SECONDS = 0.25
 
 # Configuration de la page
 st.set_page_config(
@@ -54,8 +71,106 @@ st.markdown("""
 
 # Initialiser le convertisseur avec configuration IA
 @st.cache_resource
-def get_converter(api_key=None, use_ai=True):
-    return TextToTeamworkConverter(openai_api_key=api_key, use_ai=use_ai)
+def get_converter(api_key=None, use_ai=True, ai_strategy=None):
+    return TextToTeamworkConverter(openai_api_key=api_key, use_ai=use_ai, ai_strategy=ai_strategy)
+
+# Préchauffage de la connexion OpenAI (DNS + TLS) une seule fois par clé et par serveur,
+# en arrière-plan, pour que la première prévisualisation ne paie pas l'ouverture de connexion
+@st.cache_resource
+def warm_up_openai(api_key, base_url=None):
+    return get_client_registry().warm_up_in_background(api_key, base_url)
+
+# Mesure des étapes : convertisseur et mesures propres à la session. Le convertisseur partagé
+# (st.cache_resource) n'est jamais instrumenté : enable_instrumentation remplace une de ses
+# méthodes, et les autres sessions l'utilisent en même temps depuis leurs propres threads
+def get_measured_converter(api_key=None, use_ai=True, ai_strategy=None):
+    if 'pipeline_metrics' not in st.session_state:
+        st.session_state.pipeline_metrics = PipelineMetrics()
+    config = (api_key, use_ai, ai_strategy)
+    if st.session_state.get('measured_converter_config') != config:
+        measured = TextToTeamworkConverter(openai_api_key=api_key, use_ai=use_ai, ai_strategy=ai_strategy)
+        measured.enable_instrumentation(st.session_state.pipeline_metrics)
+        st.session_state.measured_converter = measured
+        st.session_state.measured_converter_config = config
+    return st.session_state.measured_converter
+
+# Profileur par échantillonnage des sessions (opt-in, PROFILER_ENABLED=1) : démarré une seule
+# fois par processus au premier rendu, il tourne ensuite en continu
+PROFILER_ENABLED = os.getenv('PROFILER_ENABLED', '0').lower() in ('1', 'true', 'yes')
+# Jeton à saisir pour ouvrir le panneau du profileur (piles de toutes les sessions, arrêt et
+# remise à zéro du profileur du processus) ; sans jeton configuré, le panneau n'est pas affiché
+PROFILER_ADMIN_TOKEN = os.getenv('PROFILER_ADMIN_TOKEN', '')
+
+@st.cache_resource
+def start_profiler():
+    profiler = get_profiler()
+    profiler.start()
+    return profiler
+
+if PROFILER_ENABLED:
+    start_profiler()
+
+def get_preview_key(converter, text):
+    """Clé de la prévisualisation : empreinte du texte, mode effectif, modèle et serveur IA."""
+    text_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    if converter.use_ai and converter.ai_parser:
+        return text_hash, f"ai:{converter.ai_parser.strategy}", converter.ai_parser.model, converter.ai_parser.base_url
+    return text_hash, 'classic', None, None
+
+# Prévisualisations mémorisées (partagées entre les sessions) : un rerun Streamlit
+# (case à cocher, téléchargement...) ne relance ni le parsing ni l'appel OpenAI payant.
+# Pas de st.cache_data ici : il rejouerait à chaque lecture les écritures du streaming dans
+# un élément créé hors de la fonction mémorisée (CacheReplayClosureError). Le streaming n'a
+# lieu qu'au calcul ; seul le tableau final est mémorisé.
+PREVIEW_MEMO_ENTRIES = 64
+
+@st.cache_resource
+def get_preview_memo():
+    return OrderedDict(), threading.Lock()
+
+def recall_preview(preview_key):
+    """Prévisualisation mémorisée pour cette clé (None si absente)."""
+    memo, lock = get_preview_memo()
+    with lock:
+        preview_df = memo.get(preview_key)
+        if preview_df is not None:
+            memo.move_to_end(preview_key)
+        return preview_df
+
+def remember_preview(preview_key, preview_df):
+    """Mémorise une prévisualisation (les moins récemment lues sont oubliées au-delà de PREVIEW_MEMO_ENTRIES)."""
+    memo, lock = get_preview_memo()
+    with lock:
+        memo[preview_key] = preview_df
+        memo.move_to_end(preview_key)
+        while len(memo) > PREVIEW_MEMO_ENTRIES:
+            memo.popitem(last=False)
+
+def make_row_streamer(placeholder):
+    """Callback qui affiche les tâches déjà reçues de l'IA dans `placeholder` pendant le streaming."""
+    rows = []
+    last_refresh = [0.0]
+    
+    def on_row(row):
+        rows.append(row)
+        now = time.monotonic()
+        if len(rows) == 1 or now - last_refresh[0] >= STREAM_REFRESH_SECONDS:
+            last_refresh[0] = now
+            placeholder.dataframe(rows_to_dataframe(rows), use_container_width=True, hide_index=True)
+    
+    return on_row
+
+def get_frame_hash(df):
+    """Empreinte du contenu d'un DataFrame (colonnes et valeurs)."""
+    digest = hashlib.sha256('\x1f'.join(df.columns).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+# Fichier exporté mémorisé par contenu et par format : construit une seule fois par
+# résultat, avec le même moteur d'export que convert_to_file
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_export_bytes(frame_hash, fmt, _df):
+    return export_bytes(dataframe_rows(_df), list(_df.columns), fmt)
 
 # Sidebar avec configuration et instructions
 with st.sidebar:
@@ -75,6 +190,21 @@ with st.sidebar:
         help="Parser intelligent vs parser classique"
     )
     
+    ai_strategy = st.selectbox(
+        "Stratégie IA",
+        options=['document', 'groups', 'hybrid'],
+        format_func=lambda value: {'document': "Document entier", 'groups': "Groupe de tâche par groupe",
+                                   'hybrid': "Hybride (IA pour les tâches ambiguës)"}[value],
+        help="Par groupe : chaque tâche est analysée et mise en cache séparément (une modification ne renvoie que sa tâche). "
+             "Hybride : parser classique, seules les tâches mal structurées sont envoyées à l'IA"
+    )
+    
+    measure_stages = st.checkbox(
+        "⏱️ Mesurer les étapes",
+        value=False,
+        help="Temps passé dans chaque étape (classification, IA, DataFrame, Excel) et tokens consommés"
+    )
+    
     if api_key:
         st.success("🧠 Mode IA activé")
         st.info("Précision maximale avec GPT-4")
@@ -115,14 +245,34 @@ with st.sidebar:
     """)
 
 # Initialiser le convertisseur avec la configuration (gestion d'erreur pour le cloud)
+# Mesure des étapes cochée : convertisseur de la session, sinon convertisseur partagé
+make_converter = get_measured_converter if measure_stages else get_converter
+if not measure_stages:
+    st.session_state.pop('measured_converter', None)
+    st.session_state.pop('measured_converter_config', None)
 try:
-    converter = get_converter(api_key=api_key if api_key else None, use_ai=use_ai)
+    converter = make_converter(api_key=api_key if api_key else None, use_ai=use_ai, ai_strategy=ai_strategy)
 except Exception as e:
     st.error(f"Erreur d'initialisation : {e}")
     # Fallback vers mode classique
-    converter = get_converter(api_key=None, use_ai=False)
+    converter = make_converter(api_key=None, use_ai=False)
     st.warning("🔧 Mode classique activé suite à une erreur")
 
+if converter.use_ai and converter.ai_parser and os.getenv('AI_HTTP_WARMUP', '1').lower() not in ('0', 'false', 'no'):
+    warm_up_openai(converter.ai_parser.api_key, converter.ai_parser.base_url)
+
+# Métriques de l'ordonnanceur des appels OpenAI (partagé par toutes les sessions)
+if converter.use_ai and converter.ai_parser:
+    with st.sidebar.expander("📈 Appels OpenAI"):
+        scheduler_stats = converter.ai_parser.scheduler.stats()
+        st.metric("Requêtes", scheduler_stats['requests'])
+        st.metric("Nouvelles tentatives", scheduler_stats['retries'], help=f"dont {scheduler_stats['rate_limited']} limites de débit (429)")
+        st.metric("Attente quota (s)", scheduler_stats['throttle_time'])
+        st.metric("File d'attente", scheduler_stats['queue_depth'], help=f"max {scheduler_stats['max_queue_depth']}")
+        client_stats = converter.ai_parser.client_registry.stats()
+        st.metric("Clients HTTP partagés", client_stats['clients'],
+                  help=f"{client_stats['reused']} réutilisation(s), {client_stats['warmed']} connexion(s) préchauffée(s)")
+
 # Interface principale
 col1, col2 = st.columns([1, 1])
 
@@ -196,8 +346,7 @@ with col2:
     if should_generate:
         try:
             # Reset force generate flag
-            if 'force_generate' in st.session_state:
-                del st.session_state.force_generate
+            force_generate = st.session_state.pop('force_generate', False)
             
             # Prévisualisation avec indication du mode
             if api_key and use_ai:
@@ -205,8 +354,35 @@ with col2:
             else:
                 st.info("🔧 **Parsing classique** - Ajoutez une clé OpenAI pour une précision optimale")
             
-            with st.spinner("🔄 Génération en cours..."):
-                preview_df = converter.preview_conversion(input_text)
+            # Ne recalculer que si le texte, le mode ou le modèle a changé, ou sur clic de Générer
+            preview_key = get_preview_key(converter, input_text)
+            # Tableau partiel affiché pendant le streaming de la réponse IA
+            stream_placeholder = st.empty()
+            on_row = make_row_streamer(stream_placeholder) if converter.use_ai and converter.ai_parser else None
+            if not force_generate and st.session_state.get('preview_key') == preview_key:
+                preview_df = st.session_state.preview_result
+            else:
+                preview_df = None if force_generate else recall_preview(preview_key)
+                if preview_df is None:
+                    # Parsing incrémental : après une modification, seuls les groupes de tâche modifiés sont
+                    # retraités ; le travail réutilisé est propre à la session (convertisseur partagé)
+                    if 'incremental_state' not in st.session_state:
+                        st.session_state.incremental_state = IncrementalState()
+                    with st.spinner("🔄 Génération en cours..."):
+                        preview_df, source = converter.preview_conversion_with_source(
+                            input_text, incremental=st.session_state.incremental_state, on_row=on_row)
+                    if source == PREVIEW_FALLBACK:
+                        # Échec de l'IA (quota, réseau...) : ni mémorisé ni associé à la clé, le prochain rendu retente l'appel
+                        preview_key = None
+                        st.warning("⚠️ L'IA n'a pas répondu - résultat du parser classique, nouvel essai au prochain rendu")
+                    else:
+                        remember_preview(preview_key, preview_df)
+            stream_placeholder.empty()
+            # Stocker le résultat pour le téléchargement
+            if st.session_state.get('preview_result') is not preview_df:
+                st.session_state.preview_hash = get_frame_hash(preview_df)
+            st.session_state.preview_key = preview_key
+            st.session_state.preview_result = preview_df
             
             if not preview_df.empty:
                 st.markdown('<div class="success-box">✅ Conversion réussie ! Prévisualisation ci-dessous :</div>', unsafe_allow_html=True)
@@ -233,9 +409,6 @@ with col2:
                     project_name = preview_df.iloc[0]['TASKLIST'] if not preview_df.empty else "N/A"
                     st.metric("Projet", project_name[:15] + "..." if len(project_name) > 15 else project_name)
                 
-                # Stocker le résultat pour le téléchargement
-                st.session_state.preview_result = preview_df
-                
             else:
                 st.markdown('<div class="warning-box">⚠️ Aucune tâche détectée. Vérifiez le format de votre texte.</div>', unsafe_allow_html=True)
                 
@@ -255,43 +428,95 @@ if st.session_state.get('preview_result') is not None and not st.session_state.p
             # Utiliser le résultat déjà généré
             tasks_df = st.session_state.preview_result
             
-            # Créer le fichier Excel en mémoire
-            output = io.BytesIO()
-            
-            # Sauvegarder en Excel dans le buffer
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                tasks_df.to_excel(writer, index=False, sheet_name='Teamwork Import')
-                
-                # Ajuster les colonnes
-                worksheet = writer.sheets['Teamwork Import']
-                for idx, col in enumerate(tasks_df.columns):
-                    max_length = max(
-                        tasks_df[col].astype(str).map(len).max(),
-                        len(col)
-                    )
-                    worksheet.column_dimensions[chr(65 + idx)].width = min(max_length + 2, 50)
+            # Format du fichier (seuls les formats dont la dépendance est installée sont proposés)
+            formats = available_formats()
+            fmt = st.selectbox(
+                "Format",
+                options=formats,
+                index=formats.index(DEFAULT_FORMAT),
+                format_func=lambda f: EXPORTERS[f].label,
+                help="Excel pour l'import Teamwork ; CSV, JSONL et Parquet sont bien plus rapides à produire"
+            )
+            exporter = EXPORTERS[fmt]
             
-            # Préparer le téléchargement
-            output.seek(0)
+            # Fichier en mémoire (recalculé seulement si le résultat ou le format a changé)
+            with stage(converter.instrumentation, STAGE_EXCEL if fmt == 'xlsx' else STAGE_EXPORT):
+                data = cached_export_bytes(st.session_state.preview_hash, fmt, tasks_df)
             
             # Nom du projet pour le fichier
             project_name = tasks_df.iloc[0]['TASKLIST'] if not tasks_df.empty else "Projet"
-            filename = f"{project_name.replace(' ', '_')}_Teamwork.xlsx"
+            filename = f"{project_name.replace(' ', '_')}_Teamwork{exporter.extension}"
             
             st.download_button(
-                label="📥 Télécharger Excel",
-                data=output.getvalue(),
+                label=f"📥 Télécharger {exporter.label}",
+                data=data,
                 file_name=filename,
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                mime=exporter.mime,
                 use_container_width=True,
                 type="primary"
             )
             
-            st.success("✅ Fichier Excel prêt au téléchargement !")
+            st.success(f"✅ Fichier {exporter.label} prêt au téléchargement !")
             
         except Exception as e:
             st.error(f"❌ Erreur lors de la génération : {str(e)}")
 
+# Temps par étape (affiché en fin de script pour inclure la prévisualisation et l'export de ce rerun)
+if converter.instrumentation is not None:
+    with st.sidebar.expander("⏱️ Temps par étape", expanded=True):
+        stage_rows = converter.instrumentation.summary_rows()
+        if stage_rows:
+            st.dataframe(pd.DataFrame(stage_rows), hide_index=True, use_container_width=True)
+        else:
+            st.caption("Aucune mesure pour l'instant")
+        for counter, value in sorted(converter.instrumentation.snapshot()['counters'].items()):
+            st.metric(counter, value)
+        if st.button("🔄 Réinitialiser les mesures"):
+            converter.instrumentation.reset()
+            st.rerun()
+
+# Panneau d'administration du profileur : fonctions les plus échantillonnées et export des piles,
+# réservé aux sessions qui ont saisi PROFILER_ADMIN_TOKEN
+if PROFILER_ENABLED and PROFILER_ADMIN_TOKEN:
+    profiler = get_profiler()
+    with st.sidebar.expander("🩺 Profilage (admin)"):
+        if not st.session_state.get('profiler_admin'):
+            admin_token = st.text_input("Jeton d'administration", type="password")
+            if admin_token and hmac.compare_digest(admin_token.encode(), PROFILER_ADMIN_TOKEN.encode()):
+                st.session_state.profiler_admin = True
+                st.rerun()
+            elif admin_token:
+                st.error("❌ Jeton invalide")
+        else:
+            profiler_stats = profiler.stats()
+            st.metric("Échantillons", profiler_stats['samples'],
+                      help=f"{profiler_stats['stacks']} pile(s) de session, {profiler_stats['distinct_stacks']} distincte(s)")
+            st.metric("Coût de l'échantillonnage", f"{profiler_stats['overhead']:.2%}",
+                      help="Part d'un cœur consommée par le relevé des piles")
+            top_functions = profiler.top_functions(limit=15)
+            if top_functions:
+                st.dataframe(pd.DataFrame(top_functions), hide_index=True, use_container_width=True)
+            else:
+                st.caption("Aucune pile de session relevée pour l'instant")
+            st.download_button(
+                label="📥 Piles (flamegraph)",
+                data=profiler.collapsed(),
+                file_name=f"teamwork_profile_{time.strftime('%Y%m%d_%H%M%S')}.collapsed",
+                mime="text/plain",
+                use_container_width=True
+            )
+            profiler_col1, profiler_col2 = st.columns(2)
+            if profiler.running:
+                if profiler_col1.button("⏸️ Suspendre"):
+                    profiler.stop()
+                    st.rerun()
+            elif profiler_col1.button("▶️ Reprendre"):
+                profiler.start()
+                st.rerun()
+            if profiler_col2.button("🔄 Vider"):
+                profiler.reset()
+                st.rerun()
+
 # Section d'aide avancée
 with st.expander("🔧 Aide avancée et nouveautés IA"):
     st.markdown("""
@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+"""
+Conversion en lot de fichiers texte vers des fichiers Excel (ou CSV, JSONL, Parquet) Teamwork
+Usage:
+    python batch_convert.py notes/ -o exports/
+    python batch_convert.py notes/ -o exports/ --format csv
+    python batch_convert.py "notes/**/*.md" --merge planning_Teamwork.xlsx
+    python batch_convert.py "notes/**/*.md" --merge planning_Teamwork.parquet
+    python batch_convert.py notes/ --ai --workers 8
+    python batch_convert.py notes/ --ai --ai-strategy groups
+    python batch_convert.py notes/ --ai --ai-strategy hybrid
+    python batch_convert.py notes/ --timings
+"""
+
+import argparse
+import asyncio
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from exporters import DEFAULT_FORMAT, EXPORTERS, format_for_path, write_rows
+from instrumentation import STAGE_EXCEL, STAGE_EXPORT, PipelineMetrics, stage
+from text_to_teamwork import TextToTeamworkConverter
+
+# Extensions prises en compte quand l'entrée est un dossier
+INPUT_EXTENSIONS = ('.txt', '.md')
+
+# Convertisseur classique propre à chaque processus du pool
+_worker_converter = None
+
+
+def collect_input_files(inputs: List[str]) -> List[str]:
+    """Résout les dossiers et motifs glob en une liste triée de fichiers .txt/.md."""
+    files = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            for name in sorted(os.listdir(entry)):
+                path = os.path.join(entry, name)
+                if os.path.isfile(path) and name.lower().endswith(INPUT_EXTENSIONS):
+                    files.append(path)
+        elif os.path.isfile(entry):
+            files.append(entry)
+        else:
+            files.extend(sorted(
+                path for path in glob.glob(entry, recursive=True)
+                if os.path.isfile(path) and path.lower().endswith(INPUT_EXTENSIONS)
+            ))
+
+    # Supprimer les doublons en gardant l'ordre
+    seen = set()
+    return [path for path in files if not (path in seen or seen.add(path))]
+
+
+def output_path_for(input_path: str, output_dir: str, fmt: str = DEFAULT_FORMAT) -> str:
+    """Nom du fichier produit pour un fichier d'entrée (extension du format demandé)."""
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, f"{stem}_Teamwork{EXPORTERS[fmt].extension}")
+
+
+def conflicting_outputs(files: List[str], output_dir: str, fmt: str = DEFAULT_FORMAT) -> Dict[str, List[str]]:
+    """
+    Fichiers de sortie que plusieurs entrées produiraient (même nom dans des dossiers
+    différents, ex: a/notes.txt et b/notes.txt) : chemin de sortie → fichiers d'entrée.
+    """
+    inputs_by_output = {}
+    for path in files:
+        output_path = os.path.normcase(os.path.abspath(output_path_for(path, output_dir, fmt)))
+        inputs_by_output.setdefault(output_path, []).append(path)
+    return {output_path: inputs for output_path, inputs in inputs_by_output.items() if len(inputs) > 1}
+
+
+def _write_stage(output_path: str) -> str:
+    """Étape mesurée pour l'écriture d'un fichier de sortie (format déduit de son extension)."""
+    return STAGE_EXCEL if format_for_path(output_path) == 'xlsx' else STAGE_EXPORT
+
+
+def _init_worker(timings: bool = False):
+    """Crée le convertisseur classique une seule fois par processus (avec mesure des étapes si demandé)."""
+    global _worker_converter
+    _worker_converter = TextToTeamworkConverter(use_ai=False)
+    if timings:
+        _worker_converter.enable_instrumentation()
+
+
+def _convert_classic(job: Tuple[str, Optional[str]]) -> Dict:
+    """
+    Convertit un fichier avec le parser classique (exécuté dans un processus du pool).
+
+    Si un chemin de sortie est donné, le fichier est lu et écrit en flux ; sinon les
+    lignes sont renvoyées au processus principal pour le classeur fusionné.
+    """
+    input_path, output_path = job
+    result = {'input': input_path, 'output': output_path, 'lines': 0, 'rows': 0, 'bytes': 0, 'tasks': None, 'error': None}
+    metrics = _worker_converter.instrumentation
+    try:
+        result['bytes'] = os.path.getsize(input_path)
+        with open(input_path, 'r', encoding='utf-8') as f:
+            lines = _count_lines(f, result)
+            rows = _worker_converter.iter_rows(lines)
+            if output_path:
+                with stage(metrics, _write_stage(output_path)):
+                    result['rows'] = write_rows(rows, output_path, _worker_converter.columns)
+            else:
+                result['tasks'] = list(rows)
+                result['rows'] = len(result['tasks'])
+    except Exception as e:
+        result['error'] = str(e)
+    if metrics is not None:
+        # Mesures de ce fichier, renvoyées au processus principal
+        result['timings'] = metrics.snapshot()
+        metrics.reset()
+    return result
+
+
+def _convert_sharded(converter: TextToTeamworkConverter, job: Tuple[str, Optional[str]], workers: int) -> Dict:
+    """Convertit un gros fichier en répartissant ses groupes de tâche entre `workers` processus."""
+    input_path, output_path = job
+    result = {'input': input_path, 'output': output_path, 'lines': 0, 'rows': 0, 'bytes': 0, 'tasks': None, 'error': None}
+    try:
+        result['bytes'] = os.path.getsize(input_path)
+        with open(input_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        result['lines'] = text.count('\n') + 1
+        tasks = converter.parse_parallel(text, workers)
+        result['rows'] = len(tasks)
+        if output_path:
+            with stage(converter.instrumentation, _write_stage(output_path)):
+                write_rows(tasks, output_path, converter.columns)
+        else:
+            result['tasks'] = tasks
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def _count_lines(lines, result: Dict) -> Iterator[str]:
+    """Compte les lignes lues au passage (pour le résumé de débit)."""
+    for line in lines:
+        result['lines'] += 1
+        yield line
+
+
+def run_classic(files: List[str], output_dir: Optional[str], workers: int,
+                metrics: Optional[PipelineMetrics] = None, fmt: str = DEFAULT_FORMAT) -> Iterator[Dict]:
+    """
+    Convertit les fichiers en parallèle dans un pool de processus (parsing CPU).
+
+    Un fichier unique est lui-même découpé entre tous les processus (voir
+    TextToTeamworkConverter.parse_parallel). Avec `metrics`, les mesures des étapes
+    de chaque processus y sont cumulées.
+    """
+    jobs = [(path, output_path_for(path, output_dir, fmt) if output_dir else None) for path in files]
+    if len(jobs) == 1 and workers > 1:
+        converter = TextToTeamworkConverter(use_ai=False)
+        if metrics is not None:
+            converter.enable_instrumentation(metrics)
+        yield _convert_sharded(converter, jobs[0], workers)
+        return
+
+    workers = min(workers, len(files))
+    if workers <= 1:
+        _init_worker(metrics is not None)
+        yield from _merge_timings(map(_convert_classic, jobs), metrics)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(metrics is not None,)) as pool:
+        # map() conserve l'ordre des fichiers, utile pour le classeur fusionné
+        yield from _merge_timings(pool.map(_convert_classic, jobs, chunksize=1), metrics)
+
+
+def _merge_timings(results: Iterator[Dict], metrics: Optional[PipelineMetrics]) -> Iterator[Dict]:
+    """Cumule dans `metrics` les mesures renvoyées avec chaque fichier converti."""
+    for result in results:
+        timings = result.pop('timings', None)
+        if metrics is not None and timings:
+            metrics.merge(timings)
+        yield result
+
+
+def run_ai(files: List[str], output_dir: Optional[str], workers: int, api_key: Optional[str],
+           base_url: Optional[str] = None, strategy: Optional[str] = None,
+           metrics: Optional[PipelineMetrics] = None, fmt: str = DEFAULT_FORMAT) -> Iterator[Dict]:
+    """Convertit les fichiers avec l'IA en parallèle (requêtes asynchrones), fallback classique par fichier."""
+    from ai_parser import AsyncAITaskParser
+
+    converter = TextToTeamworkConverter(use_ai=False)
+    parser = AsyncAITaskParser(api_key=api_key, max_concurrency=workers, base_url=base_url, strategy=strategy,
+                               classic_converter=converter)
+    if not parser.is_available():
+        print("⚠️ Clé OpenAI manquante - Utilisation du parser classique")
+        yield from run_classic(files, output_dir, workers, metrics, fmt)
+        return
+    if metrics is not None:
+        converter.enable_instrumentation(metrics)
+        parser.instrumentation = metrics
+
+    texts = []
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            texts.append(f.read())
+    titles = [converter.extract_project_title(text) for text in texts]
+
+    async def parse_all():
+        # Connexions du client asynchrone fermées avec la boucle qui les a ouvertes
+        async with parser:
+            return await parser.parse_many(texts, titles)
+
+    ai_results = asyncio.run(parse_all())
+
+    for path, text, tasks in zip(files, texts, ai_results):
+        result = {'input': path, 'output': None, 'lines': text.count('\n') + 1, 'rows': 0,
+                  'bytes': len(text.encode('utf-8')), 'tasks': None, 'error': None}
+        if not tasks:
+            print(f"⚠️ IA n'a pas pu parser {path} - Fallback vers parser classique")
+            tasks = list(converter.iter_rows(text))
+        result['rows'] = len(tasks)
+        if output_dir:
+            result['output'] = output_path_for(path, output_dir, fmt)
+            with stage(metrics, _write_stage(result['output'])):
+                write_rows(tasks, result['output'], converter.columns)
+        else:
+            result['tasks'] = tasks
+        yield result
+
+    stats = parser.scheduler.stats()
+    print(f"📈 Appels OpenAI : {stats['requests']} requête(s), {stats['retries']} nouvelle(s) tentative(s) "
+          f"dont {stats['rate_limited']} limite(s) de débit, attente quota {stats['throttle_time']:.1f} s, "
+          f"backoff {stats['backoff_time']:.1f} s, file d'attente max {stats['max_queue_depth']}")
+
+
+def print_summary(results: List[Dict], elapsed: float) -> None:
+    """Affiche le résumé de débit de la conversion."""
+    converted = [r for r in results if not r['error']]
+    lines = sum(r['lines'] for r in converted)
+    rows = sum(r['rows'] for r in converted)
+    size_mb = sum(r['bytes'] for r in converted) / (1024 * 1024)
+    elapsed = max(elapsed, 1e-9)
+
+    print("\n📊 RÉSUMÉ")
+    print("=" * 50)
+    print(f"✅ Fichiers convertis : {len(converted)}/{len(results)}")
+    print(f"✅ Lignes lues        : {lines} ({size_mb:.2f} Mo)")
+    print(f"✅ Tâches produites   : {rows}")
+    print(f"⏱️ Durée totale       : {elapsed:.2f} s")
+    print(f"🚀 Débit              : {len(converted) / elapsed:.1f} fichiers/s, "
+          f"{lines / elapsed:.0f} lignes/s, {rows / elapsed:.0f} tâches/s")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Convertit en lot des fichiers texte en fichiers Excel (ou CSV, JSONL, "
+                                                 "Parquet) Teamwork.")
+    parser.add_argument('inputs', nargs='+', help="Dossiers, fichiers ou motifs glob (.txt, .md)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('-o', '--output-dir', default='.', help="Dossier de sortie, un fichier par entrée (défaut : .)")
+    target.add_argument('--merge', metavar='FICHIER', help="Écrire toutes les tâches dans un seul fichier")
+    parser.add_argument('--format', choices=tuple(EXPORTERS),
+                        help="Format de sortie (défaut : extension du fichier --merge, obligatoire si elle n'est "
+                             "pas reconnue, sinon xlsx) ; "
+                             "CSV et JSONL s'écrivent bien plus vite qu'Excel")
+    parser.add_argument('--ai', action='store_true', help="Utiliser l'IA (OPENAI_API_KEY ou --api-key)")
+    parser.add_argument('--api-key', help="Clé OpenAI API")
+    parser.add_argument('--base-url', help="URL d'un serveur compatible OpenAI (ex: faux serveur local)")
+    parser.add_argument('--ai-strategy', choices=('document', 'groups', 'hybrid'),
+                        help="Document entier, groupe de tâche par groupe, ou hybride : IA pour les seuls groupes "
+                             "mal structurés (défaut : AI_STRATEGY ou document)")
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1,
+                        help="Processus (mode classique) ou requêtes simultanées (mode IA)")
+    parser.add_argument('--timings', action='store_true',
+                        help="Afficher le temps passé dans chaque étape (classification, IA, Excel...) et les tokens")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de la ligne de commande."""
+    from ai_parser import load_environment
+
+    args = build_arg_parser().parse_args(argv)
+    # Variables du fichier .env (limites de débit, cache...) avant toute lecture de l'environnement
+    load_environment()
+
+    files = collect_input_files(args.inputs)
+    if not files:
+        print("❌ Aucun fichier .txt ou .md trouvé")
+        return 1
+
+    output_dir = None if args.merge else args.output_dir
+    try:
+        fmt = args.format or (format_for_path(args.merge) if args.merge else DEFAULT_FORMAT)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if output_dir:
+        # Deux entrées de même nom écriraient le même fichier en même temps : une serait perdue
+        conflicts = conflicting_outputs(files, output_dir, fmt)
+        if conflicts:
+            for output_path, inputs in conflicts.items():
+                print(f"❌ {', '.join(inputs)} → même fichier de sortie {output_path}")
+            print("💡 Renommez ces fichiers ou utilisez --merge")
+            return 1
+        os.makedirs(output_dir, exist_ok=True)
+
+    print(f"🚀 Conversion de {len(files)} fichier(s) {'avec IA' if args.ai else 'avec le parser classique'}...")
+    start = time.time()
+    metrics = PipelineMetrics() if args.timings else None
+
+    if args.ai:
+        results_iter = run_ai(files, output_dir, max(1, args.workers), args.api_key, args.base_url,
+                              args.ai_strategy, metrics, fmt)
+    else:
+        results_iter = run_classic(files, output_dir, max(1, args.workers), metrics, fmt)
+
+    results = []
+
+    def report(results_iter):
+        for result in results_iter:
+            results.append(result)
+            if result['error']:
+                print(f"❌ {result['input']} : {result['error']}")
+            else:
+                print(f"✅ {result['input']} : {result['rows']} tâche(s)"
+                      + (f" → {result['output']}" if result['output'] else ""))
+            yield result
+
+    if args.merge:
+        # Les tâches de chaque fichier sont écrites dès qu'il est converti, dans l'ordre des fichiers
+        merged_rows = (task for result in report(results_iter) if result['tasks'] for task in result['tasks'])
+        with stage(metrics, STAGE_EXCEL if fmt == 'xlsx' else STAGE_EXPORT):
+            row_count = write_rows(merged_rows, args.merge, TextToTeamworkConverter(use_ai=False).columns, fmt)
+        print(f"✅ Fichier fusionné : {args.merge} ({row_count} tâches)")
+    else:
+        for _ in report(results_iter):
+            pass
+
+    print_summary(results, time.time() - start)
+    if metrics is not None:
+        print("\n⏱️ ÉTAPES")
+        print("=" * 50)
+        print(metrics.format_summary())
+    return 0 if all(not r['error'] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Benchmarks reproductibles du convertisseur : parser classique, export Excel et
+prévisualisation IA (contre un faux serveur OpenAI local).
+Usage:
+    python benchmark.py
+    python benchmark.py --tasklists 200 --subtasks 10 --style code -o bench.json
+    python benchmark.py --skip-ai --repeat 5
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+from stub_openai_server import StubOpenAIServer
+from text_to_teamwork import TextToTeamworkConverter
+
+# Version du format de sortie JSON (à incrémenter si les clés changent)
+BENCHMARK_FORMAT = 1
+
+# Styles de numérotation des en-têtes de tâches
+CODE_STYLES = ('code', 'numbered', 'bullet', 'emoji', 'mixed')
+
+# Lignes de détail tirées au hasard sous chaque tâche
+DETAIL_TEMPLATES = [
+    "Description : {verb} {topic} pour l'équipe {team}",
+    "Priorité : {priority}",
+    "Dépendance : {dependency}",
+    "Critère d'acceptation : {topic} validé par {team}",
+    "Livrables : document {topic}, présentation",
+    "Risques : retard sur {topic}",
+    "Durée estimée : {hours}h",
+    "Durée estimée : {minutes} minutes",
+    "Temps estimé : {hours} heures",
+    "Note libre sur {topic} à reprendre avec {team}",
+]
+VERBS = ["Préparer", "Rédiger", "Valider", "Analyser", "Planifier", "Livrer", "Tester"]
+TOPICS = ["le brief", "la maquette", "le budget", "le calendrier", "la campagne", "le rapport", "l'audit"]
+TEAMS = ["marketing", "produit", "design", "support", "finance"]
+PRIORITIES = ["Élevée", "Haute", "Moyenne", "Faible", "Basse"]
+
+# Dépendances lourdes que le parser classique ne doit pas charger
+HEAVY_MODULES = ('pandas', 'openai', 'dotenv', 'openpyxl', 'ai_parser')
+
+# Script exécuté dans un nouveau processus : import à froid puis parsing classique
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import text_to_teamwork
+imported = time.perf_counter()
+text_to_teamwork.TextToTeamworkConverter(use_ai=False).parse_text_to_tasks("Projet\\n1. Tâche\\nPriorité : haute")
+parsed = time.perf_counter()
+print(json.dumps({
+    'import_sec': imported - start,
+    'first_parse_sec': parsed - start,
+    'loaded': [name for name in %r if name in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def generate_document(tasklists: int = 50, subtasks: int = 5, detail_lines: int = 3,
+                      style: str = 'mixed', seed: int = 0) -> str:
+    """
+    Génère un document de tâches synthétique et déterministe (même graine → même texte).
+
+    Args:
+        tasklists: Nombre de tâches principales
+        subtasks: Nombre de sous-tâches par tâche principale
+        detail_lines: Nombre de lignes de détail sous chaque tâche
+        style: Numérotation des en-têtes (code DC-DM-001.1, numbered 1.1, bullet -/•, emoji ✅/✓ ou mixed)
+        seed: Graine du générateur aléatoire
+    """
+    if style not in CODE_STYLES:
+        raise ValueError(f"Style inconnu : {style} (attendu : {', '.join(CODE_STYLES)})")
+
+    rng = random.Random(seed)
+    lines = [
+        "Plan de Projet Synthétique – Liste des Tâches",
+        "",
+        "📌 Objectif général :",
+        "Mesurer les performances du convertisseur.",
+        "",
+        "Jalon Principal : Livraison de la version finale",
+        "",
+        "✅ Liste des Tâches :",
+    ]
+
+    def details():
+        for _ in range(detail_lines):
+            template = rng.choice(DETAIL_TEMPLATES)
+            lines.append("   " + template.format(
+                verb=rng.choice(VERBS), topic=rng.choice(TOPICS), team=rng.choice(TEAMS),
+                priority=rng.choice(PRIORITIES), dependency=rng.randint(1, tasklists),
+                hours=rng.randint(1, 40), minutes=rng.randint(5, 55),
+            ))
+
+    for i in range(1, tasklists + 1):
+        header_style = rng.choice(CODE_STYLES[:-1]) if style == 'mixed' else style
+        name = f"{rng.choice(VERBS)} {rng.choice(TOPICS)} {i}"
+        if header_style == 'code':
+            lines.append(f"DC-DM-{i:03d} - {name}")
+        elif header_style == 'numbered':
+            lines.append(f"{i}. {name}")
+        else:
+            lines.append(f"{'-' if header_style == 'bullet' else '✅'} {name}")
+        details()
+
+        for j in range(1, subtasks + 1):
+            name = f"{rng.choice(VERBS)} {rng.choice(TOPICS)} {i}.{j}"
+            if header_style == 'code':
+                lines.append(f"DC-DM-{i:03d}.{j} - {name}")
+            elif header_style == 'numbered':
+                lines.append(f"{i}.{j} – {name}")
+            elif header_style == 'bullet':
+                lines.append(f"{rng.choice('-•')} {name}")
+            else:
+                lines.append(f"{rng.choice('✅✓')} {name}")
+            details()
+        lines.append("")
+
+    return '\n'.join(lines)
+
+
+def _best_time(func: Callable[[], object], repeat: int) -> Tuple[float, object]:
+    """Meilleur temps (en secondes) sur `repeat` exécutions, et le résultat de la dernière."""
+    best = float('inf')
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_parse(text: str, repeat: int = 3) -> Dict:
+    """Débit du parser classique (parse_text_to_tasks) en lignes et tâches par seconde."""
+    converter = TextToTeamworkConverter(use_ai=False)
+    seconds, tasks = _best_time(lambda: converter.parse_text_to_tasks(text), repeat)
+    lines = text.count('\n') + 1
+    return {
+        'lines': lines,
+        'tasks': len(tasks),
+        'seconds': round(seconds, 6),
+        'lines_per_sec': round(lines / seconds, 1),
+        'tasks_per_sec': round(len(tasks) / seconds, 1),
+    }
+
+
+def bench_parse_parallel(text: str, repeat: int = 3, workers: Optional[int] = None) -> Dict:
+    """Parser classique réparti sur plusieurs processus (parse_parallel), comparé au parse séquentiel."""
+    converter = TextToTeamworkConverter(use_ai=False)
+    workers = workers or os.cpu_count() or 1
+    sequential, _ = _best_time(lambda: list(converter.iter_rows(text)), repeat)
+    seconds, tasks = _best_time(lambda: converter.parse_parallel(text, workers, min_lines=0), repeat)
+    lines = text.count('\n') + 1
+    return {
+        'workers': workers,
+        'tasks': len(tasks),
+        'seconds': round(seconds, 6),
+        'lines_per_sec': round(lines / seconds, 1),
+        'speedup': round(sequential / seconds, 2),
+    }
+
+
+def bench_import(repeat: int = 3) -> Dict:
+    """Temps d'import à froid de text_to_teamwork (nouveau processus) et dépendances lourdes chargées."""
+    best = None
+    for _ in range(max(1, repeat)):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout
+        probe = json.loads(output.strip().splitlines()[-1])
+        if best is None or probe['import_sec'] < best['import_sec']:
+            best = probe
+    return {
+        'import_sec': round(best['import_sec'], 6),
+        'first_parse_sec': round(best['first_parse_sec'], 6),
+        'heavy_modules_loaded': best['loaded'],
+    }
+
+
+def bench_excel(text: str, repeat: int = 3) -> Dict:
+    """Débit (lignes Excel par seconde) et pic mémoire de convert_to_excel."""
+    import tempfile
+
+    converter = TextToTeamworkConverter(use_ai=False)
+    rows = len(converter.parse_text_to_tasks(text))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, 'benchmark.xlsx')
+        seconds, _ = _best_time(lambda: converter.convert_to_excel(text, output_path), repeat)
+        file_size = os.path.getsize(output_path)
+
+        # Mesure mémoire séparée : tracemalloc ralentit fortement l'exécution
+        tracemalloc.start()
+        try:
+            converter.convert_to_excel(text, output_path)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'rows': rows,
+        'seconds': round(seconds, 6),
+        'rows_per_sec': round(rows / seconds, 1),
+        'peak_memory_mb': round(peak / (1024 * 1024), 3),
+        'file_size_kb': round(file_size / 1024, 1),
+    }
+
+
+def bench_field_aliases(text: str, repeat: int = 3, aliases: int = 50) -> Dict:
+    """
+    Coût de la classification des champs (classify_field) avec le schéma par défaut, puis
+    avec `aliases` libellés de début de ligne en plus : la table de dispatch doit le garder stable.
+    """
+    from field_schema import FIELD_SCHEMA, FieldLabel
+
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    extended = FIELD_SCHEMA + [FieldLabel('risks', rf'hazard{i}\s*:') for i in range(aliases)]
+    classifiers = [TextToTeamworkConverter(use_ai=False, field_schema=schema).line_classifier.classify_field
+                   for schema in (FIELD_SCHEMA, extended)]
+
+    # Mesures alternées pour que les variations de charge touchent les deux schémas
+    timings = [float('inf'), float('inf')]
+    for _ in range(max(1, repeat)):
+        for i, classify_field in enumerate(classifiers):
+            seconds, _ = _best_time(lambda: [classify_field(line) for line in lines], 1)
+            timings[i] = min(timings[i], seconds)
+    base, with_aliases = timings
+    return {
+        'aliases': aliases,
+        'base_us_per_line': round(base * 1e6 / len(lines), 3),
+        'extended_us_per_line': round(with_aliases * 1e6 / len(lines), 3),
+        'slowdown': round(with_aliases / base, 3),
+    }
+
+
+def bench_exports(text: str, repeat: int = 3) -> Dict:
+    """Débit d'écriture (lignes par seconde) et taille du fichier pour chaque format d'export installé."""
+    import tempfile
+    from exporters import EXPORTERS, available_formats, write_rows
+
+    converter = TextToTeamworkConverter(use_ai=False)
+    rows = list(converter.iter_rows(text))
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in available_formats():
+            output_path = os.path.join(tmp, 'benchmark' + EXPORTERS[fmt].extension)
+            seconds, _ = _best_time(lambda: write_rows(rows, output_path, converter.columns, fmt), repeat)
+            results[fmt] = {
+                'seconds': round(seconds, 6),
+                'rows_per_sec': round(len(rows) / seconds, 1),
+                'file_size_kb': round(os.path.getsize(output_path) / 1024, 1),
+            }
+    return results
+
+
+def bench_preview(text: str, repeat: int = 3, latency: float = 0.0) -> Dict:
+    """
+    Latence de preview_conversion en mode IA contre le faux serveur local : de bout en bout,
+    et jusqu'à la première tâche reçue en streaming.
+    """
+    with StubOpenAIServer(latency=latency) as server:
+        converter = TextToTeamworkConverter(openai_api_key='benchmark', use_ai=True, openai_base_url=server.base_url)
+        # Mesurer les appels réseau, pas le cache des réponses
+        converter.ai_parser.cache = None
+        chunks = len(converter.ai_parser.split_into_chunks(text))
+
+        timings = []
+        first_row_timings = []
+        rows = 0
+        for _ in range(max(1, repeat)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                rows = len(converter.preview_conversion(text))
+                timings.append(time.perf_counter() - start)
+                
+                arrivals = []
+                start = time.perf_counter()
+                converter.preview_conversion(text, on_row=lambda row: arrivals.append(time.perf_counter() - start))
+                if arrivals:
+                    first_row_timings.append(arrivals[0])
+
+    timings.sort()
+    first_row_timings.sort()
+    return {
+        'rows': rows,
+        'requests': chunks,
+        'server_latency_sec': latency,
+        'min_sec': round(timings[0], 6),
+        'median_sec': round(timings[len(timings) // 2], 6),
+        'max_sec': round(timings[-1], 6),
+        'first_row_median_sec': round(first_row_timings[len(first_row_timings) // 2], 6) if first_row_timings else None,
+    }
+
+
+def run_benchmarks(tasklists: int = 50, subtasks: int = 5, detail_lines: int = 3, style: str = 'mixed',
+                   seed: int = 0, repeat: int = 3, latency: float = 0.0, skip_ai: bool = False,
+                   workers: Optional[int] = None) -> Dict:
+    """Lance tous les benchmarks et retourne les résultats (sérialisables en JSON)."""
+    text = generate_document(tasklists, subtasks, detail_lines, style, seed)
+
+    results = {
+        'format': BENCHMARK_FORMAT,
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'document': {
+            'tasklists': tasklists,
+            'subtasks': subtasks,
+            'detail_lines': detail_lines,
+            'style': style,
+            'seed': seed,
+            'lines': text.count('\n') + 1,
+            'chars': len(text),
+        },
+        'repeat': repeat,
+        'import': bench_import(repeat),
+        'parse': bench_parse(text, repeat),
+        'parse_parallel': bench_parse_parallel(text, repeat, workers),
+        'field_aliases': bench_field_aliases(text, repeat),
+        'excel': bench_excel(text, repeat),
+        'exports': bench_exports(text, repeat),
+    }
+    if not skip_ai:
+        results['preview_ai'] = bench_preview(text, repeat, latency)
+    return results
+
+
+def print_results(results: Dict) -> None:
+    """Affiche un résumé lisible des résultats."""
+    parse = results['parse']
+    excel = results['excel']
+    print("\n📊 BENCHMARK")
+    print("=" * 50)
+    print(f"📄 Document        : {results['document']['lines']} lignes, {parse['tasks']} tâches ({results['document']['style']})")
+    print(f"🚀 Import à froid   : {results['import']['import_sec'] * 1000:.1f} ms "
+          f"(modules lourds : {', '.join(results['import']['heavy_modules_loaded']) or 'aucun'})")
+    print(f"⚡ Parser classique : {parse['lines_per_sec']:.0f} lignes/s ({parse['seconds'] * 1000:.1f} ms)")
+    parallel = results['parse_parallel']
+    print(f"🧵 Parser parallèle : {parallel['lines_per_sec']:.0f} lignes/s sur {parallel['workers']} processus "
+          f"(x{parallel['speedup']:.2f})")
+    aliases = results['field_aliases']
+    print(f"🏷️ Champs de détail : {aliases['base_us_per_line']:.2f} → {aliases['extended_us_per_line']:.2f} µs/ligne "
+          f"avec {aliases['aliases']} alias (x{aliases['slowdown']:.2f})")
+    print(f"📊 Export Excel     : {excel['rows_per_sec']:.0f} lignes/s, pic mémoire {excel['peak_memory_mb']:.2f} Mo")
+    for fmt, export in results.get('exports', {}).items():
+        print(f"💾 Écriture {fmt:<8}: {export['rows_per_sec']:.0f} lignes/s ({export['file_size_kb']:.0f} Ko)")
+    if 'preview_ai' in results:
+        preview = results['preview_ai']
+        print(f"🤖 Prévisualisation IA : médiane {preview['median_sec'] * 1000:.1f} ms ({preview['requests']} requête(s))")
+        if preview['first_row_median_sec'] is not None:
+            print(f"⏱️ Première tâche (streaming) : médiane {preview['first_row_median_sec'] * 1000:.1f} ms")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmarks du convertisseur Text to Teamwork.")
+    parser.add_argument('--tasklists', type=int, default=50, help="Nombre de tâches principales (défaut : 50)")
+    parser.add_argument('--subtasks', type=int, default=5, help="Sous-tâches par tâche principale (défaut : 5)")
+    parser.add_argument('--detail-lines', type=int, default=3, help="Lignes de détail par tâche (défaut : 3)")
+    parser.add_argument('--style', choices=CODE_STYLES, default='mixed', help="Numérotation des en-têtes")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du générateur de documents")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre d'exécutions par mesure (meilleur temps retenu)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Latence simulée du faux serveur OpenAI (secondes)")
+    parser.add_argument('--skip-ai', action='store_true', help="Ne pas mesurer la prévisualisation IA")
+    parser.add_argument('--workers', type=int, help="Processus du parser parallèle (défaut : nombre de cœurs)")
+    parser.add_argument('-o', '--output', help="Fichier JSON de sortie (défaut : sortie standard)")
+    return parser
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Point d'entrée de la ligne de commande."""
+    args = build_arg_parser().parse_args(argv)
+    results = run_benchmarks(args.tasklists, args.subtasks, args.detail_lines, args.style,
+                             args.seed, args.repeat, args.latency, args.skip_ai, args.workers)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print_results(results)
+        print(f"\n✅ Résultats enregistrés : {args.output}")
+    else:
+        json.dump(results, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+import csv
+import importlib.util
+import io
+import json
+import os
+import tempfile
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from teamwork_row import COLUMNS, TeamworkRow
+
+# openpyxl (Excel) et pyarrow (Parquet) sont importés à la demande :
+# les exports CSV et JSONL ne chargent aucune dépendance lourde
+
+# Nom de la feuille attendu par l'import Teamwork
+SHEET_NAME = 'Teamwork Import'
+
+# Largeur maximale d'une colonne Excel (en caractères)
+MAX_COLUMN_WIDTH = 50
+
+# Lignes par groupe de lignes Parquet (mémoire bornée pendant l'écriture)
+PARQUET_BATCH_ROWS = 10000
+
+# Premiers caractères qu'Excel interprète comme une formule à l'ouverture d'un CSV ; « - » et « + »
+# n'y sont pas : ils ouvrent des textes ordinaires (« - étape 1 », « +2 jours ») qui doivent
+# arriver tels quels dans Teamwork
+CSV_FORMULA_PREFIXES = ('=', '@', '\t', '\r')
+
+
+def _row_values(rows: Iterable[Dict[str, str]], columns: Sequence[str]) -> Iterator[Sequence[str]]:
+    """Valeurs de chaque ligne dans l'ordre des colonnes (valeurs manquantes → vide)."""
+    # Colonnes Teamwork standard : les TeamworkRow donnent directement leurs valeurs dans l'ordre
+    standard_columns = tuple(columns) == COLUMNS
+    for row in rows:
+        if standard_columns and type(row) is TeamworkRow:
+            yield row.as_tuple()
+        else:
+            yield [row.get(col, '') for col in columns]
+
+
+def _header_cells(worksheet, columns: List[str]) -> List:
+    """Crée les cellules d'en-tête avec le même style que pandas (gras, bordures, centré)."""
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Alignment, Border, Font, Side
+
+    thin = Side(style='thin')
+    cells = []
+    for col in columns:
+        cell = WriteOnlyCell(worksheet, value=col)
+        cell.font = Font(bold=True)
+        cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell.alignment = Alignment(horizontal='center', vertical='top')
+        cells.append(cell)
+    return cells
+
+
+def write_excel(rows: Iterable[Dict[str, str]], output: Union[str, BinaryIO], columns: List[str]) -> int:
+    """
+    Écrit les lignes Teamwork dans un classeur Excel sans construire de DataFrame.
+
+    Les lignes sont consommées une seule fois : elles sont recopiées dans un fichier
+    temporaire CSV pendant que la largeur maximale de chaque colonne est mise à jour,
+    puis relues vers un classeur openpyxl en mode write-only (qui exige de connaître
+    les largeurs avant la première ligne). La mémoire reste constante quel que soit
+    le nombre de lignes.
+
+    Args:
+        rows: Itérable de dictionnaires (une clé par colonne)
+        output: Chemin du fichier ou flux binaire (ex: io.BytesIO)
+        columns: Ordre des colonnes
+
+    Returns:
+        Nombre de lignes écrites (hors en-tête)
+    """
+    from openpyxl import Workbook
+    from openpyxl.utils import get_column_letter
+
+    widths = [len(col) for col in columns]
+    row_count = 0
+
+    with tempfile.TemporaryFile('w+', newline='', encoding='utf-8') as spool:
+        spool_writer = csv.writer(spool)
+        for raw_values in _row_values(rows, columns):
+            values = []
+            for idx, value in enumerate(raw_values):
+                value = '' if value is None else str(value)
+                if len(value) > widths[idx]:
+                    widths[idx] = len(value)
+                values.append(value)
+            spool_writer.writerow(values)
+            row_count += 1
+
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(SHEET_NAME)
+
+        # Ajuster la largeur des colonnes (avant toute ligne en mode write-only)
+        for idx, width in enumerate(widths):
+            worksheet.column_dimensions[get_column_letter(idx + 1)].width = min(width + 2, MAX_COLUMN_WIDTH)
+
+        worksheet.append(_header_cells(worksheet, columns))
+
+        spool.seek(0)
+        for values in csv.reader(spool):
+            # Cellules vides plutôt que des chaînes vides
+            worksheet.append([value if value else None for value in values])
+
+        workbook.save(output)
+
+    return row_count
+
+
+def _open_text(output: Union[str, BinaryIO], encoding: str):
+    """Flux texte vers un chemin ou un flux binaire (à détacher sans fermer le flux de l'appelant)."""
+    if isinstance(output, str):
+        return open(output, 'w', newline='', encoding=encoding)
+    return io.TextIOWrapper(output, encoding=encoding, newline='', write_through=True)
+
+
+def _close_text(stream, output: Union[str, BinaryIO]) -> None:
+    if isinstance(output, str):
+        stream.close()
+    else:
+        stream.flush()
+        stream.detach()
+
+
+def _csv_cell(value):
+    """Préfixe d'une apostrophe une cellule qu'Excel exécuterait comme formule (injection CSV)."""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def write_csv(rows: Iterable[Dict[str, str]], output: Union[str, BinaryIO], columns: List[str]) -> int:
+    """
+    Écrit les lignes Teamwork en CSV (format importé par Teamwork), au fil de l'eau.
+
+    UTF-8 avec BOM pour que les accents s'affichent aussi à l'ouverture dans Excel ;
+    les cellules commençant par = ou @ (formules Excel) sont préfixées de « ' ».
+
+    Returns:
+        Nombre de lignes écrites (hors en-tête)
+    """
+    stream = _open_text(output, 'utf-8-sig')
+    try:
+        writer = csv.writer(stream)
+        writer.writerow(columns)
+        row_count = 0
+        for values in _row_values(rows, columns):
+            writer.writerow([_csv_cell(value) for value in values])
+            row_count += 1
+    finally:
+        _close_text(stream, output)
+    return row_count
+
+
+def write_jsonl(rows: Iterable[Dict[str, str]], output: Union[str, BinaryIO], columns: List[str]) -> int:
+    """
+    Écrit une ligne JSON par tâche (clés dans l'ordre des colonnes), au fil de l'eau.
+
+    Returns:
+        Nombre de lignes écrites
+    """
+    stream = _open_text(output, 'utf-8')
+    try:
+        write = stream.write
+        dumps = json.JSONEncoder(ensure_ascii=False).encode
+        row_count = 0
+        for values in _row_values(rows, columns):
+            write(dumps({col: ('' if value is None else value) for col, value in zip(columns, values)}))
+            write('\n')
+            row_count += 1
+    finally:
+        _close_text(stream, output)
+    return row_count
+
+
+def write_parquet(rows: Iterable[Dict[str, str]], output: Union[str, BinaryIO], columns: List[str],
+                  batch_rows: int = PARQUET_BATCH_ROWS) -> int:
+    """
+    Écrit les lignes Teamwork en Parquet (colonnes texte), par groupes de `batch_rows` lignes :
+    seul le groupe en cours est gardé en mémoire. Nécessite pyarrow (installé avec streamlit).
+
+    Returns:
+        Nombre de lignes écrites
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("L'export Parquet nécessite pyarrow (pip install pyarrow)")
+
+    schema = pa.schema([(col, pa.string()) for col in columns])
+    row_count = 0
+
+    with pq.ParquetWriter(output, schema) as writer:
+        batch = [[] for _ in columns]
+
+        def flush():
+            writer.write_batch(pa.RecordBatch.from_arrays([pa.array(values, pa.string()) for values in batch],
+                                                          schema=schema))
+            for values in batch:
+                values.clear()
+
+        for values in _row_values(rows, columns):
+            for column, value in zip(batch, values):
+                column.append('' if value is None else str(value))
+            row_count += 1
+            if row_count % batch_rows == 0:
+                flush()
+        if row_count == 0 or batch[0]:
+            flush()
+    return row_count
+
+
+class Exporter(NamedTuple):
+    """Format de sortie : fonction d'écriture en flux, extension, type MIME et libellé."""
+    write: Callable[[Iterable[Dict[str, str]], Union[str, BinaryIO], List[str]], int]
+    extension: str
+    mime: str
+    label: str
+    module: str = ''  # dépendance optionnelle à vérifier avant de proposer le format
+
+
+# Formats disponibles, par nom ; un nouveau format s'ajoute ici (EXPORTERS['tsv'] = Exporter(...))
+EXPORTERS = {
+    'xlsx': Exporter(write_excel, '.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+                     'Excel', 'openpyxl'),
+    'csv': Exporter(write_csv, '.csv', 'text/csv', 'CSV'),
+    'jsonl': Exporter(write_jsonl, '.jsonl', 'application/x-ndjson', 'JSON Lines'),
+    'parquet': Exporter(write_parquet, '.parquet', 'application/vnd.apache.parquet', 'Parquet', 'pyarrow'),
+}
+
+DEFAULT_FORMAT = 'xlsx'
+
+
+def available_formats() -> List[str]:
+    """Formats dont la dépendance optionnelle est installée."""
+    return [name for name, exporter in EXPORTERS.items()
+            if not exporter.module or importlib.util.find_spec(exporter.module) is not None]
+
+
+def get_exporter(fmt: str) -> Exporter:
+    """Retourne le format demandé (ValueError si inconnu)."""
+    exporter = EXPORTERS.get(fmt)
+    if exporter is None:
+        raise ValueError(f"Format d'export inconnu : {fmt} (formats : {', '.join(EXPORTERS)})")
+    return exporter
+
+
+def format_for_path(path: str) -> str:
+    """Format correspondant à l'extension d'un fichier (ValueError si elle n'est pas reconnue)."""
+    extension = os.path.splitext(path)[1].lower()
+    for name, exporter in EXPORTERS.items():
+        if exporter.extension == extension:
+            return name
+    raise ValueError(f"Extension de fichier non reconnue : {path} (extensions : "
+                     f"{', '.join(exporter.extension for exporter in EXPORTERS.values())} ; ou préciser le format)")
+
+
+def write_rows(rows: Iterable[Dict[str, str]], output: Union[str, BinaryIO], columns: List[str],
+               fmt: Optional[str] = None) -> int:
+    """
+    Écrit les lignes dans le format demandé (déduit de l'extension du chemin si absent).
+
+    Returns:
+        Nombre de lignes écrites
+    """
+    if fmt is None:
+        fmt = format_for_path(output) if isinstance(output, str) else DEFAULT_FORMAT
+    return get_exporter(fmt).write(rows, output, columns)
+
+
+def export_bytes(rows: Iterable[Dict[str, str]], columns: List[str], fmt: str = DEFAULT_FORMAT) -> bytes:
+    """Construit le fichier en mémoire et retourne son contenu (pour un téléchargement)."""
+    output = io.BytesIO()
+    write_rows(rows, output, columns, fmt)
+    return output.getvalue()
+
+
+def excel_bytes(rows: Iterable[Dict[str, str]], columns: List[str]) -> bytes:
+    """Construit le classeur en mémoire et retourne son contenu (pour un téléchargement)."""
+    return export_bytes(rows, columns, 'xlsx')
+
+
+def dataframe_rows(df) -> Iterable[Dict[str, str]]:
+    """Parcourt un DataFrame ligne par ligne sous forme de dictionnaires (valeurs manquantes → vide)."""
+    columns = list(df.columns)
+    for values in df.itertuples(index=False, name=None):
+        yield {col: ('' if value is None or value != value else value) for col, value in zip(columns, values)}
@@ -0,0 +1,67 @@
+import re
+from typing import Callable, Dict, NamedTuple, Optional
+
+
+class FieldLabel(NamedTuple):
+    """
+    Libellé d'un champ de détail (ex: « Priority: »), sans tenir compte de la casse.
+
+    Par défaut le libellé, deux-points compris, ouvre la ligne (après d'éventuels
+    puces, emojis ou espaces) et la valeur est le texte qui le suit. Avec
+    `anywhere=True`, il est cherché n'importe où dans la ligne et `value` est le motif
+    qui précède la valeur, à partir du libellé (None = le libellé suivi d'espaces) ;
+    sans ce motif dans la ligne, la ligne entière est la valeur.
+    """
+    field: str
+    label: str
+    value: Optional[str] = None
+    anywhere: bool = False
+
+
+# Libellés reconnus, par ordre de priorité : quand une ligne contient plusieurs libellés,
+# le premier de la liste l'emporte. Ajouter un alias ne demande aucun code ; un libellé
+# de début de ligne ne coûte qu'un essai ancré, quel que soit leur nombre.
+FIELD_SCHEMA = [
+    # Libellés historiques, reconnus n'importe où dans la ligne
+    FieldLabel('description', r'description\s*:', anywhere=True),
+    FieldLabel('priority', r'priorité\s*:', anywhere=True),
+    FieldLabel('dependencies', r'dépendance', r'dépendance[s]?\s*:\s*', anywhere=True),
+    FieldLabel('criteria', r'critère', r'critère.*?:\s*', anywhere=True),
+    FieldLabel('deliverables', r'livrable', r'livrable[s]?\s*:\s*', anywhere=True),
+    FieldLabel('risks', r'risque', r'risque[s]?\s*:\s*', anywhere=True),
+    FieldLabel('milestones', r'jalon\s+principal', r'jalon\s+principal\s*:\s*', anywhere=True),
+    FieldLabel('estimated_time', r'durée\s+estimée', r'durée\s+estimée\s*:\s*', anywhere=True),
+    FieldLabel('estimated_time', r'temps\s+estimé', r'temps\s+estimé\s*:\s*', anywhere=True),
+    # Libellés anglais, en début de ligne
+    FieldLabel('priority', r'priority\s*:'),
+    FieldLabel('dependencies', r'depends\s+on\s*:'),
+    FieldLabel('dependencies', r'dependenc(?:y|ies)\s*:'),
+    FieldLabel('criteria', r'acceptance\s+criteri(?:a|on)\s*:'),
+    FieldLabel('deliverables', r'deliverables?\s*:'),
+    FieldLabel('risks', r'risks?\s*:'),
+    FieldLabel('milestones', r'milestones?\s*:'),
+    FieldLabel('estimated_time', r'estimated?(?:\s+time)?\s*:'),
+]
+
+# Caractères admis avant un libellé de début de ligne (puces, emojis, gras markdown...)
+LABEL_PREFIX_PATTERN = r'[^\w]*'
+# Fermeture du gras/italique markdown après un tel libellé (« **Priority:** High »)
+LABEL_SUFFIX_PATTERN = r'(?:[*_]+\s*)?'
+
+
+# Durée en tête de la valeur : "3h", "3 heures", "30mn", "30 minutes"
+DURATION_PATTERN = re.compile(r'(\d+)\s*(?:(h)|mn|min)', re.IGNORECASE)
+
+
+def extract_duration(value: str) -> str:
+    """Formate la durée en tête d'une valeur : "3h" → "3hr", "30 minutes" → "30mn" ('' si absente)."""
+    match = DURATION_PATTERN.match(value)
+    if match is None:
+        return ''
+    return match.group(1) + ('hr' if match.group(2) else 'mn')
+
+
+# Extraction de la valeur de chaque type de champ (texte après le libellé par défaut)
+VALUE_EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    'estimated_time': extract_duration,
+}
@@ -0,0 +1,165 @@
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional
+
+# Étapes mesurées, dans l'ordre du pipeline de conversion
+STAGE_TITLE = 'title_extraction'
+STAGE_CLASSIFY = 'line_classification'
+STAGE_GROUPS = 'task_groups'
+STAGE_PRIORITY = 'priority_normalisation'
+STAGE_PARALLEL = 'parallel_parse'
+STAGE_AI_REQUEST = 'ai_request'
+STAGE_AI_VALIDATE = 'ai_validation'
+STAGE_DATAFRAME = 'dataframe_build'
+STAGE_EXCEL = 'excel_write'
+STAGE_EXPORT = 'export_write'  # CSV, JSONL, Parquet
+STAGES = (STAGE_TITLE, STAGE_CLASSIFY, STAGE_GROUPS, STAGE_PRIORITY, STAGE_PARALLEL,
+          STAGE_AI_REQUEST, STAGE_AI_VALIDATE, STAGE_DATAFRAME, STAGE_EXCEL, STAGE_EXPORT)
+
+# Compteurs alimentés par les réponses de l'IA (champ usage) et le cache
+COUNTER_PROMPT_TOKENS = 'ai_prompt_tokens'
+COUNTER_CACHED_PROMPT_TOKENS = 'ai_cached_prompt_tokens'
+COUNTER_COMPLETION_TOKENS = 'ai_completion_tokens'
+COUNTER_CACHE_HITS = 'ai_cache_hits'
+
+# Contexte vide partagé : stage(None, ...) ne crée aucun objet
+_NO_STAGE = nullcontext()
+
+
+class _Stage:
+    """Mesure d'une étape ; le temps des étapes imbriquées (même thread) est déduit du sien."""
+
+    __slots__ = ('metrics', 'name', 'items', 'start')
+
+    def __init__(self, metrics: 'PipelineMetrics', name: str, items: int):
+        self.metrics = metrics
+        self.name = name
+        self.items = items
+
+    def __enter__(self) -> '_Stage':
+        self.metrics._stack().append(0.0)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.start
+        stack = self.metrics._stack()
+        children = stack.pop()
+        if stack:
+            stack[-1] += elapsed
+        self.metrics.record(self.name, elapsed - children, self.items)
+
+
+class PipelineMetrics:
+    """
+    Temps et compteurs de chaque étape du pipeline de conversion.
+
+    Chaque étape accumule son nombre d'appels, d'éléments traités (lignes, groupes,
+    tâches) et son temps propre : une étape imbriquée dans une autre (le parse au fil
+    de l'eau pendant l'écriture Excel, par exemple) n'est comptée qu'une fois. Un
+    callback `on_stage(nom, secondes, éléments)` reçoit chaque mesure (export vers un
+    outil de suivi). Désactivée, l'instrumentation ne coûte rien : les convertisseurs
+    testent une seule fois par document si un enregistreur est branché.
+    """
+
+    def __init__(self, on_stage: Optional[Callable[[str, float, int], None]] = None):
+        """
+        Initialise l'enregistreur.
+
+        Args:
+            on_stage: Appelée avec (étape, secondes, éléments) à chaque mesure (optionnel)
+        """
+        self.on_stage = on_stage
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stages = {}
+        self.counters = {}
+
+    def _stack(self) -> List[float]:
+        """Temps des étapes enfants de chaque étape ouverte dans le thread courant."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def stage(self, name: str, items: int = 1) -> _Stage:
+        """Contexte mesurant une étape : with metrics.stage('excel_write', items=len(rows)): ..."""
+        return _Stage(self, name, items)
+
+    def timed(self, name: str, func: Callable) -> Callable:
+        """Enveloppe `func` pour mesurer chacun de ses appels comme une étape (un élément par appel)."""
+        def wrapper(*args, **kwargs):
+            with _Stage(self, name, 1):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def record(self, name: str, seconds: float, items: int = 1) -> None:
+        """Ajoute une mesure à une étape (utilisé directement par le code asynchrone)."""
+        with self._lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = {'calls': 0, 'items': 0, 'seconds': 0.0}
+            stats['calls'] += 1
+            stats['items'] += items
+            stats['seconds'] += seconds
+        if self.on_stage is not None:
+            self.on_stage(name, seconds, items)
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Incrémente un compteur (tokens de l'IA, réponses en cache...)."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, snapshot: Dict) -> None:
+        """Ajoute les mesures d'un autre enregistreur (résultat de snapshot(), ex : processus du pool)."""
+        with self._lock:
+            for name, other in snapshot.get('stages', {}).items():
+                stats = self.stages.setdefault(name, {'calls': 0, 'items': 0, 'seconds': 0.0})
+                for key in ('calls', 'items', 'seconds'):
+                    stats[key] += other[key]
+            for name, value in snapshot.get('counters', {}).items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict:
+        """Copie des mesures (sérialisable en JSON)."""
+        with self._lock:
+            return {
+                'stages': {name: dict(stats) for name, stats in self.stages.items()},
+                'counters': dict(self.counters),
+            }
+
+    def reset(self) -> None:
+        """Efface toutes les mesures."""
+        with self._lock:
+            self.stages = {}
+            self.counters = {}
+
+    def summary_rows(self) -> List[Dict]:
+        """Étapes dans l'ordre du pipeline : temps total, part du temps mesuré, appels et éléments."""
+        snapshot = self.snapshot()
+        stages = snapshot['stages']
+        total = sum(stats['seconds'] for stats in stages.values()) or 1e-9
+        order = [name for name in STAGES if name in stages] + sorted(set(stages) - set(STAGES))
+        return [{
+            'stage': name,
+            'seconds': round(stages[name]['seconds'], 6),
+            'share': round(stages[name]['seconds'] / total, 4),
+            'calls': stages[name]['calls'],
+            'items': stages[name]['items'],
+        } for name in order]
+
+    def format_summary(self) -> str:
+        """Résumé lisible des mesures (ligne de commande)."""
+        lines = [f"{'Étape':<24} {'Temps (ms)':>11} {'Part':>6} {'Appels':>8} {'Éléments':>9}"]
+        for row in self.summary_rows():
+            lines.append(f"{row['stage']:<24} {row['seconds'] * 1000:>11.1f} {row['share']:>6.0%} "
+                         f"{row['calls']:>8} {row['items']:>9}")
+        for name, value in sorted(self.snapshot()['counters'].items()):
+            lines.append(f"{name:<24} {value:>11}")
+        return '\n'.join(lines)
+
+
+def stage(metrics: Optional[PipelineMetrics], name: str, items: int = 1):
+    """Contexte de mesure d'une étape, sans effet si `metrics` est None (instrumentation désactivée)."""
+    return _NO_STAGE if metrics is None else _Stage(metrics, name, items)
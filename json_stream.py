@@ -0,0 +1,85 @@
+import json
+from typing import Any, List
+
+
+class JSONArrayStreamParser:
+    """
+    Extrait les objets du premier tableau JSON d'un texte reçu par morceaux.
+
+    Chaque objet placé directement dans le tableau est décodé dès que son accolade
+    fermante arrive, sans attendre la fin du texte : pour une réponse IA de la forme
+    {"tasks": [{...}, {...}]} (ou [{...}, ...]), les tâches sont disponibles une à une
+    pendant le streaming. Seul l'objet en cours est gardé en mémoire.
+    """
+
+    def __init__(self):
+        self._text = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._array_depth = None
+        self._object_start = None
+        self.done = False
+
+    def feed(self, data: str) -> List[Any]:
+        """
+        Ajoute un morceau de texte et retourne les objets du tableau terminés.
+
+        Raises:
+            json.JSONDecodeError: Si un objet complet n'est pas du JSON valide
+        """
+        if self.done or not data:
+            return []
+
+        text = self._text + data
+        objects = []
+        depth = self._depth
+        in_string = self._in_string
+        escape = self._escape
+        array_depth = self._array_depth
+        object_start = self._object_start
+
+        for i in range(self._pos, len(text)):
+            char = text[i]
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == '\\':
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char == '[' or char == '{':
+                depth += 1
+                if array_depth is None:
+                    if char == '[':
+                        array_depth = depth
+                elif char == '{' and depth == array_depth + 1:
+                    object_start = i
+            elif char == ']' or char == '}':
+                if array_depth is not None:
+                    if char == '}' and depth == array_depth + 1 and object_start is not None:
+                        objects.append(json.loads(text[object_start:i + 1]))
+                        object_start = None
+                    elif char == ']' and depth == array_depth:
+                        self.done = True
+                        break
+                depth -= 1
+
+        # Ne garder que l'objet en cours (le reste du texte a déjà été traité)
+        if object_start is None:
+            self._text = ''
+            self._pos = 0
+        else:
+            self._text = text[object_start:]
+            self._pos = len(text) - object_start
+            object_start = 0
+
+        self._depth = depth
+        self._in_string = in_string
+        self._escape = escape
+        self._array_depth = array_depth
+        self._object_start = object_start
+        return objects
@@ -0,0 +1,297 @@
+import re
+from typing import List, NamedTuple, Optional, Sequence
+
+from field_schema import FIELD_SCHEMA, LABEL_PREFIX_PATTERN, LABEL_SUFFIX_PATTERN, VALUE_EXTRACTORS, FieldLabel
+
+# Types de lignes produits par le classifieur
+HEADER = 'header'              # En-tête de tâche (1., DC-DM-001 -, •, a) ...)
+FIELD = 'field'                # Ligne de détail reconnue (Description :, Priorité : ...)
+IGNORE = 'ignore'              # Ligne qui ne peut pas être une tâche (en-têtes de section)
+CONTINUATION = 'continuation'  # Texte libre rattaché à la section courante
+
+# Patterns pour identifier les éléments avec numérotation hiérarchique
+TASK_PATTERNS = [
+    r'^[A-Z]{2,}-[A-Z]{2,}-\d+(?:\.\d+)*\s*[-–]\s*(.+)',  # DC-DM-001 - Tâche ou DC-DM-001.1 - Tâche
+    r'^\d+(?:\.\d+)*\.?\s*[–-]?\s*(.+)',  # 1. ou 2.5.1 – Tâche (capture la numérotation hiérarchique)
+    r'^[-•]\s*(.+)',    # - Tâche ou • Tâche
+    r'^[✓✅]\s*(.+)',   # ✓ Tâche ou ✅ Tâche
+    r'^[a-zA-Z]\)\s*(.+)', # a) Tâche
+]
+
+# Patterns à ignorer (ne sont pas des tâches)
+IGNORE_PATTERNS = [
+    r'critère\s*d[\'\'""]acceptation',
+    r'dépendance\s*:',
+    r'livrable\s*:',
+    r'risque\s*:',
+    r'description\s*:',
+    r'liste\s+des\s+tâches',
+    r'objectif\s+général',
+    r'jalon\s+principal',
+    r'gestion\s+des\s+risques',
+]
+
+# Pattern pour détecter le niveau de hiérarchie
+HIERARCHY_PATTERN = r'^(?:[A-Z]{2,}-[A-Z]{2,}-)?(\d+(?:\.\d+)*)'
+
+# Emojis de description et en-têtes de section (toujours ignorés comme tâches)
+EMOJI_IGNORE_PATTERNS = [
+    r'^\s*[🔗📋✅❗⚠️📌🎯]\s*(critère|dépendance|livrable|risque|liste|objectif|jalon)',
+    r'^\s*[✅📌🎯]\s+.*?(liste|objectif|jalon)',
+]
+
+# Code de tâche en tête de nom (ex: DC-DM-001.1 -)
+TASK_CODE_PATTERN = r'^[A-Z]{2,}-[A-Z]{2,}-\d+(?:\.\d+)*\s*[-–]\s*'
+
+# Code de tâche principale sans sous-niveau (ex: DC-DM-001 -)
+MAIN_TASK_PATTERN = r'^[A-Z]{2,}-[A-Z]{2,}-\d+\s*[-–]'
+
+
+class ClassifiedLine(NamedTuple):
+    """Résultat de la classification d'une ligne (déjà nettoyée des espaces)."""
+    kind: str
+    text: str
+    level: int = 1
+    code: str = ''
+    name: str = ''
+    is_main: bool = False
+    field: Optional[str] = None
+    value: str = ''
+
+
+class LineClassifier:
+    """
+    Classe chaque ligne en une seule passe : en-tête de tâche, champ de détail,
+    ligne ignorée ou continuation.
+
+    Toutes les expressions régulières sont compilées une seule fois à la construction,
+    et les motifs équivalents sont fusionnés en alternances pour éviter de
+    relancer le moteur de regex motif par motif sur chaque ligne.
+    """
+
+    def __init__(self, task_patterns: Sequence[str] = TASK_PATTERNS, ignore_patterns: Sequence[str] = IGNORE_PATTERNS,
+                 hierarchy_pattern: str = HIERARCHY_PATTERN, field_schema: Sequence[FieldLabel] = FIELD_SCHEMA):
+        self.task_res = [re.compile(pattern) for pattern in task_patterns]
+
+        # Une seule alternance pour les en-têtes : le premier motif qui matche gagne,
+        # comme la boucle du parser classique. Chaque motif est enveloppé dans un groupe
+        # dont le numéro permet de retrouver sa propre capture (nom de la tâche).
+        self._task_re = re.compile('|'.join(f'({pattern})' for pattern in task_patterns))
+        self._task_name_groups = {}
+        group = 1
+        for task_re in self.task_res:
+            self._task_name_groups[group] = group + 1
+            group += 1 + task_re.groups
+
+        # Motifs d'ignorance (insensibles à la casse) réunis dans une seule regex ;
+        # les motifs emoji, ancrés en début de ligne, dans une seconde
+        words = '|'.join(f'(?:{p})' for p in ignore_patterns) or '(?!)'
+        # Si tous les motifs commencent par une lettre, un lookahead sur ces lettres évite
+        # d'essayer chaque alternative à chaque position de la ligne
+        first_chars = {p[0] for p in ignore_patterns}
+        if first_chars and all(char.isalpha() for char in first_chars):
+            words = '(?=[' + ''.join(sorted(first_chars)) + '])(?:' + words + ')'
+        # (drapeau local (?i:...) : nettement plus rapide ici qu'un re.IGNORECASE global)
+        self._ignore_re = re.compile('(?i:' + words + ')')
+        self._ignore_emoji_re = re.compile('|'.join(f'(?:{p})' for p in EMOJI_IGNORE_PATTERNS))
+
+        # Champs de détail : libellés du schéma compilés en deux regex (voir _compile_fields)
+        self.field_schema = list(field_schema)
+        self._field_kinds = [label.field for label in self.field_schema]
+        self._field_extractors = [VALUE_EXTRACTORS.get(label.field) for label in self.field_schema]
+        anywhere = [index for index, label in enumerate(self.field_schema) if label.anywhere]
+        at_start = [index for index, label in enumerate(self.field_schema) if not label.anywhere]
+        self._field_any_re, self._field_any_groups = self._compile_fields(anywhere)
+        # Libellés plus prioritaires que chaque libellé « n'importe où », vérifiés après lui
+        self._field_higher = {index: self._compile_fields([other for other in anywhere if other < index])
+                              for index in anywhere}
+        # Libellés de début de ligne : table de dispatch sur la première lettre après les puces
+        # et emojis, pour n'essayer que les libellés qui commencent par cette lettre (regex
+        # complète si un libellé ne commence pas par une lettre)
+        self._label_prefix_re = re.compile(LABEL_PREFIX_PATTERN)
+        self._field_start = self._compile_fields(at_start, prefix=LABEL_PREFIX_PATTERN)
+        self._field_start_dispatch = {}
+        first_chars = {self.field_schema[index].label[:1].lower() for index in at_start}
+        if all(char.isalpha() for char in first_chars):
+            for char in first_chars:
+                self._field_start_dispatch[char] = self._compile_fields(
+                    [index for index in at_start if self.field_schema[index].label[:1].lower() == char], prefix='')
+        # Inutile d'essayer les libellés de début de ligne si un libellé trouvé les précède tous
+        self._field_start_first = at_start[0] if at_start else len(self.field_schema)
+        # Motifs de valeur des libellés « n'importe où », par champ (voir search_field)
+        self._field_search = {}
+        for index in anywhere:
+            label = self.field_schema[index]
+            value = label.value if label.value is not None else label.label + r'\s*'
+            self._field_search.setdefault(label.field, []).append((re.compile('(?i:' + value + ')'), index))
+
+        self.hierarchy_re = re.compile(hierarchy_pattern)
+        self.task_code_re = re.compile(TASK_CODE_PATTERN)
+        self.main_task_re = re.compile(MAIN_TASK_PATTERN)
+
+    def _compile_fields(self, indexes: List[int], prefix: Optional[str] = None):
+        """
+        Compile les libellés du schéma d'indices `indexes` en une seule regex.
+
+        Un libellé « n'importe où » devient `(?=libellé)(?:.*valeur)?` : la recherche
+        s'arrête sur le libellé le plus à gauche (le premier du schéma à cette position)
+        et la partie optionnelle avance jusqu'après la dernière occurrence du motif de la
+        valeur, soit ce que supprimait re.sub(r'.*valeur', '', ligne). Les libellés de
+        début de ligne (`prefix` donné) forment une alternance essayée une seule fois, après
+        `prefix` et suivie d'une éventuelle fermeture du gras markdown. Le type du champ et sa valeur sont donc obtenus en un seul passage.
+
+        Returns:
+            (regex ou None, numéro de groupe → indice du libellé dans le schéma)
+        """
+        if not indexes:
+            return None, {}
+        alternatives = []
+        groups = {}
+        group = 1
+        for index in indexes:
+            label = self.field_schema[index]
+            value = label.value if label.value is not None else label.label + r'\s*'
+            if prefix is not None:
+                alternatives.append(f'({value})')
+            else:
+                alternatives.append(f'((?={label.label})(?:.*{value})?)')
+            groups[group] = index
+            group += 1 + re.compile(value).groups + (0 if prefix is not None else re.compile(label.label).groups)
+        pattern = '(?:' + '|'.join(alternatives) + ')'
+        if prefix is not None:
+            return re.compile('(?i:' + prefix + pattern + LABEL_SUFFIX_PATTERN + ')'), groups
+
+        # Lookahead sur les premiers caractères possibles : les autres positions de la ligne
+        # sont écartées sans essayer chaque libellé
+        first_chars = {self.field_schema[index].label[:1].lower() for index in indexes}
+        if all(char.isalpha() for char in first_chars):
+            pattern = '(?=[' + ''.join(sorted(first_chars)) + '])' + pattern
+        return re.compile('(?i:' + pattern + ')'), groups
+
+    def is_ignored(self, line: str) -> bool:
+        """Vérifie si une ligne ne peut pas être une tâche (équivalent de should_ignore_line)."""
+        line_lower = line.lower().strip()
+        if len(line_lower) < 3:
+            return True
+        return (self._ignore_re.search(line_lower) is not None
+                or self._ignore_emoji_re.match(line_lower) is not None)
+
+    def match_header(self, line: str) -> Optional[str]:
+        """Retourne le nom capturé par le premier motif de tâche qui matche, sinon None."""
+        match = self._task_re.match(line)
+        if match is None:
+            return None
+        return match.group(self._task_name_groups[match.lastindex])
+
+    def strip_task_code(self, name: str) -> str:
+        """Supprime le code de tâche (ex: DC-DM-001.1 -) en tête du nom."""
+        return self.task_code_re.sub('', name, count=1).strip()
+
+    def hierarchy(self, line: str):
+        """Retourne le niveau de hiérarchie et le numéro de la tâche."""
+        match = self.hierarchy_re.match(line)
+        if match:
+            number = match.group(1)
+            return len(number.split('.')), number
+        return 1, ''
+
+    def is_main_task(self, line: str, number: str) -> bool:
+        """Une tâche principale porte un code sans sous-niveau (ex: DC-DM-001)."""
+        return '.' not in number and self.main_task_re.match(line) is not None
+
+    def _match_start_field(self, line: str):
+        """Libellé de début de ligne du schéma en tête de `line` : (match, indice du libellé) ou (None, None)."""
+        if self._field_start_dispatch:
+            position = 0 if line[:1].isalnum() else self._label_prefix_re.match(line).end()
+            start_re, groups = self._field_start_dispatch.get(line[position:position + 1].lower(), (None, None))
+            start = start_re.match(line, position) if start_re is not None else None
+        else:
+            start_re, groups = self._field_start
+            start = start_re.match(line) if start_re is not None else None
+        if start is None:
+            return None, None
+        return start, groups[start.lastindex]
+
+    def classify_field(self, line: str):
+        """Retourne (type de champ, valeur) pour une ligne de détail, ou (None, '')."""
+        match = self._field_any_re.search(line) if self._field_any_re is not None else None
+        if match is not None:
+            index = self._field_any_groups[match.lastindex]
+            # Un libellé plus prioritaire plus loin dans la ligne l'emporte (ex: "Critère ... Description : ...") ;
+            # aucun ne peut commencer avant le libellé trouvé, ni à sa position
+            while index:
+                higher_re, groups = self._field_higher[index]
+                higher = higher_re.search(line, match.start() + 1) if higher_re is not None else None
+                if higher is None:
+                    break
+                match = higher
+                index = groups[match.lastindex]
+            found = match.end() > match.start()
+        else:
+            index = len(self.field_schema)
+
+        if index > self._field_start_first:
+            start, start_index = self._match_start_field(line)
+            if start is not None and start_index < index:
+                match = start
+                index = start_index
+                found = True
+        if match is None:
+            return None, ''
+
+        extractor = self._field_extractors[index]
+        if extractor is not None:
+            # Valeur typée (durée...) : seulement après le libellé complet
+            return self._field_kinds[index], extractor(line[match.end():]) if found else ''
+        # Libellé trouvé sans deux-points : la ligne entière est la valeur
+        return self._field_kinds[index], line[match.end():] if found else line
+
+    def search_field(self, field: str, text: str) -> str:
+        """
+        Cherche la valeur d'un champ n'importe où dans `text`, même au milieu d'une autre
+        ligne de détail ou d'un en-tête (ex: « Tâche (Durée estimée : 2h) »).
+
+        Les libellés « n'importe où » du champ sont essayés dans l'ordre du schéma ; la
+        première occurrence dont la valeur est non vide l'emporte ('' si aucune).
+        """
+        for value_re, index in self._field_search.get(field, []):
+            extractor = self._field_extractors[index]
+            for match in value_re.finditer(text):
+                value = text[match.end():]
+                if extractor is not None:
+                    value = extractor(value)
+                if value:
+                    return value
+        return ''
+
+    def classify(self, line: str) -> ClassifiedLine:
+        """Classe une ligne déjà nettoyée (strip) et non vide."""
+        # Version « à plat » de is_ignored / match_header / classify_detail : cette méthode
+        # est appelée pour chaque ligne du document, les appels intermédiaires coûtent cher.
+        line_lower = line.lower()
+        ignored = (len(line_lower) < 3
+                   or self._ignore_re.search(line_lower) is not None
+                   or self._ignore_emoji_re.match(line_lower) is not None)
+        if not ignored:
+            match = self._task_re.match(line)
+            # Une puce suivie d'un libellé de début de ligne (« - Priority: High ») est un champ
+            if match is not None and self._match_start_field(line)[0] is None:
+                raw_name = match.group(self._task_name_groups[match.lastindex])
+                level, number = self.hierarchy(line)
+                return ClassifiedLine(
+                    HEADER, line, level, number,
+                    self.task_code_re.sub('', raw_name.strip(), count=1).strip(),
+                    '.' not in number and self.main_task_re.match(line) is not None,
+                )
+
+        field, value = self.classify_field(line)
+        if field is None:
+            return ClassifiedLine(IGNORE if ignored else CONTINUATION, line)
+        return ClassifiedLine(FIELD, line, field=field, value=value)
+
+    def classify_detail(self, line: str) -> ClassifiedLine:
+        """Classe une ligne du corps d'une tâche : champ de détail ou continuation."""
+        field, value = self.classify_field(line)
+        if field is not None:
+            return ClassifiedLine(FIELD, line, field=field, value=value)
+        return ClassifiedLine(CONTINUATION, line)
@@ -0,0 +1,153 @@
+import os
+import threading
+from typing import Dict, Optional
+
+# Connexions HTTP gardées ouvertes par client (et nombre maximal de connexions simultanées)
+DEFAULT_POOL_SIZE = 20
+
+# Délais des requêtes OpenAI en secondes : établissement de la connexion, puis requête complète
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_TIMEOUT = 120.0
+
+# Durée pendant laquelle une connexion inactive reste ouverte (le serveur peut la fermer avant)
+DEFAULT_KEEPALIVE_SECONDS = 120.0
+
+
+class OpenAIClientRegistry:
+    """
+    Clients OpenAI partagés par tout le processus.
+
+    Un seul client synchrone par couple (clé API, serveur) : tous les parsers et toutes
+    les sessions Streamlit qui utilisent la même clé réutilisent son pool de connexions
+    keep-alive, au lieu de refaire DNS + TCP + TLS pour chaque nouveau convertisseur.
+    La taille du pool et les délais sont explicites, et warm_up() ouvre la connexion
+    avant la première requête d'un utilisateur.
+
+    Les clients asynchrones restent propres à chaque parser : leurs connexions sont
+    liées à la boucle asyncio qui les a ouvertes (une par appel de asyncio.run), et
+    AsyncAITaskParser.aclose() (ou `async with parser`) les ferme avant la fin de la boucle.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE, timeout: float = DEFAULT_TIMEOUT,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT, keepalive: float = DEFAULT_KEEPALIVE_SECONDS):
+        """
+        Initialise le registre.
+
+        Args:
+            pool_size: Connexions gardées ouvertes (et simultanées au plus) par client
+            timeout: Délai maximal d'une requête en secondes
+            connect_timeout: Délai maximal d'établissement d'une connexion en secondes
+            keepalive: Durée de vie d'une connexion inactive en secondes
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.keepalive = keepalive
+
+        self._clients = {}
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.warmed = 0
+
+    def _http_options(self) -> Dict:
+        """Paramètres httpx communs aux clients synchrones et asynchrones."""
+        import httpx
+        return {
+            'limits': httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size,
+                                   keepalive_expiry=self.keepalive),
+            'timeout': httpx.Timeout(self.timeout, connect=self.connect_timeout),
+            'follow_redirects': True,
+        }
+
+    def get(self, api_key: str, base_url: Optional[str] = None):
+        """Retourne le client synchrone partagé pour cette clé et ce serveur (créé au premier appel)."""
+        key = (api_key, base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.reused += 1
+                return client
+
+            import httpx
+            import openai
+            options = self._http_options()
+            # Les nouvelles tentatives sont gérées par l'ordonnanceur
+            client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=options['timeout'],
+                                   http_client=httpx.Client(**options))
+            self._clients[key] = client
+            self.created += 1
+            return client
+
+    def create_async(self, api_key: str, base_url: Optional[str] = None, timeout: Optional[float] = None):
+        """Crée un client asynchrone avec la même configuration de pool (non partagé, voir la classe)."""
+        import httpx
+        import openai
+        options = self._http_options()
+        if timeout is not None:
+            options['timeout'] = httpx.Timeout(timeout, connect=min(self.connect_timeout, timeout))
+        return openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=options['timeout'],
+                                  http_client=httpx.AsyncClient(**options))
+
+    def warm_up(self, api_key: str, base_url: Optional[str] = None) -> bool:
+        """
+        Ouvre la connexion du client partagé (DNS, TCP, TLS) par une requête légère
+        (liste des modèles, non facturée) ; la connexion reste ensuite dans le pool.
+
+        Returns:
+            True si le serveur a répondu
+        """
+        try:
+            self.get(api_key, base_url).models.list()
+        except Exception as e:
+            print(f"⚠️ Préchauffage de la connexion OpenAI impossible : {e}")
+            return False
+        with self._lock:
+            self.warmed += 1
+        return True
+
+    def warm_up_in_background(self, api_key: str, base_url: Optional[str] = None) -> threading.Thread:
+        """Lance warm_up() dans un thread pour ne pas retarder le démarrage de l'application."""
+        thread = threading.Thread(target=self.warm_up, args=(api_key, base_url), daemon=True)
+        thread.start()
+        return thread
+
+    def close(self) -> None:
+        """Ferme les connexions de tous les clients partagés."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients = {}
+        for client in clients:
+            client.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs du registre."""
+        with self._lock:
+            return {
+                'clients': len(self._clients),
+                'created': self.created,
+                'reused': self.reused,
+                'warmed': self.warmed,
+            }
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> OpenAIClientRegistry:
+    """
+    Retourne le registre de clients partagé par tout le processus, configuré par les variables
+    d'environnement : AI_HTTP_POOL_SIZE, AI_HTTP_TIMEOUT, AI_HTTP_CONNECT_TIMEOUT et
+    AI_HTTP_KEEPALIVE (secondes).
+    """
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = OpenAIClientRegistry(
+                pool_size=int(os.getenv('AI_HTTP_POOL_SIZE', DEFAULT_POOL_SIZE)),
+                timeout=float(os.getenv('AI_HTTP_TIMEOUT', DEFAULT_TIMEOUT)),
+                connect_timeout=float(os.getenv('AI_HTTP_CONNECT_TIMEOUT', DEFAULT_CONNECT_TIMEOUT)),
+                keepalive=float(os.getenv('AI_HTTP_KEEPALIVE', DEFAULT_KEEPALIVE_SECONDS)),
+            )
+        return _default_registry
@@ -0,0 +1,283 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Codes HTTP des erreurs passagères (limite de débit, surcharge, erreurs serveur)
+TRANSIENT_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+
+# Exceptions openai passagères (reconnues par leur nom : openai n'est pas importé ici)
+TRANSIENT_ERROR_NAMES = ('RateLimitError', 'APITimeoutError', 'APIConnectionError', 'InternalServerError')
+
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 30.0
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Indique si une erreur d'appel OpenAI mérite une nouvelle tentative."""
+    if getattr(error, 'status_code', None) in TRANSIENT_STATUS_CODES:
+        return True
+    if type(error).__name__ in TRANSIENT_ERROR_NAMES:
+        return True
+    return isinstance(error, ConnectionError)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Délai demandé par le serveur (en-têtes retry-after-ms / Retry-After), ou None."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        # Retry-After au format date HTTP : laisser le backoff exponentiel décider
+        return None
+    return None
+
+
+class RequestScheduler:
+    """
+    Ordonnanceur des appels OpenAI respectant les quotas du compte.
+
+    Deux budgets par minute, requêtes (RPM) et tokens (TPM), se rechargent en continu :
+    chaque appel réserve sa part (tokens du prompt + max_tokens, comme le compte OpenAI)
+    et attend si le budget est épuisé, ce qui forme une file d'attente ; la réservation
+    d'une tentative échouée est rendue avant la suivante. Les erreurs
+    passagères (429, 5xx, coupures réseau) sont retentées avec un backoff exponentiel
+    à gigue, en respectant l'en-tête Retry-After ; un 429 suspend aussi les appels
+    suivants le temps demandé. Partagé entre threads et boucles asyncio.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None, tokens_per_minute: Optional[float] = None,
+                 max_retries: int = DEFAULT_MAX_RETRIES, backoff_base: float = DEFAULT_BACKOFF_BASE,
+                 backoff_max: float = DEFAULT_BACKOFF_MAX, seed: Optional[int] = None):
+        """
+        Initialise l'ordonnanceur.
+
+        Args:
+            requests_per_minute: Quota de requêtes par minute (None ou 0 = illimité)
+            tokens_per_minute: Quota de tokens par minute (None ou 0 = illimité)
+            max_retries: Nombre maximal de nouvelles tentatives par appel
+            backoff_base: Délai de base du backoff exponentiel en secondes
+            backoff_max: Délai maximal entre deux tentatives en secondes
+            seed: Graine de la gigue (tests)
+        """
+        self.requests_per_minute = requests_per_minute or None
+        self.tokens_per_minute = tokens_per_minute or None
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._updated_at = time.monotonic()
+        self._request_budget = float(self.requests_per_minute or 0)
+        self._token_budget = float(self.tokens_per_minute or 0)
+        self._paused_until = 0.0
+
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.throttle_time = 0.0
+        self.backoff_time = 0.0
+        self.estimated_tokens = 0
+        self.used_tokens = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        self._updated_at = now
+        if self.requests_per_minute:
+            self._request_budget = min(self.requests_per_minute,
+                                       self._request_budget + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._token_budget = min(self.tokens_per_minute,
+                                     self._token_budget + elapsed * self.tokens_per_minute / 60)
+
+    def _reserve(self, tokens: int, retry: bool = False) -> float:
+        """
+        Réserve le budget d'une tentative et retourne l'attente nécessaire (secondes) ; une
+        nouvelle tentative (`retry`) n'est pas comptée comme une requête de plus dans les stats.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            wait = max(0.0, self._paused_until - now)
+            # Le budget peut devenir négatif : la dette fixe l'attente des appels suivants
+            if self.requests_per_minute:
+                self._request_budget -= 1
+                if self._request_budget < 0:
+                    wait = max(wait, -self._request_budget * 60 / self.requests_per_minute)
+            if self.tokens_per_minute:
+                self._token_budget -= tokens
+                if self._token_budget < 0:
+                    wait = max(wait, -self._token_budget * 60 / self.tokens_per_minute)
+            if not retry:
+                self.requests += 1
+                self.estimated_tokens += tokens
+            if wait > 0:
+                self.queue_depth += 1
+                self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+                self.throttle_time += wait
+            return wait
+
+    def _dequeue(self) -> None:
+        with self._lock:
+            self.queue_depth -= 1
+
+    def _release(self, tokens: int) -> None:
+        """Rend au budget la réservation d'une tentative échouée (429, 5xx...) : rien n'a été consommé."""
+        with self._lock:
+            if self.requests_per_minute:
+                self._request_budget = min(self.requests_per_minute, self._request_budget + 1)
+            if self.tokens_per_minute:
+                self._token_budget = min(self.tokens_per_minute, self._token_budget + tokens)
+
+    def _record_success(self, result, tokens: int) -> None:
+        """Rend au budget les tokens réservés mais non consommés (champ usage de la réponse)."""
+        usage = getattr(result, 'usage', None)
+        used = getattr(usage, 'total_tokens', None)
+        if isinstance(used, int):
+            self.record_usage(tokens, used)
+
+    def record_usage(self, tokens: int, used: int) -> None:
+        """
+        Enregistre les tokens réellement consommés par un appel qui en avait réservé `tokens`
+        (appelé automatiquement, sauf pour les réponses en streaming dont l'usage arrive à la fin).
+        """
+        with self._lock:
+            self.used_tokens += used
+            if self.tokens_per_minute:
+                self._token_budget = min(self.tokens_per_minute, self._token_budget + tokens - used)
+
+    def _retry_delay(self, error: BaseException, attempt: int) -> Optional[float]:
+        """Délai avant la prochaine tentative, ou None si l'erreur est définitive."""
+        if attempt >= self.max_retries or not is_transient_error(error):
+            with self._lock:
+                self.failures += 1
+            return None
+
+        retry_after = retry_after_seconds(error)
+        with self._lock:
+            self.retries += 1
+            if getattr(error, 'status_code', None) == 429 or type(error).__name__ == 'RateLimitError':
+                self.rate_limited += 1
+            if retry_after is not None:
+                # Le serveur a fixé le délai : petite gigue pour étaler la reprise, pause générale
+                delay = retry_after * (1 + self._random.uniform(0, 0.1))
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            else:
+                # Backoff exponentiel à gigue complète
+                delay = self._random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+            self.backoff_time += delay
+        return delay
+
+    def call(self, request: Callable[[], T], tokens: int = 0) -> T:
+        """
+        Exécute un appel synchrone dans les quotas, avec nouvelles tentatives.
+
+        Args:
+            request: Fonction qui effectue l'appel (rappelée à chaque tentative)
+            tokens: Estimation des tokens consommés par l'appel
+
+        Returns:
+            Résultat de l'appel ; la dernière erreur est relancée si toutes les tentatives échouent
+        """
+        attempt = 0
+        while True:
+            wait = self._reserve(tokens, retry=attempt > 0)
+            if wait > 0:
+                time.sleep(wait)
+                self._dequeue()
+            try:
+                result = request()
+            except Exception as e:
+                self._release(tokens)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                print(f"🔁 Nouvelle tentative dans {delay:.1f}s ({attempt + 1}/{self.max_retries}) : {e}")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._record_success(result, tokens)
+            return result
+
+    async def call_async(self, request: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """Variante asynchrone de call() : `request` retourne une coroutine à chaque tentative."""
+        attempt = 0
+        while True:
+            wait = self._reserve(tokens, retry=attempt > 0)
+            if wait > 0:
+                try:
+                    await asyncio.sleep(wait)
+                finally:
+                    self._dequeue()
+            try:
+                result = await request()
+            except asyncio.TimeoutError:
+                # Délai maximal fixé par l'appelant : abandon, pas de nouvelle tentative
+                with self._lock:
+                    self.failures += 1
+                raise
+            except Exception as e:
+                self._release(tokens)
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                print(f"🔁 Nouvelle tentative dans {delay:.1f}s ({attempt + 1}/{self.max_retries}) : {e}")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._record_success(result, tokens)
+            return result
+
+    def stats(self) -> Dict[str, float]:
+        """Retourne les métriques de l'ordonnanceur."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'rate_limited': self.rate_limited,
+                'failures': self.failures,
+                'queue_depth': self.queue_depth,
+                'max_queue_depth': self.max_queue_depth,
+                'throttle_time': round(self.throttle_time, 3),
+                'backoff_time': round(self.backoff_time, 3),
+                'estimated_tokens': self.estimated_tokens,
+                'used_tokens': self.used_tokens,
+            }
+
+
+_default_scheduler = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler() -> RequestScheduler:
+    """
+    Retourne l'ordonnanceur partagé par tout le processus, configuré par les variables
+    d'environnement : AI_RPM_LIMIT et AI_TPM_LIMIT (0 = illimité), AI_MAX_RETRIES,
+    AI_BACKOFF_BASE et AI_BACKOFF_MAX (secondes).
+    """
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler(
+                requests_per_minute=float(os.getenv('AI_RPM_LIMIT', 0)),
+                tokens_per_minute=float(os.getenv('AI_TPM_LIMIT', 0)),
+                max_retries=int(os.getenv('AI_MAX_RETRIES', DEFAULT_MAX_RETRIES)),
+                backoff_base=float(os.getenv('AI_BACKOFF_BASE', DEFAULT_BACKOFF_BASE)),
+                backoff_max=float(os.getenv('AI_BACKOFF_MAX', DEFAULT_BACKOFF_MAX)),
+            )
+        return _default_scheduler
@@ -0,0 +1,210 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+# Intervalle entre deux échantillons (secondes) : ~50 piles par seconde et par thread
+DEFAULT_INTERVAL = 0.02
+
+# Profondeur maximale d'une pile échantillonnée (les appels les plus profonds sont conservés)
+DEFAULT_MAX_DEPTH = 128
+
+# Nombre maximal de piles distinctes conservées : les suivantes sont comptées dans OTHER_STACK
+DEFAULT_MAX_STACKS = 10000
+
+# Pile regroupant les échantillons au-delà de max_stacks piles distinctes
+OTHER_STACK = '(autres piles)'
+
+# Threads exécutant les scripts des sessions Streamlit
+STREAMLIT_THREAD_PREFIX = 'ScriptRunner'
+
+
+class SamplingProfiler:
+    """
+    Profileur par échantillonnage des threads en cours d'exécution.
+
+    Un thread de fond relève à intervalle régulier la pile d'appels des threads
+    surveillés (sys._current_frames) et compte chaque pile. Aucun hook n'est posé sur
+    le code profilé : le coût se limite au relevé périodique (quelques dizaines de
+    microsecondes), ce qui permet de le laisser tourner en production. Les piles sont
+    exportées au format « collapsed » (une ligne `a;b;c nombre` par pile), lu par
+    flamegraph.pl, speedscope ou inferno. Au-delà de `max_stacks` piles distinctes, les
+    nouvelles piles sont regroupées dans OTHER_STACK : la mémoire reste bornée.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_name_prefix: Optional[str] = None,
+                 max_depth: int = DEFAULT_MAX_DEPTH, max_stacks: int = DEFAULT_MAX_STACKS):
+        """
+        Initialise le profileur.
+
+        Args:
+            interval: Intervalle entre deux échantillons en secondes
+            thread_name_prefix: Ne relever que les threads dont le nom commence ainsi (None = tous)
+            max_depth: Profondeur maximale d'une pile
+            max_stacks: Nombre maximal de piles distinctes conservées
+        """
+        self.interval = interval
+        self.thread_name_prefix = thread_name_prefix
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._labels = {}  # objet code → « module:fonction »
+        self.stacks = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.started_at = None
+        self.running_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Démarre l'échantillonnage (sans effet s'il est déjà lancé)."""
+        with self._lock:
+            if self.running:
+                return
+            self._stop.clear()
+            self.started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name='SamplingProfiler', daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Arrête l'échantillonnage ; les piles relevées sont conservées."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        with self._lock:
+            self._thread = None
+            self.running_seconds += time.monotonic() - self.started_at
+            self.started_at = None
+
+    def reset(self) -> None:
+        """Efface les piles relevées."""
+        with self._lock:
+            self.stacks = Counter()
+            self.samples = 0
+            self.sampling_seconds = 0.0
+            self.running_seconds = 0.0
+            if self.started_at is not None:
+                self.started_at = time.monotonic()
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            self._sample(own_id)
+            with self._lock:
+                self.sampling_seconds += time.perf_counter() - start
+
+    def _sample(self, own_id: int) -> None:
+        """Relève la pile de chaque thread surveillé."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        prefix = self.thread_name_prefix
+        stacks = []
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            if prefix is not None and not names.get(thread_id, '').startswith(prefix):
+                continue
+            stacks.append(self._collapse(frame))
+        with self._lock:
+            self.samples += 1
+            counts = self.stacks
+            for stack in stacks:
+                if stack not in counts and len(counts) >= self.max_stacks:
+                    stack = OTHER_STACK
+                counts[stack] += 1
+
+    def _collapse(self, frame) -> str:
+        """Pile d'un thread, de l'appel le plus ancien au plus récent : « a;b;c »."""
+        labels = self._labels
+        names = []
+        while frame is not None and len(names) < self.max_depth:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                module = frame.f_globals.get('__name__', '?')
+                label = labels[code] = f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+            names.append(label)
+            frame = frame.f_back
+        names.reverse()
+        return ';'.join(names)
+
+    def collapsed(self) -> str:
+        """Piles au format « collapsed » (flamegraph.pl, speedscope), les plus fréquentes d'abord."""
+        with self._lock:
+            stacks = self.stacks.most_common()
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def top_functions(self, limit: int = 20) -> List[Dict]:
+        """
+        Fonctions les plus présentes dans les piles relevées.
+
+        Returns:
+            Liste de {'function', 'self', 'total', 'self_share', 'total_share'} : `self` compte les
+            échantillons où la fonction s'exécutait, `total` ceux où elle était dans la pile
+        """
+        with self._lock:
+            stacks = list(self.stacks.items())
+        own = Counter()
+        inclusive = Counter()
+        total_samples = 0
+        for stack, count in stacks:
+            names = stack.split(';')
+            own[names[-1]] += count
+            for name in set(names):
+                inclusive[name] += count
+            total_samples += count
+        total_samples = total_samples or 1
+        return [{
+            'function': name,
+            'self': own[name],
+            'total': count,
+            'self_share': round(own[name] / total_samples, 4),
+            'total_share': round(count / total_samples, 4),
+        } for name, count in sorted(inclusive.items(), key=lambda item: (-own[item[0]], -item[1]))[:limit]]
+
+    def stats(self) -> Dict[str, float]:
+        """Échantillons, piles distinctes et coût de l'échantillonnage (part d'un cœur)."""
+        with self._lock:
+            elapsed = self.running_seconds
+            if self.started_at is not None:
+                elapsed += time.monotonic() - self.started_at
+            return {
+                'running': self.running,
+                'samples': self.samples,
+                'stacks': sum(self.stacks.values()),
+                'distinct_stacks': len(self.stacks),
+                'other_stacks': self.stacks.get(OTHER_STACK, 0),
+                'elapsed': round(elapsed, 3),
+                'overhead': round(self.sampling_seconds / elapsed, 4) if elapsed else 0.0,
+            }
+
+
+_default_profiler = None
+_default_profiler_lock = threading.Lock()
+
+
+def get_profiler() -> SamplingProfiler:
+    """
+    Retourne le profileur partagé par tout le processus, qui relève les threads des sessions
+    Streamlit. Configuré par les variables d'environnement PROFILER_INTERVAL_MS,
+    PROFILER_THREAD_PREFIX (vide = tous les threads) et PROFILER_MAX_STACKS.
+    """
+    global _default_profiler
+    with _default_profiler_lock:
+        if _default_profiler is None:
+            _default_profiler = SamplingProfiler(
+                interval=float(os.getenv('PROFILER_INTERVAL_MS', DEFAULT_INTERVAL * 1000)) / 1000,
+                thread_name_prefix=os.getenv('PROFILER_THREAD_PREFIX', STREAMLIT_THREAD_PREFIX) or None,
+                max_stacks=int(os.getenv('PROFILER_MAX_STACKS', DEFAULT_MAX_STACKS)),
+            )
+        return _default_profiler
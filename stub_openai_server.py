@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+Faux serveur OpenAI local (endpoint chat.completions) pour tester et mesurer le
+mode IA sans clé API : les réponses sont dérivées du parser classique.
+Usage:
+    python stub_openai_server.py --port 8000 --latency 0.5 --latency-distribution normal --latency-jitter 0.2
+    python stub_openai_server.py --error-rate 0.05 --rate-limit-rate 0.1 --truncate-rate 0.05
+    python stub_openai_server.py --stream-chunk-chars 16 --stream-interval 0.02
+    OPENAI_BASE_URL=http://127.0.0.1:8000/v1 OPENAI_API_KEY=stub streamlit run app.py
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from ai_parser import GROUP_HEADER_PATTERN, GROUPS_START_MARKER
+from text_to_teamwork import TextToTeamworkConverter
+
+# Distributions de latence disponibles
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'exponential')
+
+# Marqueurs qui entourent le document dans le prompt utilisateur de AITaskParser
+TEXT_START_MARKER = 'TEXTE À ANALYSER :\n'
+TEXT_END_MARKER = '\n\nRÈGLES CRITIQUES'
+
+# Estimation grossière du nombre de caractères par token (pour le champ usage)
+CHARS_PER_TOKEN = 4
+
+
+class _ThreadingHTTPServer(ThreadingHTTPServer):
+    """Serveur multi-thread qui n'attend pas les connexions keep-alive inactives à l'arrêt."""
+    daemon_threads = True
+    block_on_close = False
+
+
+class StubOpenAIServer:
+    """
+    Serveur HTTP compatible avec l'API chat.completions d'OpenAI.
+
+    Chaque requête renvoie les tâches que le parser classique extrait du texte du
+    prompt, au format JSON attendu par AITaskParser. La latence, les erreurs serveur
+    (500), les limitations de débit (429 avec Retry-After) et les réponses JSON
+    tronquées sont configurables ; le tirage aléatoire est déterministe si `seed` est fixé.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0,
+                 latency_distribution: str = 'fixed', latency_jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0, retry_after: float = 1.0,
+                 truncate_rate: float = 0.0, enforce_max_tokens: bool = False, seed: Optional[int] = None,
+                 stream_chunk_chars: int = 16, stream_interval: float = 0.0):
+        """
+        Initialise le serveur (sans le démarrer).
+
+        Args:
+            host: Adresse d'écoute
+            port: Port d'écoute (0 = port libre choisi par le système)
+            latency: Latence moyenne d'une réponse en secondes
+            latency_distribution: fixed, uniform (latency ± jitter), normal (écart-type jitter) ou exponential
+            latency_jitter: Amplitude de la variation de latence
+            error_rate: Proportion de réponses 500
+            rate_limit_rate: Proportion de réponses 429 (limite de débit)
+            retry_after: Valeur de l'en-tête Retry-After des réponses 429 (secondes)
+            truncate_rate: Proportion de réponses dont le JSON est coupé en plein milieu
+            enforce_max_tokens: Tronquer les réponses qui dépassent max_tokens (finish_reason = length)
+            seed: Graine du tirage aléatoire (latences, erreurs)
+            stream_chunk_chars: Taille des morceaux de réponse envoyés en streaming (stream=True)
+            stream_interval: Délai entre deux morceaux en streaming (secondes)
+        """
+        if latency_distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Distribution inconnue : {latency_distribution} (attendu : {', '.join(LATENCY_DISTRIBUTIONS)})")
+
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.latency_distribution = latency_distribution
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.truncate_rate = truncate_rate
+        self.enforce_max_tokens = enforce_max_tokens
+        self.stream_chunk_chars = max(1, stream_chunk_chars)
+        self.stream_interval = stream_interval
+
+        self.converter = TextToTeamworkConverter(use_ai=False)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+        self.requests = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.truncated = 0
+        self.connections = 0
+
+    @property
+    def base_url(self) -> str:
+        """URL de base à passer au client OpenAI (…/v1)."""
+        host, port = self._server.server_address[:2] if self._server else (self.host, self.port)
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> str:
+        """Démarre le serveur dans un thread et retourne son URL de base."""
+        handler = type('StubOpenAIHandler', (_StubOpenAIHandler,), {'stub': self})
+        self._server = _ThreadingHTTPServer((self.host, self.port), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        """Arrête le serveur."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> 'StubOpenAIServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, int]:
+        """Retourne les compteurs de requêtes et de connexions TCP."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'rate_limited': self.rate_limited,
+                'truncated': self.truncated,
+                'connections': self.connections,
+            }
+
+    def _draw(self):
+        """Tire le sort d'une requête : (latence, issue parmi ok/error/rate_limit/truncate)."""
+        with self._lock:
+            self.requests += 1
+            if self.latency_distribution == 'uniform':
+                delay = self._random.uniform(self.latency - self.latency_jitter, self.latency + self.latency_jitter)
+            elif self.latency_distribution == 'normal':
+                delay = self._random.gauss(self.latency, self.latency_jitter)
+            elif self.latency_distribution == 'exponential':
+                delay = self._random.expovariate(1 / self.latency) if self.latency > 0 else 0.0
+            else:
+                delay = self.latency
+
+            draw = self._random.random()
+            if draw < self.rate_limit_rate:
+                outcome = 'rate_limit'
+                self.rate_limited += 1
+            elif draw < self.rate_limit_rate + self.error_rate:
+                outcome = 'error'
+                self.errors += 1
+            elif self._random.random() < self.truncate_rate:
+                outcome = 'truncate'
+                self.truncated += 1
+            else:
+                outcome = 'ok'
+            return max(delay, 0.0), outcome
+
+    def completion_content(self, prompt: str) -> str:
+        """Réponse JSON (tâches du parser classique) pour le texte contenu dans le prompt."""
+        if GROUPS_START_MARKER in prompt:
+            # Lot de groupes de tâche : une entrée par groupe, chaque groupe parsé isolément
+            text = prompt.split(GROUPS_START_MARKER, 1)[1].split(TEXT_END_MARKER, 1)[0]
+            parts = GROUP_HEADER_PATTERN.split(text)[1:]
+            groups = [
+                {'id': int(group_id), 'tasks': self._tasks_json(self.converter.parse_task_group(group_text))}
+                for group_id, group_text in zip(parts[::2], parts[1::2])
+            ]
+            return json.dumps({'groups': groups}, ensure_ascii=False)
+        
+        text = prompt.split(TEXT_START_MARKER, 1)[-1].split(TEXT_END_MARKER, 1)[0]
+        return json.dumps({'tasks': self._tasks_json(self.converter.iter_rows(text))}, ensure_ascii=False)
+    
+    @staticmethod
+    def _tasks_json(rows) -> list:
+        """Tâches au format de la réponse IA (colonnes vides omises)."""
+        return [{column: value for column, value in row.items() if value} for row in rows]
+
+
+class _StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Gestionnaire HTTP du faux serveur (l'instance StubOpenAIServer est dans `stub`)."""
+
+    stub = None
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        # Une instance du gestionnaire par connexion TCP (keep-alive : plusieurs requêtes)
+        super().setup()
+        with self.stub._lock:
+            self.stub.connections += 1
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self._send_json(200, {'object': 'list', 'data': [{'id': 'gpt-4o-mini', 'object': 'model', 'owned_by': 'stub'}]})
+        else:
+            self._send_error(404, 'Not found', 'invalid_request_error')
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except json.JSONDecodeError:
+            self._send_error(400, 'Invalid JSON body', 'invalid_request_error')
+            return
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_error(404, 'Not found', 'invalid_request_error')
+            return
+
+        delay, outcome = self.stub._draw()
+        if delay:
+            time.sleep(delay)
+
+        if outcome == 'rate_limit':
+            self._send_error(429, 'Rate limit reached for requests', 'rate_limit_exceeded',
+                             {'Retry-After': f"{self.stub.retry_after:g}"})
+            return
+        if outcome == 'error':
+            self._send_error(500, 'The server had an error while processing your request', 'server_error')
+            return
+
+        prompt = body.get('messages', [{}])[-1].get('content', '')
+        content = self.stub.completion_content(prompt)
+        finish_reason = 'stop'
+
+        max_tokens = body.get('max_tokens')
+        if self.stub.enforce_max_tokens and max_tokens and len(content) > max_tokens * CHARS_PER_TOKEN:
+            content = content[:max_tokens * CHARS_PER_TOKEN]
+            finish_reason = 'length'
+        elif outcome == 'truncate':
+            content = content[:len(content) // 2]
+            finish_reason = 'length'
+
+        prompt_tokens = sum(len(m.get('content', '')) for m in body.get('messages', [])) // CHARS_PER_TOKEN
+        completion_tokens = len(content) // CHARS_PER_TOKEN
+        usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                 'total_tokens': prompt_tokens + completion_tokens}
+        if body.get('stream'):
+            include_usage = (body.get('stream_options') or {}).get('include_usage', False)
+            self._send_stream(body, content, finish_reason, usage if include_usage else None)
+            return
+        self._send_json(200, {
+            'id': f"chatcmpl-stub-{self.stub.requests}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', ''),
+            'choices': [{'index': 0, 'finish_reason': finish_reason,
+                         'message': {'role': 'assistant', 'content': content}}],
+            'usage': usage,
+        })
+    
+    def _send_stream(self, body: Dict, content: str, finish_reason: str, usage: Optional[Dict]):
+        """Envoie la réponse en Server-Sent Events (chat.completion.chunk), morceau par morceau."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        
+        base = {'id': f"chatcmpl-stub-{self.stub.requests}", 'object': 'chat.completion.chunk',
+                'created': int(time.time()), 'model': body.get('model', '')}
+        size = self.stub.stream_chunk_chars
+        events = [{'index': 0, 'delta': {'role': 'assistant', 'content': ''}, 'finish_reason': None}]
+        events += [{'index': 0, 'delta': {'content': content[i:i + size]}, 'finish_reason': None}
+                   for i in range(0, len(content), size)]
+        events.append({'index': 0, 'delta': {}, 'finish_reason': finish_reason})
+        try:
+            for i, choice in enumerate(events):
+                if i > 1 and self.stub.stream_interval:
+                    time.sleep(self.stub.stream_interval)
+                self._send_event(dict(base, choices=[choice]))
+            if usage is not None:
+                self._send_event(dict(base, choices=[], usage=usage))
+            self.wfile.write(b'data: [DONE]\n\n')
+        except (BrokenPipeError, ConnectionResetError):
+            # Client parti en cours de flux (requête annulée)
+            pass
+    
+    def _send_event(self, payload: Dict):
+        self.wfile.write(b'data: ' + json.dumps(payload, ensure_ascii=False).encode('utf-8') + b'\n\n')
+
+    def _send_error(self, status: int, message: str, error_type: str, headers: Optional[Dict[str, str]] = None):
+        self._send_json(status, {'error': {'message': message, 'type': error_type, 'param': None, 'code': error_type}}, headers)
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Lance le faux serveur jusqu'à Ctrl+C."""
+    parser = argparse.ArgumentParser(description="Faux serveur OpenAI local pour le mode IA.")
+    parser.add_argument('--host', default='127.0.0.1', help="Adresse d'écoute (défaut : 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8000, help="Port d'écoute (défaut : 8000)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Latence moyenne en secondes")
+    parser.add_argument('--latency-distribution', choices=LATENCY_DISTRIBUTIONS, default='fixed')
+    parser.add_argument('--latency-jitter', type=float, default=0.0, help="Variation de latence en secondes")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Proportion de réponses 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Proportion de réponses 429")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="En-tête Retry-After des réponses 429")
+    parser.add_argument('--truncate-rate', type=float, default=0.0, help="Proportion de réponses JSON tronquées")
+    parser.add_argument('--enforce-max-tokens', action='store_true', help="Tronquer les réponses au-delà de max_tokens")
+    parser.add_argument('--seed', type=int, help="Graine du tirage aléatoire")
+    parser.add_argument('--stream-chunk-chars', type=int, default=16, help="Taille des morceaux en streaming")
+    parser.add_argument('--stream-interval', type=float, default=0.0, help="Délai entre deux morceaux en streaming")
+    args = parser.parse_args(argv)
+
+    server = StubOpenAIServer(
+        args.host, args.port, args.latency, args.latency_distribution, args.latency_jitter,
+        args.error_rate, args.rate_limit_rate, args.retry_after, args.truncate_rate,
+        args.enforce_max_tokens, args.seed, args.stream_chunk_chars, args.stream_interval,
+    )
+    base_url = server.start()
+    print(f"🚀 Faux serveur OpenAI démarré : {base_url}")
+    print(f"💡 OPENAI_BASE_URL={base_url} OPENAI_API_KEY=stub")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"\n📊 {server.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+from collections.abc import Mapping
+from operator import attrgetter
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Tuple
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Colonnes du fichier d'import Teamwork, dans l'ordre
+COLUMNS = (
+    'TASKLIST', 'TASK', 'DESCRIPTION', 'ASSIGN TO',
+    'START DATE', 'DUE DATE', 'PRIORITY', 'ESTIMATED TIME',
+    'TAGS', 'STATUS'
+)
+
+# Attribut de TeamworkRow correspondant à chaque colonne
+ATTRIBUTES = (
+    'tasklist', 'task', 'description', 'assign_to',
+    'start_date', 'due_date', 'priority', 'estimated_time',
+    'tags', 'status'
+)
+_ATTRIBUTE_BY_COLUMN = dict(zip(COLUMNS, ATTRIBUTES))
+_get_values = attrgetter(*ATTRIBUTES)
+
+# Mapping pour forcer la conversion des priorités françaises restantes
+PRIORITY_NORMALIZATION = {
+    'Élevée': 'High',
+    'élevée': 'High',
+    'Elevee': 'High',
+    'elevee': 'High',
+    'Haute': 'High',
+    'haute': 'High',
+    'Moyenne': 'Medium',
+    'moyenne': 'Medium',
+    'Moyen': 'Medium',
+    'moyen': 'Medium',
+    'Faible': 'Low',
+    'faible': 'Low',
+    'Basse': 'Low',
+    'basse': 'Low'
+}
+
+
+class TeamworkRow(Mapping):
+    """
+    Ligne du fichier d'import Teamwork.
+
+    Enregistrement compact (__slots__, aucun dictionnaire par ligne) qui se lit comme
+    un dictionnaire en lecture seule indexé par les noms de colonnes : row['TASK'],
+    row.get('PRIORITY'), dict(row). Les priorités françaises sont normalisées en
+    anglais dès la construction.
+    """
+
+    __slots__ = ATTRIBUTES
+
+    def __init__(self, tasklist: str = '', task: str = '', description: str = '', assign_to: str = '',
+                 start_date: str = '', due_date: str = '', priority: str = '', estimated_time: str = '',
+                 tags: str = '', status: str = ''):
+        self.tasklist = tasklist
+        self.task = task
+        self.description = description
+        self.assign_to = assign_to
+        self.start_date = start_date
+        self.due_date = due_date
+        self.priority = PRIORITY_NORMALIZATION.get(priority, priority)
+        self.estimated_time = estimated_time
+        self.tags = tags
+        self.status = status
+
+    @classmethod
+    def from_mapping(cls, values: Mapping) -> 'TeamworkRow':
+        """Construit une ligne à partir d'un dictionnaire indexé par les noms de colonnes."""
+        return cls(*(values.get(column, '') for column in COLUMNS))
+
+    def as_tuple(self) -> Tuple[str, ...]:
+        """Valeurs de toutes les colonnes, dans l'ordre de COLUMNS."""
+        return _get_values(self)
+
+    def to_dict(self) -> Dict[str, str]:
+        """Retourne la ligne sous forme de dictionnaire (sérialisable en JSON)."""
+        return dict(zip(COLUMNS, self.as_tuple()))
+
+    def __getitem__(self, column: str) -> str:
+        try:
+            return getattr(self, _ATTRIBUTE_BY_COLUMN[column])
+        except KeyError:
+            raise KeyError(column) from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(COLUMNS)
+
+    def __len__(self) -> int:
+        return len(COLUMNS)
+
+    def __repr__(self) -> str:
+        values = ', '.join(f"{column}={value!r}" for column, value in zip(COLUMNS, self.as_tuple()) if value)
+        return f"TeamworkRow({values})"
+
+
+def row_values(row: Mapping) -> Tuple:
+    """Valeurs d'une ligne (TeamworkRow ou dictionnaire) dans l'ordre de COLUMNS."""
+    if type(row) is TeamworkRow:
+        return _get_values(row)
+    return tuple(row.get(column, '') for column in COLUMNS)
+
+
+def rows_to_dataframe(rows: Iterable[Mapping]) -> 'pd.DataFrame':
+    """Convertit des lignes en DataFrame (pandas n'est importé qu'ici)."""
+    import pandas as pd
+    return pd.DataFrame.from_records([row_values(row) for row in rows], columns=list(COLUMNS))
@@ -3,8 +3,12 @@
 Tests pour valider le fonctionnement du Text to Teamwork Converter
 """
 
-import pandas as pd
 import os
+
+# Cache des réponses IA en mémoire seulement : les tests n'écrivent rien dans ~/.cache
+os.environ['AI_CACHE_PATH'] = ''
+
+import pandas as pd
 from text_to_teamwork import TextToTeamworkConverter
 
 def test_sample_conversion():
@@ -187,6 +191,1380 @@ def test_performance():
         print("⚠️  Performance lente")
         return False
 
+def test_line_classifier():
+    """Test du classifieur de lignes en une seule passe."""
+    
+    print("\n\n🧪 Test 5: Classification des lignes")
+    print("=" * 50)
+    
+    from line_classifier import HEADER, FIELD, IGNORE, CONTINUATION
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    classifier = converter.line_classifier
+    
+    cases = [
+        ("DC-DM-001 - Logo Standard", HEADER, "Logo Standard", None, ""),
+        ("DC-DM-001.1 - Analyse du besoin", HEADER, "Analyse du besoin", None, ""),
+        ("2.5.1 – Publicité", HEADER, "Publicité", None, ""),
+        ("Description : Créer le logo", FIELD, "", "description", "Créer le logo"),
+        ("Priorité : Élevée", FIELD, "", "priority", "Élevée"),
+        ("Dépendance 1", FIELD, "", "dependencies", "Dépendance 1"),
+        ("Critère d'acceptation : Logo validé", FIELD, "", "criteria", "Logo validé"),
+        ("✅ Liste des Tâches :", IGNORE, "", None, ""),
+        ("Texte libre", CONTINUATION, "", None, ""),
+    ]
+    
+    all_ok = True
+    for line, kind, name, field, value in cases:
+        result = classifier.classify(line)
+        ok = result.kind == kind and result.name == name and (field is None or (result.field, result.value) == (field, value))
+        print(f"   {'✅' if ok else '❌'} {line!r} → {result.kind} {result.name or result.field or ''}")
+        all_ok = all_ok and ok
+    
+    main = classifier.classify("DC-DM-001 - Logo Standard")
+    sub = classifier.classify("DC-DM-001.1 - Analyse du besoin")
+    if not main.is_main or sub.is_main or sub.level != 2:
+        print("❌ Hiérarchie DC-DM-001 / DC-DM-001.1 incorrecte")
+        all_ok = False
+    
+    assert all_ok
+    return all_ok
+
+def test_iter_tasks_streaming():
+    """Test du parsing incrémental ligne par ligne."""
+    
+    print("\n\n🧪 Test 6: Parsing en flux (iter_tasks)")
+    print("=" * 50)
+    
+    import io
+    
+    with open('examples/sample_text.txt', 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    
+    # Même résultat que le parsing du texte complet
+    streamed = list(converter.iter_tasks(io.StringIO(text)))
+    expected = converter.parse_text_to_tasks(text)
+    print(f"✅ {len(streamed)} tâches produites en flux")
+    assert streamed == expected
+    
+    # La première tâche est produite dès que le deuxième en-tête est lu
+    consumed = []
+    def lines():
+        for line in text.split('\n'):
+            consumed.append(line)
+            yield line
+    
+    line_count = len(text.split('\n'))
+    first = next(converter.iter_tasks(lines()))
+    print(f"✅ Première tâche après {len(consumed)} lignes lues sur {line_count}")
+    assert first == expected[0]
+    assert len(consumed) < line_count
+    
+    return True
+
+def test_excel_streaming_export():
+    """Test de l'export Excel en mode write-only."""
+    
+    print("\n\n🧪 Test 7: Export Excel en flux")
+    print("=" * 50)
+    
+    import io
+    from openpyxl import load_workbook
+    from exporters import dataframe_rows, excel_bytes
+    
+    with open('examples/sample_text.txt', 'r', encoding='utf-8') as f:
+        text = f.read()
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    preview_df = converter.preview_conversion(text)
+    
+    # Conversion depuis un flux de lignes
+    output_file = "test_stream_output.xlsx"
+    try:
+        assert converter.convert_to_excel(io.StringIO(text), output_file)
+        
+        worksheet = load_workbook(output_file)['Teamwork Import']
+        rows = list(worksheet.iter_rows(values_only=True))
+        print(f"✅ {len(rows) - 1} lignes écrites")
+        
+        assert list(rows[0]) == converter.columns
+        assert len(rows) - 1 == len(preview_df)
+        assert [value or '' for value in rows[1]] == list(preview_df.iloc[0])
+        
+        # Largeur des colonnes : contenu le plus long + 2, plafonnée à 50
+        description_width = worksheet.column_dimensions['C'].width
+        print(f"✅ Largeur DESCRIPTION : {description_width}")
+        assert description_width == min(preview_df['DESCRIPTION'].map(len).max() + 2, 50)
+        
+        # Même moteur pour le téléchargement Streamlit (classeur en mémoire depuis le DataFrame)
+        data = excel_bytes(dataframe_rows(preview_df), list(preview_df.columns))
+        assert list(load_workbook(io.BytesIO(data))['Teamwork Import'].iter_rows(values_only=True)) == rows
+        print(f"✅ Classeur en mémoire : {len(data)} octets")
+    finally:
+        if os.path.exists(output_file):
+            os.remove(output_file)
+    
+    return True
+
+class FakeOpenAIClient:
+    """Client OpenAI factice : renvoie une réponse JSON fixe et compte les appels."""
+    
+    def __init__(self, content):
+        from types import SimpleNamespace
+        self.calls = 0
+        self.content = content
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    def _create(self, **kwargs):
+        from types import SimpleNamespace
+        self.calls += 1
+        content = self.content(kwargs['messages'][-1]['content']) if callable(self.content) else self.content
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+def test_ai_response_cache():
+    """Test du cache des réponses IA (mémoire + SQLite)."""
+    
+    print("\n\n🧪 Test 8: Cache des réponses IA")
+    print("=" * 50)
+    
+    import json
+    import tempfile
+    import time
+    from ai_parser import AITaskParser
+    from ai_cache import AIResponseCache, get_default_cache
+    
+    # Cache partagé du processus : en mémoire pendant les tests (AI_CACHE_PATH vide)
+    assert get_default_cache().path is None
+    
+    content = json.dumps({"tasks": [
+        {"TASKLIST": "Logo Standard", "TASK": "", "DESCRIPTION": "Création du logo", "PRIORITY": "Élevée"}
+    ]})
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'cache.sqlite')
+        parser = AITaskParser(api_key=None, cache=AIResponseCache(path=cache_path))
+        parser.client = FakeOpenAIClient(content)
+        
+        first = parser.parse_with_ai("DC-DM-001 - Logo Standard\nDescription : Création du logo")
+        # Même texte aux espaces de fin de ligne près : réponse servie par le cache
+        second = parser.parse_with_ai("DC-DM-001 - Logo Standard   \r\nDescription : Création du logo\n")
+        print(f"✅ Appels API : {parser.client.calls} - {parser.cache.stats()}")
+        assert first == second and first[0]['PRIORITY'] == 'High'
+        assert parser.client.calls == 1
+        assert parser.cache.stats()['memory_hits'] == 1
+        
+        # Nouveau processus (nouveau cache mémoire) : réponse relue depuis SQLite
+        other = AITaskParser(api_key=None, cache=AIResponseCache(path=cache_path))
+        other.client = FakeOpenAIClient(content)
+        assert other.parse_with_ai("DC-DM-001 - Logo Standard\nDescription : Création du logo") == first
+        assert other.client.calls == 0 and other.cache.stats()['disk_hits'] == 1
+        
+        # Entrée expirée : nouvel appel API
+        expired = AITaskParser(api_key=None, cache=AIResponseCache(path=cache_path, ttl=0))
+        expired.client = FakeOpenAIClient(content)
+        time.sleep(0.01)
+        expired.parse_with_ai("DC-DM-001 - Logo Standard\nDescription : Création du logo")
+        assert expired.client.calls == 1
+        print("✅ Cache disque et expiration OK")
+    
+    return True
+
+def test_ai_chunked_parsing():
+    """Test du découpage des longs documents en parties parsées en parallèle."""
+    
+    print("\n\n🧪 Test 9: Parsing IA par morceaux")
+    print("=" * 50)
+    
+    import json
+    from ai_parser import AITaskParser
+    
+    def fake_response(prompt):
+        # Une tâche par en-tête DC-DM présent dans le texte envoyé
+        text = prompt.split("TEXTE À ANALYSER :")[1].split("RÈGLES CRITIQUES")[0]
+        tasks = []
+        for line in text.split('\n'):
+            if line.startswith('DC-DM-'):
+                name = line.split(' - ', 1)[1]
+                is_main = '.' not in line.split(' - ')[0]
+                tasks.append({"TASKLIST": name if is_main else "", "TASK": "" if is_main else name})
+        return json.dumps({"tasks": tasks})
+    
+    text = "Grand Projet\n\n"
+    for i in range(1, 21):
+        text += f"DC-DM-{i:03d} - Liste {i}\nDescription : Liste numéro {i}\n"
+        for j in range(1, 4):
+            text += f"DC-DM-{i:03d}.{j} - Tâche {i}.{j}\nDescription : Détail de la tâche {i}.{j}\n"
+    
+    parser = AITaskParser(api_key=None, use_cache=False)
+    parser.client = FakeOpenAIClient(fake_response)
+    parser.chunk_tokens = 100
+    
+    chunks = parser.split_into_chunks(text)
+    print(f"✅ {len(chunks)} morceaux")
+    assert len(chunks) > 1
+    # Aucun groupe coupé : chaque morceau (sauf le premier) commence par un en-tête
+    assert all(chunk.startswith('DC-DM-') for chunk, _ in chunks[1:])
+    # Un morceau qui commence par une sous-tâche rappelle la tâche principale en cours
+    for chunk, context in chunks[1:]:
+        first_code = chunk.split(' - ')[0]
+        if '.' in first_code:
+            assert context == f"Liste {int(first_code[6:9])}"
+        else:
+            assert context is None
+    
+    tasks = parser.parse_with_ai(text, "Grand Projet")
+    names = [task['TASKLIST'] or task['TASK'] for task in tasks]
+    print(f"✅ {len(tasks)} tâches en {parser.client.calls} appels")
+    assert parser.client.calls == len(chunks)
+    assert names[:3] == ["Liste 1", "Tâche 1.1", "Tâche 1.2"]
+    assert len(names) == 80 and names[-1] == "Tâche 20.3"
+    
+    # Une partie sans tâche (préambule, notes) est un résultat valide ; seule une partie
+    # en échec renvoie tout le document au parser classique
+    def response_for(empty_or_invalid):
+        def respond(prompt):
+            if "DC-DM-005 - Liste 5" in prompt.split("TEXTE À ANALYSER :")[1]:
+                return empty_or_invalid
+            return fake_response(prompt)
+        return respond
+    
+    parser.client = FakeOpenAIClient(response_for(json.dumps({"tasks": []})))
+    tasks = parser.parse_with_ai(text, "Grand Projet")
+    assert 0 < len(tasks) < 80 and 'Liste 5' not in [task['TASKLIST'] for task in tasks]
+    parser.client = FakeOpenAIClient(response_for("pas du JSON"))
+    assert parser.parse_with_ai(text, "Grand Projet") == []
+    print(f"✅ Partie vide conservée ({len(tasks)} tâches), partie en échec → fallback")
+    
+    return True
+
+class FakeAsyncOpenAIClient:
+    """Client OpenAI asynchrone factice : réponse JSON fixe après un délai."""
+    
+    def __init__(self, content, delay):
+        from types import SimpleNamespace
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self.content = content
+        self.delay = delay
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+    
+    async def _create(self, **kwargs):
+        import asyncio
+        from types import SimpleNamespace
+        self.calls += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))])
+
+def test_async_ai_parser():
+    """Test du parser IA asynchrone (parse_many, sémaphore, délai maximal)."""
+    
+    print("\n\n🧪 Test 10: Parser IA asynchrone")
+    print("=" * 50)
+    
+    import asyncio
+    import json
+    import time
+    from ai_parser import AsyncAITaskParser
+    
+    content = json.dumps({"tasks": [{"TASKLIST": "", "TASK": "Rédiger le compte rendu"}]})
+    texts = [f"Réunion {i}\n1. Rédiger le compte rendu" for i in range(6)]
+    
+    parser = AsyncAITaskParser(api_key=None, use_cache=False, max_concurrency=3)
+    parser.client = FakeAsyncOpenAIClient(content, delay=0.05)
+    
+    start = time.time()
+    results = asyncio.run(parser.parse_many(texts, [f"Réunion {i}" for i in range(6)]))
+    elapsed = time.time() - start
+    print(f"✅ {len(results)} documents en {elapsed:.2f}s (max {parser.client.max_active} requêtes simultanées)")
+    assert len(results) == 6 and all(tasks[0]['TASK'] == "Rédiger le compte rendu" for tasks in results)
+    assert parser.client.max_active == 3
+    assert elapsed < 6 * 0.05
+    
+    # Délai maximal dépassé : la requête est abandonnée et le résultat est vide
+    slow = AsyncAITaskParser(api_key=None, use_cache=False, request_timeout=0.01)
+    slow.client = FakeAsyncOpenAIClient(content, delay=1)
+    assert asyncio.run(slow.parse_with_ai(texts[0])) == []
+    print("✅ Requête trop lente abandonnée")
+    
+    return True
+
+def test_batch_convert():
+    """Test de la conversion en lot (un classeur par fichier et classeur fusionné)."""
+    
+    print("\n\n🧪 Test 11: Conversion en lot")
+    print("=" * 50)
+    
+    import os
+    import tempfile
+    from openpyxl import load_workbook
+    from batch_convert import main
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        notes = os.path.join(tmp, 'notes')
+        os.makedirs(notes)
+        for i in range(3):
+            with open(os.path.join(notes, f'projet{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write(f"Projet {i}\n\n1. Préparer le lot {i}\nPriorité : haute\n2. Livrer le lot {i}\n")
+        with open(os.path.join(notes, 'ignore.csv'), 'w', encoding='utf-8') as f:
+            f.write("1. Pas un fichier texte\n")
+        
+        exports = os.path.join(tmp, 'exports')
+        assert main([notes, '-o', exports, '--workers', '2']) == 0
+        assert sorted(os.listdir(exports)) == [f'projet{i}_Teamwork.xlsx' for i in range(3)]
+        sheet = load_workbook(os.path.join(exports, 'projet1_Teamwork.xlsx'))['Teamwork Import']
+        assert sheet['B2'].value == "Préparer le lot 1" and sheet['G2'].value == "High"
+        print("✅ Un classeur par fichier")
+        
+        merged = os.path.join(tmp, 'tout.xlsx')
+        assert main([os.path.join(notes, '*.txt'), '--merge', merged, '--workers', '1']) == 0
+        rows = list(load_workbook(merged)['Teamwork Import'].iter_rows(min_row=2, values_only=True))
+        assert [row[1] for row in rows] == [f"{verb} le lot {i}" for i in range(3) for verb in ("Préparer", "Livrer")]
+        print(f"✅ Classeur fusionné : {len(rows)} tâches")
+        
+        assert main([os.path.join(tmp, 'vide')]) == 1
+        
+        # Deux fichiers de même nom dans des dossiers différents : refusé plutôt qu'un classeur perdu
+        for folder in ('a', 'b'):
+            os.makedirs(os.path.join(tmp, folder))
+            with open(os.path.join(tmp, folder, 'notes.txt'), 'w', encoding='utf-8') as f:
+                f.write(f"Projet {folder}\n\n1. Tâche {folder}\n")
+        conflicts = os.path.join(tmp, 'conflits')
+        inputs = [os.path.join(tmp, 'a'), os.path.join(tmp, 'b')]
+        assert main(inputs + ['-o', conflicts, '--workers', '2']) == 1 and not os.path.exists(conflicts)
+        assert main(inputs + ['--merge', os.path.join(tmp, 'notes.xlsx'), '--workers', '2']) == 0
+        print("✅ Fichiers de sortie en conflit refusés")
+    
+    return True
+
+def test_benchmark_suite():
+    """Test du benchmark (générateur déterministe, résultats JSON)."""
+    
+    print("\n\n🧪 Test 12: Benchmark")
+    print("=" * 50)
+    
+    import json
+    from benchmark import generate_document, run_benchmarks
+    
+    text = generate_document(tasklists=4, subtasks=2, detail_lines=2, style='code', seed=1)
+    assert text == generate_document(tasklists=4, subtasks=2, detail_lines=2, style='code', seed=1)
+    assert "DC-DM-004.2 - " in text
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    assert len(converter.parse_text_to_tasks(text)) == 4 * 3
+    
+    results = json.loads(json.dumps(run_benchmarks(tasklists=4, subtasks=2, detail_lines=2, repeat=1)))
+    print(f"✅ {results['parse']['lines_per_sec']:.0f} lignes/s, prévisualisation IA {results['preview_ai']['median_sec'] * 1000:.1f} ms")
+    assert results['parse']['tasks'] == results['excel']['rows'] == 12
+    assert results['preview_ai']['rows'] == 12
+    assert results['excel']['peak_memory_mb'] > 0
+    # Le parser classique démarre sans pandas, openai, dotenv ni openpyxl
+    print(f"✅ Import à froid : {results['import']['import_sec'] * 1000:.1f} ms")
+    assert results['import']['heavy_modules_loaded'] == []
+    
+    return True
+
+def test_stub_openai_server():
+    """Test du faux serveur OpenAI (réponses, erreurs 500/429, JSON tronqué, base_url)."""
+    
+    print("\n\n🧪 Test 13: Faux serveur OpenAI")
+    print("=" * 50)
+    
+    import json
+    import openai
+    from ai_parser import AITaskParser
+    from stub_openai_server import StubOpenAIServer
+    
+    text = """Projet Site Web
+DC-DM-001 - Maquettes
+Description : Concevoir les pages
+DC-DM-001.1 - Page d'accueil
+Priorité : Élevée"""
+    classic = TextToTeamworkConverter(use_ai=False)
+    
+    with StubOpenAIServer(seed=0) as server:
+        parser = AITaskParser(api_key="stub", use_cache=False, base_url=server.base_url)
+        tasks = parser.parse_with_ai(text, "Projet Site Web")
+        print(f"✅ {len(tasks)} tâches via {server.base_url}")
+        assert [(t['TASKLIST'], t['TASK'], t['PRIORITY']) for t in tasks] == \
+            [(t['TASKLIST'], t['TASK'], t['PRIORITY']) for t in classic.iter_rows(text)]
+        assert server.stats()['requests'] == 1
+    
+    messages = [{"role": "user", "content": text}]
+    with StubOpenAIServer(rate_limit_rate=1.0, retry_after=7) as server:
+        client = openai.OpenAI(api_key="stub", base_url=server.base_url, max_retries=0)
+        try:
+            client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+            assert False, "429 attendu"
+        except openai.RateLimitError as e:
+            assert e.response.headers['Retry-After'] == '7'
+        print("✅ Limite de débit (429 + Retry-After)")
+    
+    with StubOpenAIServer(error_rate=1.0) as server:
+        client = openai.OpenAI(api_key="stub", base_url=server.base_url, max_retries=0)
+        try:
+            client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+            assert False, "500 attendu"
+        except openai.InternalServerError:
+            pass
+        print("✅ Erreur serveur (500)")
+    
+    with StubOpenAIServer(truncate_rate=1.0) as server:
+        client = openai.OpenAI(api_key="stub", base_url=server.base_url, max_retries=0)
+        response = client.chat.completions.create(model="gpt-4o-mini", messages=messages)
+        assert response.choices[0].finish_reason == 'length'
+        try:
+            json.loads(response.choices[0].message.content)
+            assert False, "JSON tronqué attendu"
+        except json.JSONDecodeError:
+            pass
+        parser = AITaskParser(api_key="stub", use_cache=False, base_url=server.base_url)
+        assert parser.parse_with_ai(text) == []
+        print("✅ Réponse tronquée → fallback")
+    
+    return True
+
+def test_teamwork_row():
+    """Test du modèle de ligne compact TeamworkRow."""
+    
+    print("\n\n🧪 Test 14: Modèle de ligne TeamworkRow")
+    print("=" * 50)
+    
+    import json
+    import pickle
+    from ai_parser import AITaskParser
+    from teamwork_row import COLUMNS, TeamworkRow, rows_to_dataframe
+    
+    # Priorités normalisées dès la construction, lecture comme un dictionnaire
+    row = TeamworkRow('Projet', '', 'Préparer le lancement', priority='Élevée', estimated_time='3hr')
+    assert row['PRIORITY'] == 'High' and row.get('TAGS') == '' and row.get('INCONNUE') is None
+    assert list(row) == list(COLUMNS) and row == row.to_dict()
+    assert json.loads(json.dumps(row.to_dict()))['TASKLIST'] == 'Projet'
+    assert pickle.loads(pickle.dumps(row)) == row
+    assert not hasattr(row, '__dict__')
+    print(f"✅ {row!r}")
+    
+    # Le parser classique produit des TeamworkRow ; parse_text_to_tasks garde des dictionnaires
+    converter = TextToTeamworkConverter(use_ai=False)
+    converter.priority_keywords['urgent'] = 'Haute'
+    text = "Projet\n1. Corriger le bug\nPriorité : urgent"
+    rows = list(converter.iter_rows(text))
+    assert type(rows[0]) is TeamworkRow and rows[0]['PRIORITY'] == 'High'
+    assert converter.parse_text_to_tasks(text) == [rows[0].to_dict()]
+    assert list(converter.preview_conversion(text).iloc[0]) == list(rows[0].as_tuple())
+    
+    # Réponses de l'IA validées en TeamworkRow (clé ESTIMATED_TIME du prompt comprise)
+    parser = AITaskParser(api_key=None, use_cache=False)
+    tasks = parser._validate_and_clean_tasks([
+        {"TASKLIST": "Site", "TASK": "", "PRIORITY": "urgente"},
+        {"TASKLIST": "", "TASK": "Maquette", "PRIORITY": "basse", "ESTIMATED_TIME": "30 min"},
+        {"TASKLIST": "", "TASK": "Critère d'acceptation"},
+    ])
+    assert [(t['TASKLIST'], t['TASK'], t['PRIORITY'], t['ESTIMATED TIME']) for t in tasks] == \
+        [("Site", "", "High", ""), ("", "Maquette", "Low", "30mn")]
+    assert list(rows_to_dataframe(tasks).columns) == list(COLUMNS)
+    print(f"✅ {len(tasks)} tâches IA validées")
+    
+    return True
+
+def test_incremental_parsing():
+    """Test du parsing incrémental (seuls les groupes de tâche modifiés sont retraités)."""
+    
+    print("\n\n🧪 Test 15: Parsing incrémental")
+    print("=" * 50)
+    
+    from ai_parser import AITaskParser
+    from text_to_teamwork import IncrementalState
+    
+    text = "Grand Projet\n\n"
+    for i in range(1, 41):
+        text += f"DC-DM-{i:03d} - Liste {i}\nDescription : Liste numéro {i}\n"
+        for j in range(1, 4):
+            text += f"DC-DM-{i:03d}.{j} - Tâche {i}.{j}\nDescription : Détail de la tâche {i}.{j}\nPriorité : Moyenne\n"
+    edited = text.replace("Détail de la tâche 20.2", "Détail revu de la tâche 20.2")
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    assert converter.parse_incremental(text) == list(converter.iter_rows(text))
+    assert converter.incremental_stats['reused_groups'] == 0
+    
+    # Après une modification locale : même résultat qu'un parse complet, un seul groupe retraité
+    rows = converter.parse_incremental(edited)
+    assert rows == list(converter.iter_rows(edited))
+    stats = converter.incremental_stats
+    assert stats['groups'] - stats['reused_groups'] == 2  # groupe modifié + premier groupe (titre)
+    print(f"✅ {stats['reused_groups']}/{stats['groups']} groupes réutilisés")
+    
+    # Changement de titre : la première tâche est recalculée
+    retitled = edited.replace("Grand Projet", "Autre Projet", 1)
+    assert converter.parse_incremental(retitled) == list(converter.iter_rows(retitled))
+    assert list(converter.preview_conversion(edited, incremental=True)['TASK']) == [r['TASK'] for r in rows]
+    
+    # Convertisseur partagé : chaque session garde son propre état, les documents ne s'écrasent pas
+    session_a, session_b = IncrementalState(), IncrementalState()
+    other = text.replace("Grand Projet", "Projet B", 1).replace("Liste", "Lot")
+    converter.parse_incremental(text, session_a)
+    converter.parse_incremental(other, session_b)
+    assert converter.preview_rows(edited, incremental=session_a) == rows
+    assert session_a.stats['groups'] - session_a.stats['reused_groups'] == 2
+    converter.parse_incremental(other, session_b)
+    assert session_b.stats['reused_groups'] == session_b.stats['groups'] - 1
+    print("✅ État incrémental propre à chaque session")
+    
+    # Découpage IA : une modification locale ne change que quelques morceaux
+    parser = AITaskParser(api_key=None, use_cache=False)
+    parser.chunk_tokens = 150
+    before = [chunk for chunk, _ in parser.split_into_chunks(text)]
+    after = [chunk for chunk, _ in parser.split_into_chunks(edited)]
+    changed = len(set(after) - set(before))
+    print(f"✅ {changed}/{len(after)} morceaux IA modifiés")
+    assert 1 <= changed <= 2
+    
+    return True
+
+def test_ai_group_strategy():
+    """Test de la stratégie IA par groupe de tâche (lots de K groupes, cache par groupe)."""
+    
+    print("\n\n🧪 Test 16: Stratégie IA par groupe de tâche")
+    print("=" * 50)
+    
+    import json
+    from ai_cache import AIResponseCache
+    from ai_parser import AITaskParser
+    from stub_openai_server import StubOpenAIServer
+    
+    text = "Grand Projet\n\n"
+    for i in range(1, 11):
+        text += f"DC-DM-{i:03d} - Liste {i}\nDescription : Liste numéro {i}\n"
+        for j in range(1, 3):
+            text += f"DC-DM-{i:03d}.{j} - Tâche {i}.{j}\nDescription : Détail {i}.{j}\nPriorité : Élevée\nDurée estimée : 3h\n"
+    classic = list(TextToTeamworkConverter(use_ai=False).iter_rows(text))
+    
+    with StubOpenAIServer() as server:
+        parser = AITaskParser(api_key='stub', cache=AIResponseCache(path=None), base_url=server.base_url, strategy='groups')
+        parser.group_batch_size = 4
+        
+        # 30 groupes en lots de 4 : même résultat que le parser classique
+        assert parser.parse_with_ai(text, "Grand Projet") == classic
+        assert parser.group_stats == {'groups': 30, 'cached_groups': 0, 'requests': 8}
+        
+        # Une tâche modifiée : seul son groupe est renvoyé
+        edited = text.replace("Détail 5.1", "Détail revu 5.1")
+        rows = parser.parse_with_ai(edited, "Grand Projet")
+        assert parser.group_stats == {'groups': 30, 'cached_groups': 29, 'requests': 1}
+        assert [r['DESCRIPTION'] for r in rows] == [r['DESCRIPTION'] for r in TextToTeamworkConverter(use_ai=False).iter_rows(edited)]
+        
+        # Autre document partageant des tâches : les groupes communs viennent du cache
+        other = "Autre Projet\n\n" + text.split("\n\n", 1)[1].replace("Liste 10", "Liste finale")
+        parser.parse_with_ai(other, "Autre Projet")
+        assert parser.group_stats['cached_groups'] == 28
+        print(f"✅ {server.stats()['requests']} requêtes pour 3 documents de 30 groupes")
+    
+    # Lot incomplet : les groupes reçus sont mis en cache, le document retombe sur le parser classique
+    def partial_response(prompt):
+        return json.dumps({"groups": [{"id": 1, "tasks": [{"TASKLIST": "", "TASK": "Tâche A"}]}]})
+    
+    parser = AITaskParser(api_key=None, cache=AIResponseCache(path=None), strategy='groups')
+    parser.client = FakeOpenAIClient(partial_response)
+    assert parser.parse_with_ai("Projet\n1.1 Tâche A\n1.2 Tâche B") == []
+    assert parser.group_stats == {'groups': 2, 'cached_groups': 0, 'requests': 1}
+    parser.parse_with_ai("Projet\n1.1 Tâche A\n1.2 Tâche B")
+    assert parser.group_stats['cached_groups'] == 1
+    print("✅ Lot incomplet → fallback, groupes reçus conservés")
+    
+    return True
+
+def test_request_scheduler():
+    """Test de l'ordonnanceur des appels OpenAI (quotas RPM/TPM, nouvelles tentatives, Retry-After)."""
+    
+    print("\n\n🧪 Test 17: Ordonnanceur des appels OpenAI")
+    print("=" * 50)
+    
+    import asyncio
+    import time
+    from types import SimpleNamespace
+    from ai_parser import AITaskParser, AsyncAITaskParser
+    from rate_limiter import RequestScheduler
+    from stub_openai_server import StubOpenAIServer
+    
+    # Quota de tokens : le deuxième appel attend que le budget se recharge
+    scheduler = RequestScheduler(tokens_per_minute=600)
+    scheduler.call(lambda: None, tokens=600)
+    start = time.time()
+    scheduler.call(lambda: None, tokens=1)
+    assert time.time() - start >= 0.09 and scheduler.stats()['max_queue_depth'] == 1
+    
+    # Tokens réservés mais non consommés (champ usage) rendus au budget
+    scheduler = RequestScheduler(tokens_per_minute=600)
+    scheduler.call(lambda: SimpleNamespace(usage=SimpleNamespace(total_tokens=100)), tokens=600)
+    scheduler.call(lambda: None, tokens=400)
+    stats = scheduler.stats()
+    assert stats['throttle_time'] == 0 and stats['used_tokens'] == 100
+    print(f"✅ Quotas respectés : {stats}")
+    
+    # Erreurs passagères retentées, erreurs définitives relancées immédiatement
+    class Overloaded(Exception):
+        status_code = 503
+    
+    attempts = []
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise Overloaded("surcharge")
+        return "ok"
+    
+    scheduler = RequestScheduler(max_retries=3, backoff_base=0.01, seed=0)
+    assert scheduler.call(flaky) == "ok" and scheduler.stats()['retries'] == 2
+    try:
+        scheduler.call(lambda: int("x"))
+        assert False, "ValueError attendue"
+    except ValueError:
+        assert scheduler.stats()['retries'] == 2 and scheduler.stats()['failures'] == 1
+    
+    # Tentatives échouées : réservation rendue, une seule requête comptée par appel
+    attempts.clear()
+    scheduler = RequestScheduler(requests_per_minute=2, tokens_per_minute=600, max_retries=3, backoff_base=0.01, seed=0)
+    assert scheduler.call(flaky, tokens=500) == "ok"
+    stats = scheduler.stats()
+    assert stats['requests'] == 1 and stats['estimated_tokens'] == 500 and stats['throttle_time'] == 0, stats
+    assert scheduler._reserve(100) == 0  # reste du budget : 1 requête, 100 tokens
+    print("✅ Réservations des tentatives échouées rendues au budget")
+    
+    # Limites de débit du faux serveur : Retry-After respecté, résultat complet sans fallback
+    text = "Projet\nDC-DM-001 - Maquettes\nDescription : Concevoir les pages\nDC-DM-001.1 - Accueil\nPriorité : Élevée"
+    classic = list(TextToTeamworkConverter(use_ai=False).iter_rows(text))
+    with StubOpenAIServer(rate_limit_rate=0.5, retry_after=0.05, seed=3) as server:
+        scheduler = RequestScheduler(max_retries=10, seed=0)
+        parser = AITaskParser(api_key="stub", use_cache=False, base_url=server.base_url, scheduler=scheduler)
+        assert parser.parse_with_ai(text, "Projet") == classic
+        
+        async_parser = AsyncAITaskParser(api_key="stub", use_cache=False, base_url=server.base_url, scheduler=scheduler)
+        results = asyncio.run(async_parser.parse_many([text] * 4, ["Projet"] * 4))
+        assert all(tasks == classic for tasks in results)
+        
+        stats = scheduler.stats()
+        assert stats['rate_limited'] == server.stats()['rate_limited'] > 0
+        assert stats['backoff_time'] >= 0.05 * stats['rate_limited']
+        print(f"✅ {stats['rate_limited']} réponses 429 retentées : {stats['requests']} requêtes, backoff {stats['backoff_time']}s")
+    
+    return True
+
+def test_adaptive_max_tokens():
+    """Test du max_tokens adaptatif (estimation par le parser classique, limites du modèle)."""
+    
+    print("\n\n🧪 Test 18: max_tokens adaptatif")
+    print("=" * 50)
+    
+    import json
+    from types import SimpleNamespace
+    from ai_parser import AITaskParser, MIN_OUTPUT_TOKENS
+    from stub_openai_server import StubOpenAIServer
+    
+    def make_text(lists, detail):
+        text = "Grand Projet\n\n"
+        for i in range(1, lists + 1):
+            text += f"DC-DM-{i:03d} - Liste {i}\nDescription : {detail}\n"
+            for j in range(1, 4):
+                text += f"DC-DM-{i:03d}.{j} - Tâche {i}.{j}\nDescription : {detail}\nPriorité : Élevée\n"
+        return text
+    
+    # Petit texte : max_tokens réduit au plancher ; la réponse du faux serveur tient dedans
+    small = make_text(1, "Court")
+    with StubOpenAIServer(enforce_max_tokens=True) as server:
+        parser = AITaskParser(api_key="stub", use_cache=False, base_url=server.base_url)
+        tasks = parser.parse_with_ai(small, "Grand Projet")
+        usage = parser.token_usage[-1]
+        assert len(tasks) == 4 and usage['max_tokens'] == MIN_OUTPUT_TOKENS and usage['finish_reason'] == 'stop'
+        assert usage['completion_actual'] <= usage['completion_estimated'] and usage['prompt_actual'] == usage['prompt_estimated']
+        print(f"✅ {usage}")
+        
+        # Réponse estimée au-delà de la sortie du modèle : découpage automatique
+        parser.model = 'gpt-4'
+        parser.chunk_tokens = 100000
+        large = make_text(40, "Détail " * 40)
+        tasks = parser.parse_with_ai(large, "Grand Projet")
+        assert len(tasks) == 160 and len(parser.token_usage) > 2
+        assert all(u['max_tokens'] <= 4096 and u['finish_reason'] == 'stop' for u in list(parser.token_usage)[1:])
+        print(f"✅ Document redécoupé en {len(parser.token_usage) - 1} requêtes")
+        
+        # Un seul groupe trop grand : requête refusée sans appel, fallback classique
+        requests = server.stats()['requests']
+        assert parser.parse_with_ai("Projet\n1. Tâche\nDescription : " + "mot " * 20000) == []
+        assert server.stats()['requests'] == requests
+    
+    # Réponse coupée par max_tokens : redemandée une fois avec un max_tokens doublé
+    full = json.dumps({"tasks": [{"TASKLIST": "", "TASK": "Rédiger"}]})
+    seen = []
+    def create(**kwargs):
+        seen.append(kwargs['max_tokens'])
+        truncated = len(seen) == 1
+        choice = SimpleNamespace(finish_reason='length' if truncated else 'stop',
+                                 message=SimpleNamespace(content=full[:10] if truncated else full))
+        return SimpleNamespace(choices=[choice])
+    
+    parser = AITaskParser(api_key=None, use_cache=False)
+    parser.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    assert parser.parse_with_ai("Projet\n1. Rédiger")[0]['TASK'] == "Rédiger"
+    assert seen == [MIN_OUTPUT_TOKENS, 2 * MIN_OUTPUT_TOKENS]
+    print(f"✅ Réponse tronquée redemandée : max_tokens {seen}")
+    
+    # Prose (e-mail) : le parser classique n'y trouve presque rien, max_tokens suit la taille du texte
+    email = ("Bonjour à tous,\n\nSuite à la réunion de ce matin, il faudrait que Julie prépare la maquette "
+             "de la page d'accueil d'ici vendredi, puis que l'équipe technique l'intègre la semaine prochaine. "
+             "Pensez aussi à relire les textes et à prévenir le client.\n\nMerci,\nPaul\n")
+    for text, expected_floor in ((email, parser.max_tokens), (email * 40, 3 * parser.max_tokens // 2)):
+        seen.clear()
+        parser.parse_with_ai(text)
+        assert parser.estimate_output_tokens(text) < MIN_OUTPUT_TOKENS and seen[0] >= expected_floor, seen
+    print(f"✅ Prose : max_tokens {seen[0]} (estimation classique {parser.estimate_output_tokens(email * 40)})")
+    
+    # Un seul parse classique par requête : découpage et max_tokens partagent l'estimation
+    classic = parser._get_classic_converter()
+    calls = []
+    plan_hybrid = classic.plan_hybrid
+    classic.plan_hybrid = lambda *args, **kwargs: calls.append(1) or plan_hybrid(*args, **kwargs)
+    try:
+        seen.clear()
+        parser.parse_with_ai(make_text(3, "Parse unique"))
+    finally:
+        del classic.plan_hybrid
+    assert len(calls) == 1, calls
+    print("✅ Estimation calculée une seule fois par requête")
+    
+    return True
+
+def test_ai_streaming():
+    """Test des réponses IA en streaming (extraction incrémentale des tâches JSON)."""
+    
+    print("\n\n🧪 Test 19: Streaming des réponses IA")
+    print("=" * 50)
+    
+    import json
+    import random
+    import time
+    from ai_cache import AIResponseCache
+    from ai_parser import AITaskParser
+    from json_stream import JSONArrayStreamParser
+    from stub_openai_server import StubOpenAIServer
+    
+    # Objets du tableau extraits dès leur accolade fermante, quel que soit le découpage
+    response = {"tasks": [{"TASK": "A [1] {x}", "DESCRIPTION": "guillemet \" et \\ barre"},
+                          {"TASK": "B", "TAGS": {"liste": [1, {"k": "}"}]}}], "autres": [{"ignoré": 1}]}
+    content = json.dumps(response, ensure_ascii=False)
+    rng = random.Random(0)
+    for _ in range(50):
+        parser = JSONArrayStreamParser()
+        objects = []
+        i = 0
+        while i < len(content):
+            size = rng.randint(1, 8)
+            objects += parser.feed(content[i:i + size])
+            i += size
+        assert objects == response["tasks"] and parser.done
+    parser = JSONArrayStreamParser()
+    assert parser.feed('{"tasks": [{"TASK": "A"}, {"TA') == [{"TASK": "A"}] and not parser.done
+    print("✅ Analyse JSON incrémentale")
+    
+    text = "Grand Projet\n\n"
+    for i in range(1, 11):
+        text += f"DC-DM-{i:03d} - Liste {i}\nDescription : Liste numéro {i}\n"
+        for j in range(1, 3):
+            text += f"DC-DM-{i:03d}.{j} - Tâche {i}.{j}\nDescription : Détail {i}.{j}\nPriorité : Élevée\n"
+    classic = list(TextToTeamworkConverter(use_ai=False).iter_rows(text))
+    
+    with StubOpenAIServer(stream_chunk_chars=64, stream_interval=0.03) as server:
+        ai = AITaskParser(api_key="stub", cache=AIResponseCache(path=None), base_url=server.base_url)
+        start = time.time()
+        arrivals = []
+        rows = ai.parse_with_ai(text, "Grand Projet", on_row=lambda row: arrivals.append(time.time() - start))
+        total = time.time() - start
+        assert rows == classic and len(arrivals) == len(rows)
+        # Tâches reçues au fil du flux (~30 morceaux espacés de 30 ms), pas toutes à la fin
+        assert arrivals[-1] - arrivals[0] > 0.4
+        assert ai.token_usage[-1]['completion_actual'] is not None
+        print(f"✅ Première tâche après {arrivals[0]:.2f}s, dernière après {total:.2f}s")
+        
+        # Réponse complète mise en cache : relue sans appel
+        requests = server.stats()['requests']
+        assert ai.parse_with_ai(text, "Grand Projet", on_row=lambda row: None) == classic
+        assert server.stats()['requests'] == requests
+        
+        # Parties d'un long document produites dans l'ordre, identiques au mode sans streaming
+        ai.chunk_tokens = 150
+        streamed = ai.parse_with_ai(text, "Grand Projet", on_row=lambda row: None)
+        assert streamed == ai.parse_with_ai(text, "Grand Projet") and len(streamed) == len(classic)
+        
+        # Parser asynchrone : même flux avec `async for`, parties en parallèle sous le sémaphore
+        import asyncio
+        from ai_parser import AsyncAITaskParser
+        from rate_limiter import RequestScheduler
+        
+        async def collect():
+            async_ai = AsyncAITaskParser(api_key="stub", cache=AIResponseCache(path=None), base_url=server.base_url)
+            async_ai.chunk_tokens = 150
+            return [row async for row in async_ai.iter_with_ai(text, "Grand Projet")]
+        
+        assert asyncio.run(collect()) == streamed
+        
+        # Sémaphore libre pendant l'attente du quota et le backoff, rendu après la lecture du flux
+        class CheckingScheduler(RequestScheduler):
+            def __init__(self, semaphore):
+                super().__init__()
+                self.semaphore = semaphore
+            
+            async def call_async(self, request, tokens=0):
+                assert not self.semaphore.locked(), "sémaphore tenu hors de la tentative"
+                return await super().call_async(request, tokens)
+        
+        async def stream_once():
+            semaphore = asyncio.Semaphore(1)
+            async_ai = AsyncAITaskParser(api_key="stub", cache=AIResponseCache(path=None), base_url=server.base_url,
+                                         scheduler=CheckingScheduler(semaphore))
+            rows = [row async for row in async_ai._stream_chunk(text, "Grand Projet", semaphore=semaphore)]
+            return rows, semaphore.locked()
+        
+        rows, locked = asyncio.run(stream_once())
+        assert rows == classic and not locked
+        print("✅ Streaming asynchrone identique, sémaphore tenu par tentative")
+    
+    # Réponse tronquée : échec du flux, rien en cache, fallback classique dans la prévisualisation
+    with StubOpenAIServer(truncate_rate=1.0) as server:
+        converter = TextToTeamworkConverter(openai_api_key="stub", openai_base_url=server.base_url)
+        converter.ai_parser.cache = AIResponseCache(path=None)
+        received = []
+        rows = converter.preview_rows(text, on_row=received.append)
+        assert rows == classic and len(received) < len(classic)
+        assert converter.ai_parser.cache.stats()['stores'] == 0
+        print(f"✅ Flux tronqué après {len(received)} tâches → parser classique")
+        
+        # Origine signalée : un résultat de fallback ne doit pas être mémorisé comme celui de l'IA
+        from text_to_teamwork import PREVIEW_CLASSIC, PREVIEW_FALLBACK
+        assert converter.preview_rows_with_source(text) == (classic, PREVIEW_FALLBACK)
+        assert TextToTeamworkConverter(use_ai=False).preview_rows_with_source(text) == (classic, PREVIEW_CLASSIC)
+    
+    return True
+
+def test_hybrid_mode():
+    """Test du mode hybride (parser classique, IA pour les groupes de tâche peu fiables)."""
+    
+    print("\n\n🧪 Test 20: Mode hybride")
+    print("=" * 50)
+    
+    import asyncio
+    import json
+    from ai_cache import AIResponseCache
+    from ai_parser import AITaskParser, AsyncAITaskParser, GROUP_HEADER_PATTERN
+    from stub_openai_server import StubOpenAIServer
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    classify = converter.line_classifier.classify
+    
+    # Notes de confiance : plan structuré fiable, texte libre sous une puce peu fiable
+    structured = [classify("Description : Planifier"), classify("Priorité : Élevée")]
+    assert converter.group_confidence(classify("DC-DM-001.1 - Préparer"), structured) == 1.0
+    messy = [classify("penser à appeler Paul"), classify("et le fournisseur")]
+    assert converter.group_confidence(classify("- on verra plus tard"), messy) < 0.7
+    assert converter.group_confidence(classify("1. Tâche"), [classify("Priorité : dès que possible")]) < 0.7
+    
+    text = """Projet Mixte
+
+1. Préparer le lancement
+Description : Planifier
+Priorité : Élevée
+- on verra plus tard pour le reste
+penser à appeler Paul
+et le fournisseur
+2. Publier l'annonce
+Description : Rédiger
+Priorité : Moyenne"""
+    classic = list(converter.iter_rows(text))
+    
+    def group_response(prompt):
+        # Une tâche marquée par groupe reçu
+        names = [part.strip().split('\n')[0] for part in GROUP_HEADER_PATTERN.split(prompt)[2::2]]
+        return json.dumps({"groups": [{"id": i, "tasks": [{"TASKLIST": "", "TASK": f"IA {name}"}]}
+                                      for i, name in enumerate(names, 1)]}, ensure_ascii=False)
+    
+    parser = AITaskParser(api_key=None, cache=AIResponseCache(path=None), strategy='hybrid')
+    parser.client = FakeOpenAIClient(group_response)
+    rows = parser.parse_with_ai(text, "Projet Mixte")
+    assert [r['TASK'] for r in rows] == [classic[0]['TASK'], "IA - on verra plus tard pour le reste", classic[2]['TASK']]
+    assert rows[0] == classic[0] and rows[2] == classic[2]
+    assert parser.hybrid_stats == {'groups': 3, 'ai_groups': 1, 'failed_groups': 0}
+    print("✅ Seul le groupe peu fiable est confié à l'IA, ordre conservé")
+    
+    # Plan entièrement structuré : aucun appel à l'IA
+    with open('examples/sample_text.txt', 'r', encoding='utf-8') as f:
+        sample = f.read()
+    assert parser.parse_with_ai(sample) == list(converter.iter_rows(sample))
+    assert parser.client.calls == 1 and parser.hybrid_stats['ai_groups'] == 0
+    print(f"✅ Plan structuré : {parser.hybrid_stats['groups']} groupes, 0 requête")
+    
+    # Réponse inutilisable : le groupe garde les lignes du parser classique
+    parser = AITaskParser(api_key=None, cache=AIResponseCache(path=None), strategy='hybrid')
+    parser.client = FakeOpenAIClient("pas du JSON")
+    assert parser.parse_with_ai(text, "Projet Mixte") == classic
+    assert parser.hybrid_stats['failed_groups'] == 1
+    print("✅ Échec de l'IA → lignes classiques du groupe conservées")
+    
+    # Parser asynchrone via le faux serveur (réponses dérivées du parser classique)
+    with StubOpenAIServer() as server:
+        async_parser = AsyncAITaskParser(api_key='stub', cache=AIResponseCache(path=None),
+                                         base_url=server.base_url, strategy='hybrid')
+        assert asyncio.run(async_parser.parse_with_ai(text, "Projet Mixte")) == classic
+        assert server.stats()['requests'] == 1
+    print("✅ Parser asynchrone : 1 requête pour 1 groupe incertain")
+    
+    # Confiance et estimations avec les règles du convertisseur servi (mots-clés de priorité ajoutés)
+    custom = TextToTeamworkConverter(openai_api_key='stub', openai_base_url='http://127.0.0.1:9/v1', ai_strategy='hybrid')
+    custom.priority_keywords['urgent'] = 'High'
+    urgent = "Projet\n1. Corriger la faille\nDescription : Correctif\nPriorité : urgent\n"
+    assert custom.ai_parser._get_classic_converter() is custom
+    assert len(custom.plan_hybrid(urgent)[1]) == 0 and custom.ai_parser._is_structured(urgent)
+    assert not AITaskParser(api_key=None, use_cache=False)._is_structured(urgent)
+    print("✅ Plan hybride selon les mots-clés du convertisseur")
+    
+    return True
+
+def test_parallel_parsing():
+    """Test du parsing parallèle d'un gros document (parties parsées dans un pool de processus)."""
+    
+    print("\n\n🧪 Test 21: Parsing parallèle")
+    print("=" * 50)
+    
+    import os
+    import tempfile
+    from openpyxl import load_workbook
+    from batch_convert import main
+    from benchmark import generate_document
+    from line_classifier import HEADER
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    text = generate_document(tasklists=40, subtasks=4, detail_lines=3, style='mixed', seed=3)
+    lines = text.split('\n')
+    expected = list(converter.iter_rows(text))
+    
+    # Chaque partie commence sur un en-tête de tâche (sauf la première, début du document)
+    bounds = converter.shard_bounds(lines, 4)
+    assert bounds[0] == 0 and bounds[-1] == len(lines) and len(bounds) == 5
+    assert all(converter.line_classifier.classify(lines[i].strip()).kind == HEADER for i in bounds[1:-1])
+    
+    assert converter.parse_parallel(text, workers=4, min_lines=0) == expected
+    print(f"✅ {len(lines)} lignes en 4 parties : résultat identique au parse séquentiel")
+    
+    # Contexte du document : titre du projet sur la première tâche, même après un long préambule
+    preamble = "Projet Long\n" + "Notes de réunion sans tâche\n" * 30 + "1.1 Première sous-tâche\nDescription : a\n"
+    text = preamble + "DC-DM-001 - Liste\nDC-DM-001.1 - Tâche\n" * 20
+    rows = converter.parse_parallel(text, workers=3, min_lines=0)
+    assert rows == list(converter.iter_rows(text)) and rows[0]['TASKLIST'] == "Projet Long"
+    
+    # Petit document : parse séquentiel, aucun processus lancé
+    assert converter.shard_bounds(["Projet", "1. Seule tâche"], 4) == [0, 2]
+    print("✅ Titre du projet et hiérarchie conservés entre les parties")
+    
+    # Conversion en lot d'un fichier unique : découpé entre les processus
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'gros.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        assert main([path, '-o', tmp, '--workers', '3']) == 0
+        sheet = load_workbook(os.path.join(tmp, 'gros_Teamwork.xlsx'))['Teamwork Import']
+        assert sheet.max_row == len(rows) + 1
+    print("✅ batch_convert : fichier unique converti via parse_parallel")
+    
+    return True
+
+def test_openai_client_registry():
+    """Test du registre de clients OpenAI partagés (pool keep-alive, délais, préchauffage)."""
+    
+    print("\n\n🧪 Test 22: Clients OpenAI partagés")
+    print("=" * 50)
+    
+    import asyncio
+    from ai_cache import AIResponseCache
+    from ai_parser import AITaskParser, AsyncAITaskParser
+    from openai_clients import OpenAIClientRegistry
+    from stub_openai_server import StubOpenAIServer
+    
+    registry = OpenAIClientRegistry(pool_size=4, timeout=30, connect_timeout=2)
+    with StubOpenAIServer() as server:
+        # Préchauffage : la connexion est ouverte avant la première requête
+        assert registry.warm_up('stub', server.base_url)
+        assert server.stats()['connections'] == 1 and server.stats()['requests'] == 0
+        
+        # Plusieurs parsers (convertisseurs, sessions) : un seul client, connexion réutilisée
+        parsers = [AITaskParser(api_key='stub', base_url=server.base_url, cache=AIResponseCache(path=None),
+                                client_registry=registry) for _ in range(3)]
+        assert all(parser.client is parsers[0].client for parser in parsers)
+        for i, parser in enumerate(parsers):
+            assert parser.parse_with_ai(f"Projet {i}\n1. Tâche {i}\nDescription : détail")
+        assert server.stats()['requests'] == 3 and server.stats()['connections'] == 1
+        print(f"✅ 3 parsers, 3 requêtes, {server.stats()['connections']} connexion TCP")
+        
+        # Délais explicites ; autre clé → autre client ; client asynchrone propre au parser
+        assert parsers[0].client.timeout.connect == 2 and parsers[0].client.timeout.read == 30
+        assert registry.get('autre', server.base_url) is not parsers[0].client
+        async_parser = AsyncAITaskParser(api_key='stub', base_url=server.base_url, client_registry=registry)
+        assert async_parser.client is not parsers[0].client
+        assert registry.stats() == {'clients': 2, 'created': 2, 'reused': 3, 'warmed': 1}
+        
+        # Client asynchrone fermé à la sortie de `async with`, le parser reste utilisable ensuite
+        async def parse_and_close(parser):
+            async with parser:
+                client = parser.client
+                tasks = await parser.parse_many(["Projet\n1. Tâche async\nDescription : détail"])
+            return client, tasks
+        
+        async_parser.cache = AIResponseCache(path=None)
+        first_client, results = asyncio.run(parse_and_close(async_parser))
+        assert results[0] and first_client.is_closed() and not async_parser.client.is_closed()
+        assert asyncio.run(parse_and_close(async_parser))[1] == results
+        print("✅ Client asynchrone fermé après parse_many")
+    registry.close()
+    
+    # Serveur injoignable : le préchauffage échoue sans lever d'exception
+    assert not OpenAIClientRegistry(connect_timeout=1).warm_up('stub', 'http://127.0.0.1:9/v1')
+    print("✅ Délais, clés distinctes et échec du préchauffage gérés")
+    
+    return True
+
+def test_pipeline_instrumentation():
+    """Test de la mesure des étapes du pipeline (temps propres, compteurs, tokens de l'IA)."""
+    
+    print("\n\n🧪 Test 23: Mesure des étapes")
+    print("=" * 50)
+    
+    import os
+    import tempfile
+    import time
+    from ai_cache import AIResponseCache
+    from batch_convert import main
+    from instrumentation import PipelineMetrics, stage
+    from stub_openai_server import StubOpenAIServer
+    
+    # Temps propre : une étape imbriquée n'est comptée qu'une fois
+    metrics = PipelineMetrics()
+    with metrics.stage('outer'):
+        time.sleep(0.02)
+        with metrics.stage('inner', items=5):
+            time.sleep(0.05)
+    assert metrics.stages['inner']['items'] == 5 and metrics.stages['inner']['seconds'] >= 0.05
+    assert 0.02 <= metrics.stages['outer']['seconds'] < 0.05
+    assert stage(None, 'outer') is stage(None, 'inner')  # désactivée : aucun objet créé
+    
+    with open('examples/sample_text.txt', 'r', encoding='utf-8') as f:
+        text = f.read()
+    converter = TextToTeamworkConverter(use_ai=False)
+    expected = list(converter.iter_rows(text))
+    assert converter.instrumentation is None
+    
+    received = []
+    metrics = converter.enable_instrumentation(PipelineMetrics(on_stage=lambda *args: received.append(args)))
+    assert list(converter.iter_rows(text)) == expected
+    non_empty = sum(1 for line in text.split('\n') if line.strip())
+    assert metrics.stages['line_classification']['items'] == non_empty
+    assert metrics.stages['task_groups']['calls'] == len(expected)
+    assert metrics.stages['title_extraction']['calls'] == 1 and 'priority_normalisation' in metrics.stages
+    assert len(received) == sum(stats['calls'] for stats in metrics.stages.values())
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        assert converter.convert_to_excel(text, os.path.join(tmp, 'out.xlsx'))
+        # Ligne de commande : résumé des étapes cumulé sur les processus
+        assert main(['examples/sample_text.txt', 'examples/simple_example.txt', '-o', tmp, '--timings', '-w', '2']) == 0
+    converter.preview_conversion(text)
+    assert metrics.stages['excel_write']['calls'] == 1 and metrics.stages['dataframe_build']['items'] == len(expected)
+    print(metrics.format_summary())
+    
+    converter.disable_instrumentation()
+    assert 'extract_priority' not in converter.__dict__
+    list(converter.iter_rows(text))
+    assert metrics.stages['task_groups']['calls'] == 3 * len(expected)
+    print("✅ Étapes du parser classique, de l'export et du DataFrame mesurées")
+    
+    # IA : durée des requêtes, validation, tokens de la réponse et réponses en cache
+    with StubOpenAIServer() as server:
+        converter = TextToTeamworkConverter(openai_api_key='stub', openai_base_url=server.base_url)
+        converter.ai_parser.cache = AIResponseCache(path=None)
+        metrics = converter.enable_instrumentation()
+        converter.preview_rows(text)
+        converter.preview_rows(text)
+    counters = metrics.snapshot()['counters']
+    assert metrics.stages['ai_request']['calls'] == 1 and metrics.stages['ai_validation']['calls'] == 2
+    assert counters['ai_prompt_tokens'] > 0 and counters['ai_completion_tokens'] > 0 and counters['ai_cache_hits'] == 1
+    print(f"✅ IA : {counters['ai_prompt_tokens']} tokens de prompt, {counters['ai_completion_tokens']} de réponse")
+    
+    return True
+
+def test_sampling_profiler():
+    """Test du profileur par échantillonnage (threads de session, piles collapsed, coût)."""
+    
+    print("\n\n🧪 Test 24: Profileur par échantillonnage")
+    print("=" * 50)
+    
+    import threading
+    import time
+    from sampling_profiler import OTHER_STACK, SamplingProfiler
+    
+    with open('examples/sample_text.txt', 'r', encoding='utf-8') as f:
+        text = f.read() * 20
+    converter = TextToTeamworkConverter(use_ai=False)
+    
+    def session():
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            list(converter.iter_rows(text))
+    
+    # Seuls les threads de session (nommés comme ceux de Streamlit) sont relevés
+    profiler = SamplingProfiler(interval=0.005, thread_name_prefix='ScriptRunner')
+    profiler.start()
+    profiler.start()  # sans effet : déjà lancé
+    thread = threading.Thread(target=session, name='ScriptRunner.scriptThread')
+    thread.start()
+    thread.join()
+    profiler.stop()
+    assert not profiler.running
+    
+    stats = profiler.stats()
+    assert stats['samples'] >= 20 and stats['stacks'] > 0
+    assert stats['overhead'] < 0.05, stats
+    
+    # Format collapsed : « appelant;...;appelé nombre », sans la pile du thread principal
+    collapsed = profiler.collapsed()
+    lines = collapsed.splitlines()
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+    assert sum(int(line.rsplit(' ', 1)[1]) for line in lines) == stats['stacks']
+    assert all(line.startswith('threading:Thread._bootstrap;') for line in lines)
+    assert 'text_to_teamwork:TextToTeamworkConverter._iter_task_rows' in collapsed
+    
+    top = profiler.top_functions(limit=50)
+    functions = {row['function']: row for row in top}
+    assert functions['text_to_teamwork:TextToTeamworkConverter._iter_task_rows']['total_share'] > 0.8
+    assert all(row['self'] <= row['total'] for row in top)
+    print(f"✅ {stats['samples']} échantillons, {stats['distinct_stacks']} piles distinctes, coût {stats['overhead']:.2%}")
+    
+    profiler.reset()
+    assert profiler.stats()['samples'] == 0 and profiler.collapsed() == ''
+    print("✅ Export collapsed et réinitialisation")
+    
+    # Piles distinctes plafonnées : les suivantes sont regroupées dans OTHER_STACK
+    def wait_at(depth, ready, release):
+        if depth:
+            return wait_at(depth - 1, ready, release)
+        ready.release()
+        release.wait()
+    
+    ready, release = threading.Semaphore(0), threading.Event()
+    threads = [threading.Thread(target=wait_at, args=(depth, ready, release), name=f'Capped-{depth}')
+               for depth in range(5)]
+    for thread in threads:
+        thread.start()
+    for _ in threads:
+        ready.acquire()
+    time.sleep(0.05)
+    capped = SamplingProfiler(thread_name_prefix='Capped', max_stacks=3)
+    for _ in range(2):
+        capped._sample(threading.get_ident())
+    release.set()
+    for thread in threads:
+        thread.join()
+    stats = capped.stats()
+    assert stats['stacks'] == 10 and stats['distinct_stacks'] == 4 and stats['other_stacks'] >= 4, stats
+    assert OTHER_STACK in capped.collapsed()
+    print(f"✅ Piles plafonnées : {stats['other_stacks']} échantillon(s) dans « {OTHER_STACK} »")
+    
+    return True
+
+def test_field_schema():
+    """Test du schéma déclaratif des champs de détail (alias anglais, durées, schéma personnalisé)."""
+    
+    print("\n\n🧪 Test 25: Schéma des champs")
+    print("=" * 50)
+    
+    from field_schema import FIELD_SCHEMA, FieldLabel
+    from line_classifier import HEADER
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    classifier = converter.line_classifier
+    cases = [
+        ("Priority: High", 'priority', 'High'),
+        ("🔗 Depends on: 1.2", 'dependencies', '1.2'),
+        ("**Acceptance criteria:** ok", 'criteria', 'ok'),
+        ("**Estimate:** 2h", 'estimated_time', '2hr'),
+        ("Estimate: 3h", 'estimated_time', '3hr'),
+        ("Estimated time: 45 min", 'estimated_time', '45mn'),
+        ("Durée estimée : 30mn", 'estimated_time', '30mn'),
+        ("Temps estimé : 2 heures", 'estimated_time', '2hr'),
+        ("Durée estimée sans deux-points 3h", 'estimated_time', ''),
+        ("Critère foo : bar Description : x", 'description', 'x'),
+        ("Risks: Description : x", 'description', 'x'),
+        ("Description : risks: y", 'description', 'risks: y'),
+        ("The risk: remains free text", None, ''),
+    ]
+    for line, field, value in cases:
+        assert classifier.classify_field(line) == (field, value), (line, classifier.classify_field(line))
+    print(f"✅ {len(cases)} libellés français et anglais reconnus")
+    
+    # Plan rédigé en anglais : mêmes colonnes que les libellés français
+    rows = converter.parse_text_to_tasks(
+        "Website\n1. Build landing page\nDescription : Hero section\nPriority: high\n"
+        "Depends on: Branding\nEstimate: 4h\nDeliverables: mockups\n")
+    assert rows[0]['PRIORITY'] == 'High' and rows[0]['ESTIMATED TIME'] == '4hr'
+    assert rows[0]['DESCRIPTION'] == "Hero section. Livrables : mockups. Dépendance : Branding."
+    assert converter.extract_estimated_time("Tâche\nDurée estimée : 30mn") == '30mn'
+    
+    # Temps estimé cité dans l'en-tête ou au milieu d'une autre ligne de détail
+    rows = converter.parse_text_to_tasks(
+        "Projet test\n1. Tâche A (Durée estimée : 2h)\nDescription : x\n"
+        "2. Tâche B\nDescription : y, temps estimé : 45 minutes\n"
+        "3. Tâche C (durée estimée : 1h)\nDurée estimée : 3h\n")
+    assert [row['ESTIMATED TIME'] for row in rows] == ['2hr', '45mn', '3hr'], rows
+    assert converter.extract_estimated_time("Description : x, durée estimée : 3h") == '3hr'
+    print("✅ Temps estimé retrouvé dans l'en-tête et les autres lignes")
+    
+    # Nouveau libellé : configuration seulement
+    custom = TextToTeamworkConverter(use_ai=False, field_schema=FIELD_SCHEMA + [FieldLabel('priority', r'prio\s*:')])
+    rows = custom.parse_text_to_tasks("Projet test\n1. Tâche\nPrio: basse\n")
+    assert rows[0]['PRIORITY'] == 'Low'
+    assert converter.parse_text_to_tasks("Projet test\n1. Tâche\nPrio: basse\n")[0]['PRIORITY'] == ''
+    
+    # Alias de début de ligne en nombre : même classification (coût mesuré dans benchmark.py)
+    many = FIELD_SCHEMA + [FieldLabel('risks', rf'hazard{i}\s*:') for i in range(50)]
+    extended = TextToTeamworkConverter(use_ai=False, field_schema=many).line_classifier
+    lines = [line.strip() for line in open('examples/sample_text.txt', encoding='utf-8') if line.strip()]
+    assert [extended.classify_field(line) for line in lines] == [classifier.classify_field(line) for line in lines]
+    assert extended.classify_field("- Hazard42: flood") == ('risks', 'flood')
+    print(f"✅ {len(many) - len(FIELD_SCHEMA)} alias ajoutés sans changer la classification")
+    
+    # Libellés anglais en puce ou en gras : des champs, pas des sous-tâches
+    rows = list(converter.iter_rows("1. Build API\n- Priority: High\n- Depends on: Auth\n- Estimate: 4h\n"
+                                    "• **Deliverables:** docs\n- Description : ok\n2. Ship\n"))
+    assert [row['TASK'] for row in rows] == ['Build API', 'Ship'], rows
+    assert rows[0]['PRIORITY'] == 'High' and rows[0]['ESTIMATED TIME'] == '4hr'
+    assert rows[0]['DESCRIPTION'] == "ok. Livrables : docs. Dépendance : Auth."
+    assert converter.line_classifier.classify("- Build the API").kind == HEADER
+    print("✅ Libellés anglais en puce et en gras rattachés à la tâche")
+    
+    return True
+
+def test_export_formats():
+    """Test des exports CSV, JSONL et Parquet (mêmes lignes que l'export Excel)."""
+    
+    print("\n\n🧪 Test 26: Export CSV, JSONL et Parquet")
+    print("=" * 50)
+    
+    import csv
+    import io
+    import json
+    import os
+    import tempfile
+    import time
+    from batch_convert import main
+    from benchmark import generate_document
+    from exporters import EXPORTERS, available_formats, export_bytes, format_for_path, get_exporter, write_rows
+    
+    converter = TextToTeamworkConverter(use_ai=False)
+    text = generate_document(tasklists=40, subtasks=5, detail_lines=3)
+    rows = converter.parse_text_to_tasks(text)
+    expected = [[row[col] for col in converter.columns] for row in rows]
+    
+    # CSV : en-tête puis une ligne par tâche, dans l'ordre des colonnes
+    data = export_bytes(converter.iter_rows(text), converter.columns, 'csv')
+    records = list(csv.reader(io.StringIO(data.decode('utf-8-sig'), newline='')))
+    assert records[0] == converter.columns and records[1:] == expected
+    print(f"✅ CSV : {len(records) - 1} lignes identiques au parsing")
+    
+    # JSONL : un objet par ligne, clés dans l'ordre des colonnes
+    data = export_bytes(converter.iter_rows(text), converter.columns, 'jsonl')
+    objects = [json.loads(line) for line in data.decode('utf-8').splitlines()]
+    assert [list(obj) for obj in objects] == [converter.columns] * len(rows)
+    assert [list(obj.values()) for obj in objects] == expected
+    print("✅ JSONL : clés dans l'ordre des colonnes")
+    
+    try:
+        get_exporter('ods')
+        assert False, "format inconnu accepté"
+    except ValueError:
+        pass
+    
+    # Extension inconnue : erreur plutôt qu'un classeur Excel dans un .txt
+    assert format_for_path('Plan.CSV') == 'csv'
+    try:
+        format_for_path('plan.txt')
+        assert False, "extension inconnue acceptée"
+    except ValueError as e:
+        assert '.xlsx' in str(e) and '.csv' in str(e)
+    
+    # Cellules interprétées comme formules par Excel : neutralisées par « ' »
+    formulas = [{'TASK': '=HYPERLINK("http://x")', 'DESCRIPTION': '\t=1', 'TAGS': '', 'STATUS': '@SUM(A1)'},
+                {'TASK': 'Tâche = ok', 'DESCRIPTION': '- étape un', 'TAGS': '+2 jours', 'STATUS': ''}]
+    data = export_bytes(formulas, ['TASK', 'DESCRIPTION', 'TAGS', 'STATUS'], 'csv')
+    records = list(csv.reader(io.StringIO(data.decode('utf-8-sig'), newline='')))
+    assert records[1] == ["'=HYPERLINK(\"http://x\")", "'\t=1", '', "'@SUM(A1)"]
+    # Textes commençant par « - » ou « + » : transmis tels quels à Teamwork
+    assert records[2] == ['Tâche = ok', '- étape un', '+2 jours', '']
+    print("✅ Extension inconnue refusée, formules CSV neutralisées")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Format déduit de l'extension
+        output_path = os.path.join(tmp, 'plan.csv')
+        assert converter.convert_to_file(text, output_path)
+        with open(output_path, encoding='utf-8-sig', newline='') as f:
+            assert list(csv.reader(f))[1:] == expected
+        
+        # Ligne de commande : --format et extension du fichier fusionné
+        notes = os.path.join(tmp, 'notes')
+        os.makedirs(notes)
+        for i in range(2):
+            with open(os.path.join(notes, f'projet{i}.txt'), 'w', encoding='utf-8') as f:
+                f.write(f"Projet {i}\n\n1. Préparer le lot {i}\n2. Livrer le lot {i}\n")
+        exports = os.path.join(tmp, 'exports')
+        assert main([notes, '-o', exports, '--format', 'csv', '--workers', '1']) == 0
+        assert sorted(os.listdir(exports)) == [f'projet{i}_Teamwork.csv' for i in range(2)]
+        merged = os.path.join(tmp, 'tout.jsonl')
+        assert main([os.path.join(notes, '*.txt'), '--merge', merged, '--workers', '1']) == 0
+        with open(merged, encoding='utf-8') as f:
+            assert [json.loads(line)['TASK'] for line in f] == [
+                f"{verb} le lot {i}" for i in range(2) for verb in ("Préparer", "Livrer")]
+        print("✅ convert_to_file et batch_convert --format / --merge .jsonl")
+        
+        unknown = os.path.join(tmp, 'plan.txt')
+        assert main([notes, '--merge', unknown, '--workers', '1']) == 1 and not os.path.exists(unknown)
+        assert main([notes, '--merge', unknown, '--format', 'csv', '--workers', '1']) == 0
+        with open(unknown, encoding='utf-8-sig', newline='') as f:
+            assert len(list(csv.reader(f))) == 5
+        assert not converter.convert_to_file(text, os.path.join(tmp, 'plan.ods'))
+        
+        if 'parquet' in available_formats():
+            import pyarrow.parquet as pq
+            output_path = os.path.join(tmp, 'plan.parquet')
+            assert converter.convert_to_file(text, output_path)
+            table = pq.read_table(output_path)
+            assert table.column_names == converter.columns and table.num_rows == len(rows)
+            print("✅ Parquet : schéma et nombre de lignes")
+        else:
+            print("ℹ️ pyarrow absent : export Parquet non testé")
+        
+        # Écrire du CSV est bien plus rapide que construire un classeur Excel
+        timings = {}
+        for fmt in ('xlsx', 'csv'):
+            output_path = os.path.join(tmp, 'bench' + EXPORTERS[fmt].extension)
+            timings[fmt] = float('inf')
+            for _ in range(3):
+                start = time.perf_counter()
+                write_rows(rows, output_path, converter.columns, fmt)
+                timings[fmt] = min(timings[fmt], time.perf_counter() - start)
+        print(f"✅ {len(rows)} lignes : Excel {timings['xlsx'] * 1000:.1f} ms, CSV {timings['csv'] * 1000:.1f} ms")
+        assert timings['csv'] < timings['xlsx']
+    
+    return True
+
 def run_all_tests():
     """Lance tous les tests."""
     
@@ -197,7 +1575,29 @@ def run_all_tests():
         ("Conversion de base", test_sample_conversion),
         ("Exemple complexe", test_complex_example), 
         ("Cas limites", test_edge_cases),
-        ("Performance", test_performance)
+        ("Performance", test_performance),
+        ("Classification des lignes", test_line_classifier),
+        ("Parsing en flux", test_iter_tasks_streaming),
+        ("Export Excel en flux", test_excel_streaming_export),
+        ("Cache des réponses IA", test_ai_response_cache),
+        ("Parsing IA par morceaux", test_ai_chunked_parsing),
+        ("Parser IA asynchrone", test_async_ai_parser),
+        ("Conversion en lot", test_batch_convert),
+        ("Benchmark", test_benchmark_suite),
+        ("Faux serveur OpenAI", test_stub_openai_server),
+        ("Modèle de ligne TeamworkRow", test_teamwork_row),
+        ("Parsing incrémental", test_incremental_parsing),
+        ("Stratégie IA par groupe", test_ai_group_strategy),
+        ("Ordonnanceur des appels OpenAI", test_request_scheduler),
+        ("max_tokens adaptatif", test_adaptive_max_tokens),
+        ("Streaming des réponses IA", test_ai_streaming),
+        ("Mode hybride", test_hybrid_mode),
+        ("Parsing parallèle", test_parallel_parsing),
+        ("Clients OpenAI partagés", test_openai_client_registry),
+        ("Mesure des étapes", test_pipeline_instrumentation),
+        ("Profileur par échantillonnage", test_sampling_profiler),
+        ("Schéma des champs", test_field_schema),
+        ("Export CSV, JSONL et Parquet", test_export_formats)
     ]
     
     results = []
@@ -1,13 +1,63 @@
-import pandas as pd
-import re
-import openai
+import copy
 import os
-from typing import Dict, List, Tuple, Optional
-from dotenv import load_dotenv
-from ai_parser import AITaskParser
+import re
+from itertools import chain
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple, Optional, Union
+from instrumentation import (PipelineMetrics, STAGE_CLASSIFY, STAGE_DATAFRAME, STAGE_EXCEL, STAGE_EXPORT, STAGE_GROUPS,
+                             STAGE_PARALLEL, STAGE_PRIORITY, STAGE_TITLE, stage)
+from field_schema import FIELD_SCHEMA, FieldLabel
+from line_classifier import LineClassifier, ClassifiedLine, HEADER, FIELD, IGNORE, TASK_PATTERNS, IGNORE_PATTERNS, HIERARCHY_PATTERN
+from teamwork_row import COLUMNS, PRIORITY_NORMALIZATION, TeamworkRow, rows_to_dataframe
+
+# pandas, openai (via ai_parser) et openpyxl (via exporters) sont importés à la demande :
+# le parser classique démarre sans charger ces dépendances lourdes
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Nombre de lignes examinées pour trouver le titre du projet
+TITLE_SEARCH_LINES = 5
+
+# Premier caractère non blanc (début du texte utile)
+NON_BLANK_PATTERN = re.compile(r'\S')
+
+# Marqueurs retirés des lignes candidates au titre du projet
+TITLE_CLEANUP_PATTERNS = [
+    re.compile(r'^[#\*\-=✅✓•]+\s*'),
+    re.compile(r'\s*[#\*\-=]+$'),
+    re.compile(r'📌.*?:'),
+    re.compile(r'🎯.*?:'),
+]
+
+# Mode hybride : confiance sous laquelle un groupe de tâche est confié à l'IA
+HYBRID_CONFIDENCE_THRESHOLD = 0.7
+
+# Nom de tâche au-delà duquel l'en-tête est probablement une phrase du texte
+MAX_TASK_NAME_LENGTH = 120
+
+# Parsing parallèle : en dessous de ce nombre de lignes, démarrer les processus coûte plus que le parse
+PARALLEL_MIN_LINES = 20000
+
+# Origine des lignes d'une prévisualisation (voir preview_rows_with_source)
+PREVIEW_AI = 'ai'
+PREVIEW_CLASSIC = 'classic'
+PREVIEW_FALLBACK = 'fallback'  # IA activée mais en échec : lignes du parser classique
+
+# Convertisseur propre à chaque processus du parsing parallèle
+_shard_converter = None
+
+class IncrementalState:
+    """
+    Travail réutilisable du parsing incrémental (entrées du dernier document parsé).
+
+    Le convertisseur en garde un par défaut ; quand il est partagé (application
+    Streamlit), chaque éditeur passe le sien à parse_incremental pour que les
+    documents des différentes sessions ne s'écrasent pas.
+    """
 
-# Charger les variables d'environnement
-load_dotenv()
+    def __init__(self):
+        self.lines = {}   # ligne → ClassifiedLine
+        self.groups = {}  # contenu d'un groupe de tâche → lignes Teamwork
+        self.stats = {'groups': 0, 'reused_groups': 0}
 
 class TextToTeamworkConverter:
     """
@@ -17,12 +67,9 @@ class TextToTeamworkConverter:
     TASKLIST | TASK | DESCRIPTION | ASSIGN TO | START DATE | DUE DATE | PRIORITY | ESTIMATED TIME | TAGS | STATUS
     """
     
-    def __init__(self, openai_api_key: Optional[str] = None, use_ai: bool = True):
-        self.columns = [
-            'TASKLIST', 'TASK', 'DESCRIPTION', 'ASSIGN TO', 
-            'START DATE', 'DUE DATE', 'PRIORITY', 'ESTIMATED TIME', 
-            'TAGS', 'STATUS'
-        ]
+    def __init__(self, openai_api_key: Optional[str] = None, use_ai: bool = True, openai_base_url: Optional[str] = None,
+                 ai_strategy: Optional[str] = None, field_schema: Optional[Sequence[FieldLabel]] = None):
+        self.columns = list(COLUMNS)
         
         # Configuration IA
         self.use_ai = use_ai
@@ -30,7 +77,10 @@ class TextToTeamworkConverter:
         
         if use_ai:
             try:
-                self.ai_parser = AITaskParser(api_key=openai_api_key)
+                from ai_parser import AITaskParser
+                # Estimations et mode hybride avec les règles de ce convertisseur (schéma, priorités...)
+                self.ai_parser = AITaskParser(api_key=openai_api_key, base_url=openai_base_url, strategy=ai_strategy,
+                                              classic_converter=self)
                 # Tester la connexion
                 if not self.ai_parser.is_available():
                     print("⚠️ Clé OpenAI manquante - Utilisation du parser classique")
@@ -42,29 +92,16 @@ class TextToTeamworkConverter:
                 self.ai_parser = None
         
         # Patterns pour identifier les éléments avec numérotation hiérarchique
-        self.task_patterns = [
-            r'^[A-Z]{2,}-[A-Z]{2,}-\d+(?:\.\d+)*\s*[-–]\s*(.+)',  # DC-DM-001 - Tâche ou DC-DM-001.1 - Tâche
-            r'^\d+(?:\.\d+)*\.?\s*[–-]?\s*(.+)',  # 1. ou 2.5.1 – Tâche (capture la numérotation hiérarchique)
-            r'^[-•]\s*(.+)',    # - Tâche ou • Tâche
-            r'^[✓✅]\s*(.+)',   # ✓ Tâche ou ✅ Tâche
-            r'^[a-zA-Z]\)\s*(.+)', # a) Tâche
-        ]
+        self.task_patterns = list(TASK_PATTERNS)
         
         # Patterns à ignorer (ne sont pas des tâches)
-        self.ignore_patterns = [
-            r'critère\s*d[\'\'""]acceptation',
-            r'dépendance\s*:',
-            r'livrable\s*:',
-            r'risque\s*:',
-            r'description\s*:',
-            r'liste\s+des\s+tâches',
-            r'objectif\s+général',
-            r'jalon\s+principal',
-            r'gestion\s+des\s+risques',
-        ]
+        self.ignore_patterns = list(IGNORE_PATTERNS)
         
         # Pattern pour détecter le niveau de hiérarchie
-        self.hierarchy_pattern = r'^(?:[A-Z]{2,}-[A-Z]{2,}-)?(\d+(?:\.\d+)*)'
+        self.hierarchy_pattern = HIERARCHY_PATTERN
+        
+        # Libellés des champs de détail (Description :, Priority: ...), voir field_schema.py
+        self.field_schema = list(field_schema if field_schema is not None else FIELD_SCHEMA)
         
         self.priority_keywords = {
             'élevée': 'High',
@@ -77,68 +114,74 @@ class TextToTeamworkConverter:
             'low': 'Low'
         }
         
+        # Classifieur de lignes : toutes les regex ci-dessus compilées une seule fois
+        self.line_classifier = LineClassifier(self.task_patterns, self.ignore_patterns, self.hierarchy_pattern,
+                                              self.field_schema)
+        
+        # Caches du parsing incrémental (entrées du dernier document parsé uniquement)
+        self._incremental = IncrementalState()
+        
+        # Mesure des étapes du pipeline (None = désactivée, voir enable_instrumentation)
+        self.instrumentation = None
+        
+    def enable_instrumentation(self, metrics: Optional[PipelineMetrics] = None) -> PipelineMetrics:
+        """
+        Active la mesure du temps et des compteurs de chaque étape (extraction du titre,
+        classification des lignes, groupes de tâche, priorités, requêtes et validation IA,
+        DataFrame, écriture Excel). Les étapes exécutées dans les processus de
+        parse_parallel ne sont mesurées que globalement (parallel_parse).
+        
+        Args:
+            metrics: Enregistreur à utiliser (par défaut, un nouveau PipelineMetrics)
+            
+        Returns:
+            L'enregistreur branché sur le convertisseur et son parser IA
+        """
+        self.disable_instrumentation()
+        metrics = metrics or PipelineMetrics()
+        self.instrumentation = metrics
+        # Méthode remplacée sur l'instance seulement : aucun test dans le parser quand la mesure est désactivée
+        self.extract_priority = metrics.timed(STAGE_PRIORITY, self.extract_priority)
+        if self.ai_parser:
+            self.ai_parser.instrumentation = metrics
+        return metrics
+    
+    def disable_instrumentation(self) -> None:
+        """Désactive la mesure des étapes."""
+        self.instrumentation = None
+        self.__dict__.pop('extract_priority', None)
+        if self.ai_parser:
+            self.ai_parser.instrumentation = None
+    
     def get_task_hierarchy_level(self, task_text: str) -> Tuple[int, str]:
         """Retourne le niveau de hiérarchie et le numéro de la tâche."""
-        match = re.match(self.hierarchy_pattern, task_text.strip())
-        if match:
-            number = match.group(1)
-            level = len(number.split('.'))  # 2.5.1 = niveau 3, 2.5 = niveau 2, 2 = niveau 1
-            return level, number
-        return 1, ""
+        # 2.5.1 = niveau 3, 2.5 = niveau 2, 2 = niveau 1
+        return self.line_classifier.hierarchy(task_text.strip())
     
     def clean_task_name(self, task_text: str) -> str:
         """Nettoie le nom de la tâche en supprimant la numérotation et les codes."""
-        for pattern in self.task_patterns:
-            match = re.match(pattern, task_text.strip())
-            if match:
-                cleaned = match.group(1).strip()
-                # Supprimer les codes de tâches (ex: DC-DM-001.1 -, DC-DM-001 -)
-                cleaned = re.sub(r'^[A-Z]{2,}-[A-Z]{2,}-\d+(?:\.\d+)*\s*[-–]\s*', '', cleaned)
-                return cleaned.strip()
+        cleaned = self.line_classifier.match_header(task_text.strip())
         
         # Fallback si aucun pattern ne match, nettoyer quand même les codes
-        cleaned = task_text.strip()
-        cleaned = re.sub(r'^[A-Z]{2,}-[A-Z]{2,}-\d+(?:\.\d+)*\s*[-–]\s*', '', cleaned)
-        return cleaned.strip()
+        if cleaned is None:
+            cleaned = task_text
+        
+        # Supprimer les codes de tâches (ex: DC-DM-001.1 -, DC-DM-001 -)
+        return self.line_classifier.strip_task_code(cleaned.strip())
     
     def is_main_task(self, task_text: str) -> bool:
         """Détermine si c'est une tâche principale vs sous-tâche selon la numérotation."""
         level, number = self.get_task_hierarchy_level(task_text)
         
         # Si c'est un code avec un seul niveau (ex: DC-DM-001), c'est une tâche principale
-        # Si c'est un code avec sous-niveaux (ex: DC-DM-001.1), c'est une sous-tâche
-        if '.' in number:
-            return False  # Sous-tâche (ex: DC-DM-001.1, 2.5.1)
-        else:
-            # Pour les numérotations simples (1, 2, 3), traiter comme sous-tâches par défaut
-            # sauf si c'est un code spécifique (DC-DM-001)
-            if re.match(r'^[A-Z]{2,}-[A-Z]{2,}-\d+\s*[-–]', task_text):
-                return True   # Tâche principale (ex: DC-DM-001)
-            else:
-                return False  # Sous-tâche (ex: 1., 2., 3.)
+        # Si c'est un code avec sous-niveaux (ex: DC-DM-001.1) ou une numérotation
+        # simple (1., 2.5.1), c'est une sous-tâche
+        return self.line_classifier.is_main_task(task_text, number)
     
     def should_ignore_line(self, line: str) -> bool:
         """Vérifie si une ligne doit être ignorée car ce n'est pas une vraie tâche."""
-        line_lower = line.lower().strip()
-        
-        # Ignorer les lignes vides ou très courtes
-        if len(line_lower) < 3:
-            return True
-        
-        # Vérifier les patterns à ignorer
-        for pattern in self.ignore_patterns:
-            if re.search(pattern, line_lower, re.IGNORECASE):
-                return True
-        
-        # Ignorer les lignes qui commencent par des emojis de description
-        if re.match(r'^\s*[🔗📋✅❗⚠️📌🎯]\s*(critère|dépendance|livrable|risque|liste|objectif|jalon)', line_lower):
-            return True
-            
-        # Ignorer spécifiquement les en-têtes de section
-        if re.match(r'^\s*[✅📌🎯]\s+.*?(liste|objectif|jalon)', line_lower):
-            return True
-            
-        return False
+        # Lignes très courtes, patterns à ignorer, emojis de description et en-têtes de section
+        return self.line_classifier.is_ignored(line)
     
     def extract_priority(self, text: str) -> Optional[str]:
         """Extrait la priorité du texte."""
@@ -149,75 +192,61 @@ class TextToTeamworkConverter:
         return None
     
     def extract_estimated_time(self, text: str) -> Optional[str]:
-        """Extrait le temps estimé du texte et le formate selon les règles."""
-        # Chercher "Durée estimée : Xh" ou "Durée estimée : X heures" ou "Durée estimée : Xmn"
-        patterns = [
-            r'durée\s+estimée\s*:\s*(\d+)\s*h(?:eure)?s?',  # "Durée estimée : 3h" ou "3 heures"
-            r'durée\s+estimée\s*:\s*(\d+)\s*mn',            # "Durée estimée : 30mn"
-            r'durée\s+estimée\s*:\s*(\d+)\s*min(?:ute)?s?', # "Durée estimée : 30 minutes"
-            r'temps\s+estimé\s*:\s*(\d+)\s*h(?:eure)?s?',   # "Temps estimé : 3h"
-            r'temps\s+estimé\s*:\s*(\d+)\s*mn',             # "Temps estimé : 30mn"
-        ]
-        
-        text_lower = text.lower()
-        
-        # Chercher les heures
-        for pattern in patterns[:2] + [patterns[3]]:  # Patterns pour heures
-            match = re.search(pattern, text_lower)
-            if match:
-                hours = match.group(1)
-                return f"{hours}hr"
-        
-        # Chercher les minutes
-        for pattern in patterns[2:3] + [patterns[4]]:  # Patterns pour minutes
-            match = re.search(pattern, text_lower)
-            if match:
-                minutes = match.group(1)
-                return f"{minutes}mn"
-        
-        return None
+        """Extrait le temps estimé du texte (premier libellé de temps estimé) et le formate selon les règles."""
+        for line in text.split('\n'):
+            field, value = self.line_classifier.classify_field(line.strip())
+            if field == 'estimated_time' and value:
+                return value
+        # Temps estimé au milieu d'une ligne (« Description : ..., durée estimée : 3h »)
+        return self.line_classifier.search_field('estimated_time', text) or None
     
-    def _normalize_priorities(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _normalize_priorities(self, df: 'pd.DataFrame') -> 'pd.DataFrame':
         """Normalise toutes les priorités en anglais."""
         if 'PRIORITY' in df.columns:
-            # Mapping pour forcer la conversion des priorités françaises restantes
-            priority_map = {
-                'Élevée': 'High',
-                'élevée': 'High',
-                'Elevee': 'High',
-                'elevee': 'High',
-                'Haute': 'High',
-                'haute': 'High',
-                'Moyenne': 'Medium',
-                'moyenne': 'Medium',
-                'Moyen': 'Medium',
-                'moyen': 'Medium',
-                'Faible': 'Low',
-                'faible': 'Low',
-                'Basse': 'Low',
-                'basse': 'Low'
-            }
-            
             # Appliquer la normalisation
-            df['PRIORITY'] = df['PRIORITY'].replace(priority_map)
+            df['PRIORITY'] = df['PRIORITY'].replace(PRIORITY_NORMALIZATION)
         
         return df
     
     def extract_project_title(self, text: str) -> str:
         """Extrait le titre du projet du texte."""
-        lines = text.strip().split('\n')
-        
+        # Découper seulement les premières lignes utiles, pas tout le document
+        start = NON_BLANK_PATTERN.search(text)
+        if start is None:
+            return "Projet"
+        lines = []
+        position = start.start()
+        while len(lines) < TITLE_SEARCH_LINES:
+            end = text.find('\n', position)
+            if end < 0:
+                lines.append(text[position:])
+                break
+            lines.append(text[position:end])
+            position = end + 1
+        return self._extract_title_from_lines(lines)
+    
+    def _project_title_of(self, lines: List[str]) -> str:
+        """Titre du projet d'un document découpé en lignes (mêmes lignes examinées que iter_tasks)."""
+        with stage(self.instrumentation, STAGE_TITLE):
+            head = []
+            for line in lines:
+                if head or line.strip():
+                    head.append(line)
+                    if len(head) == TITLE_SEARCH_LINES:
+                        break
+            return self._extract_title_from_lines(head) if head else "Projet"
+    
+    def _extract_title_from_lines(self, lines: List[str]) -> str:
+        """Cherche le titre dans les premières lignes (la première ligne étant non vide)."""
         # Chercher un titre en première ligne ou avec des marqueurs
-        for line in lines[:5]:  # Chercher dans les 5 premières lignes
+        for line in lines[:TITLE_SEARCH_LINES]:  # Chercher dans les 5 premières lignes
             line = line.strip()
             if not line:
                 continue
                 
             # Supprimer les marqueurs communs et emojis
-            line = re.sub(r'^[#\*\-=✅✓•]+\s*', '', line)
-            line = re.sub(r'\s*[#\*\-=]+$', '', line)
-            line = re.sub(r'📌.*?:', '', line)
-            line = re.sub(r'🎯.*?:', '', line)
+            for pattern in TITLE_CLEANUP_PATTERNS:
+                line = pattern.sub('', line)
             
             # Nettoyer "Liste des Tâches" qui est souvent un en-tête, pas le titre du projet
             if 'liste' in line.lower() and 'tâche' in line.lower():
@@ -230,6 +259,16 @@ class TextToTeamworkConverter:
     
     def parse_task_details(self, task_lines: List[str]) -> Dict[str, str]:
         """Parse les détails d'une tâche à partir de plusieurs lignes."""
+        body = []
+        for line in task_lines[1:]:  # Skip la première ligne (nom de la tâche)
+            line = line.strip()
+            if line:
+                body.append(self.line_classifier.classify_detail(line))
+        
+        return self._collect_details(task_lines[0] if task_lines else '', body)
+    
+    def _collect_details(self, header_text: str, body: List[ClassifiedLine]) -> Dict[str, str]:
+        """Regroupe les lignes classées du corps d'une tâche par section (`header_text` : ligne d'en-tête)."""
         details = {
             'description': [],
             'priority': None,
@@ -242,59 +281,27 @@ class TextToTeamworkConverter:
         }
         
         current_section = 'description'
-        full_text = ' '.join(task_lines)  # Pour extraire le temps estimé
         
-        # Extraire le temps estimé depuis tout le texte
-        details['estimated_time'] = self.extract_estimated_time(full_text)
-        
-        for line in task_lines[1:]:  # Skip la première ligne (nom de la tâche)
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Identifier le type d'information
-            if re.search(r'description\s*:', line, re.IGNORECASE):
-                current_section = 'description'
-                content = re.sub(r'.*description\s*:\s*', '', line, flags=re.IGNORECASE)
-                if content:
-                    details['description'].append(content)
-            elif re.search(r'priorité\s*:', line, re.IGNORECASE):
-                priority_text = re.sub(r'.*priorité\s*:\s*', '', line, flags=re.IGNORECASE)
-                details['priority'] = self.extract_priority(priority_text)
-            elif re.search(r'dépendance', line, re.IGNORECASE):
-                current_section = 'dependencies'
-                content = re.sub(r'.*dépendance[s]?\s*:\s*', '', line, flags=re.IGNORECASE)
-                if content:
-                    details['dependencies'].append(content)
-            elif re.search(r'critère', line, re.IGNORECASE):
-                current_section = 'criteria'
-                content = re.sub(r'.*critère.*?:\s*', '', line, flags=re.IGNORECASE)
-                if content:
-                    details['criteria'].append(content)
-            elif re.search(r'livrable', line, re.IGNORECASE):
-                current_section = 'deliverables'
-                content = re.sub(r'.*livrable[s]?\s*:\s*', '', line, flags=re.IGNORECASE)
-                if content:
-                    details['deliverables'].append(content)
-            elif re.search(r'risque', line, re.IGNORECASE):
-                current_section = 'risks'
-                content = re.sub(r'.*risque[s]?\s*:\s*', '', line, flags=re.IGNORECASE)
-                if content:
-                    details['risks'].append(content)
-            elif re.search(r'jalon\s+principal', line, re.IGNORECASE):
-                current_section = 'milestones'
-                content = re.sub(r'.*jalon\s+principal\s*:\s*', '', line, flags=re.IGNORECASE)
-                if content:
-                    details['milestones'].append(content)
-            elif re.search(r'durée\s+estimée', line, re.IGNORECASE):
-                # Déjà traité au début, ignorer ici pour éviter duplication
-                continue
-            elif re.search(r'temps\s+estimé', line, re.IGNORECASE):
-                # Déjà traité au début, ignorer ici pour éviter duplication
-                continue
-            else:
+        for line in body:
+            field = line.field
+            if field is None:
                 # Ajouter à la section courante
-                details[current_section].append(line)
+                details[current_section].append(line.text)
+            elif field == 'priority':
+                details['priority'] = self.extract_priority(line.value)
+            elif field == 'estimated_time':
+                # Durée déjà formatée par le classifieur ; le premier temps estimé du groupe l'emporte
+                if details['estimated_time'] is None and line.value:
+                    details['estimated_time'] = line.value
+            else:
+                current_section = field
+                if line.value:
+                    details[field].append(line.value)
+        
+        if details['estimated_time'] is None:
+            # Sans ligne de temps estimé : durée citée dans l'en-tête ou dans une autre ligne
+            full_text = ' '.join([header_text] + [line.text for line in body])
+            details['estimated_time'] = self.line_classifier.search_field('estimated_time', full_text) or None
         
         return details
     
@@ -335,11 +342,47 @@ class TextToTeamworkConverter:
     
     def parse_text_to_tasks(self, text: str) -> List[Dict[str, str]]:
         """Parse le texte pour extraire les tâches avec gestion hiérarchique."""
-        lines = text.split('\n')
-        project_title = self.extract_project_title(text)
+        return [row.to_dict() for row in self.iter_tasks(text.split('\n'))]
+    
+    def iter_tasks(self, lines: Iterable[str]) -> Iterator[TeamworkRow]:
+        """
+        Parse les tâches ligne par ligne et produit chaque ligne Teamwork dès que
+        son groupe de tâche est terminé.
         
-        tasks = []
-        current_task_lines = []
+        Args:
+            lines: Fichier ouvert ou tout itérable de lignes (avec ou sans saut de ligne final)
+            
+        Returns:
+            Itérateur de TeamworkRow (lisibles comme des dictionnaires), priorités normalisées
+        """
+        lines = iter(lines)
+        
+        # Lire en avance uniquement les lignes nécessaires au titre du projet
+        head = []
+        for line in lines:
+            if head or line.strip():
+                head.append(line)
+                if len(head) == TITLE_SEARCH_LINES:
+                    break
+        with stage(self.instrumentation, STAGE_TITLE):
+            project_title = self._extract_title_from_lines(head) if head else "Projet"
+        
+        yield from self._iter_task_rows(chain(head, lines), project_title, True)
+    
+    def _iter_task_rows(self, lines: Iterable[str], project_title: str, is_first_task: bool) -> Iterator[TeamworkRow]:
+        """
+        Boucle du parser classique sur des lignes dont le titre du projet est connu.
+        
+        `is_first_task` indique si le premier en-tête rencontré est la première tâche du
+        document (faux pour une partie de document traitée par parse_parallel).
+        """
+        classify = self.line_classifier.classify
+        process_group = self._process_classified_group
+        if self.instrumentation is not None:
+            classify = self.instrumentation.timed(STAGE_CLASSIFY, classify)
+            process_group = self.instrumentation.timed(STAGE_GROUPS, process_group)
+        current_header = None
+        current_body = []
         current_main_task = None
         
         for line in lines:
@@ -347,47 +390,296 @@ class TextToTeamworkConverter:
             if not line:
                 continue
             
-            # Ignorer les lignes qui ne sont pas des vraies tâches
-            if self.should_ignore_line(line):
-                # Ajouter à la tâche courante comme description si on en a une
-                if current_task_lines:
-                    current_task_lines.append(line)
-                continue
+            # Une seule classification par ligne : en-tête, champ, ligne ignorée ou continuation
+            classified = classify(line)
             
-            # Vérifier si c'est une nouvelle tâche
-            is_task = False
-            for pattern in self.task_patterns:
-                if re.match(pattern, line):
-                    is_task = True
-                    break
-            
-            if is_task:
+            if classified.kind == HEADER:
                 # Traiter la tâche précédente si elle existe
-                if current_task_lines:
-                    task_data = self.process_task_group(current_task_lines, project_title, current_main_task, len(tasks) == 0)
-                    tasks.extend(task_data)
+                if current_header is not None:
+                    yield from process_group(current_header, current_body, project_title, current_main_task, is_first_task)
+                    is_first_task = False
                 
                 # Déterminer si c'est une tâche principale
-                if self.is_main_task(line):
-                    current_main_task = self.clean_task_name(line)
-                else:
-                    current_main_task = None
+                current_main_task = classified.name if classified.is_main else None
                 
                 # Commencer une nouvelle tâche
-                current_task_lines = [line]
-            else:
-                # Ajouter à la tâche courante
-                if current_task_lines:
-                    current_task_lines.append(line)
+                current_header = classified
+                current_body = []
+            elif current_header is not None:
+                # Ajouter à la tâche courante (les lignes ignorées servent de description)
+                current_body.append(classified)
         
         # Traiter la dernière tâche
-        if current_task_lines:
-            task_data = self.process_task_group(current_task_lines, project_title, current_main_task, len(tasks) == 0)
-            tasks.extend(task_data)
+        if current_header is not None:
+            yield from process_group(current_header, current_body, project_title, current_main_task, is_first_task)
+    
+    @property
+    def incremental_stats(self) -> Dict[str, int]:
+        """Groupes du dernier parse incrémental sans état explicite, et groupes réutilisés."""
+        return self._incremental.stats
+    
+    def parse_incremental(self, text: str, state: Optional[IncrementalState] = None) -> List[TeamworkRow]:
+        """
+        Parse le texte en réutilisant le travail du parse précédent (édition dans l'interface).
+        
+        Le document est découpé en groupes de tâche (en-tête + lignes de détail), identifiés
+        par leur contenu : seuls les groupes nouveaux ou modifiés sont traités, les autres
+        reprennent leurs lignes Teamwork déjà construites. La classification des lignes
+        inchangées est également réutilisée. Résultat identique à list(iter_rows(text)).
+        
+        Les caches ne gardent que les entrées du dernier document : ceux de `state` s'il est
+        donné (un par session quand le convertisseur est partagé), sinon ceux du convertisseur.
+        Après une modification de la configuration (priority_keywords...), appeler
+        clear_incremental_cache() ou repartir d'un nouvel IncrementalState.
+        """
+        lines = text.split('\n')
+        project_title = self._project_title_of(lines)
+        
+        if state is None:
+            state = self._incremental
+        classify = self.line_classifier.classify
+        previous_lines = state.lines
+        previous_groups = state.groups
+        line_cache = {}
+        group_cache = {}
+        
+        # Découper en groupes : (en-tête, corps, contenu du groupe)
+        groups = []
+        header = None
+        body = []
+        key = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            classified = line_cache.get(line) or previous_lines.get(line)
+            if classified is None:
+                classified = classify(line)
+            line_cache[line] = classified
+            
+            if classified.kind == HEADER:
+                if header is not None:
+                    groups.append((header, body, tuple(key)))
+                header = classified
+                body = []
+                key = [line]
+            elif header is not None:
+                body.append(classified)
+                key.append(line)
+        if header is not None:
+            groups.append((header, body, tuple(key)))
+        
+        rows = []
+        reused = 0
+        for index, (header, body, key) in enumerate(groups):
+            current_main_task = header.name if header.is_main else None
+            if index == 0:
+                # La première tâche dépend aussi du titre du projet : toujours recalculée
+                rows.extend(self._process_classified_group(header, body, project_title, current_main_task, True))
+                continue
+            group_rows = group_cache.get(key) or previous_groups.get(key)
+            if group_rows is None:
+                group_rows = self._process_classified_group(header, body, project_title, current_main_task, False)
+            else:
+                reused += 1
+            group_cache[key] = group_rows
+            rows.extend(group_rows)
+        
+        # Remplacer les caches d'un coup (le convertisseur peut être partagé entre threads)
+        state.lines = line_cache
+        state.groups = group_cache
+        state.stats = {'groups': len(groups), 'reused_groups': reused}
+        return rows
+    
+    def parse_task_group(self, text: str) -> List[TeamworkRow]:
+        """
+        Parse un groupe de tâche isolé (en-tête + lignes de détail), hors de son document.
+        
+        Les lignes avant le premier en-tête sont ignorées et le groupe n'est jamais traité
+        comme la première tâche du projet (pas de titre de projet).
+        """
+        rows = []
+        header = None
+        body = []
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            classified = self.line_classifier.classify(line)
+            if classified.kind == HEADER:
+                if header is not None:
+                    rows.extend(self._process_classified_group(header, body, '', header.name if header.is_main else None, False))
+                header = classified
+                body = []
+            elif header is not None:
+                body.append(classified)
+        if header is not None:
+            rows.extend(self._process_classified_group(header, body, '', header.name if header.is_main else None, False))
+        return rows
+    
+    def parse_parallel(self, text: str, workers: Optional[int] = None,
+                       min_lines: int = PARALLEL_MIN_LINES) -> List[TeamworkRow]:
+        """
+        Parse un très gros document sur plusieurs processus (parser classique).
+        
+        Une fois le titre du projet connu, chaque groupe de tâche se parse
+        indépendamment : seul le premier groupe du document dépend du titre. Le document
+        est donc découpé en parties qui commencent toutes sur un en-tête de tâche (voir
+        shard_bounds), parsées en parallèle dans un pool de processus puis réassemblées
+        dans l'ordre. Résultat identique à list(iter_rows(text)).
+        
+        Args:
+            text: Texte du document
+            workers: Nombre de processus (défaut : nombre de cœurs)
+            min_lines: En dessous de ce nombre de lignes, parse séquentiel dans le processus courant
+        """
+        lines = text.split('\n')
+        workers = workers or os.cpu_count() or 1
+        bounds = self.shard_bounds(lines, workers) if workers > 1 and len(lines) >= min_lines else []
+        if len(bounds) <= 2:
+            return list(self.iter_tasks(lines))
+        
+        from concurrent.futures import ProcessPoolExecutor
+        
+        project_title = self._project_title_of(lines)
+        shards = [(lines[start:end], project_title, index == 0)
+                  for index, (start, end) in enumerate(zip(bounds, bounds[1:]))]
+        
+        # Copie sans l'IA ni les caches : la configuration du parser (motifs, priorités) est transmise aux processus
+        worker = copy.copy(self)
+        worker.use_ai = False
+        worker.ai_parser = None
+        worker._incremental = IncrementalState()
+        worker.instrumentation = None
+        worker.__dict__.pop('extract_priority', None)
+        
+        with stage(self.instrumentation, STAGE_PARALLEL, len(shards)):
+            with ProcessPoolExecutor(max_workers=min(workers, len(shards)), initializer=_init_shard_worker,
+                                     initargs=(worker,)) as pool:
+                # Les lignes reviennent sous forme de tuples (moins coûteux à transférer)
+                return [TeamworkRow(*values) for rows in pool.map(_parse_shard, shards) for values in rows]
+    
+    def shard_bounds(self, lines: List[str], shards: int) -> List[int]:
+        """
+        Découpe un document en `shards` parties de tailles proches, pour parse_parallel.
+        
+        Chaque coupure est avancée jusqu'au prochain en-tête de tâche (seules quelques
+        lignes sont classées) ; la première partie contient le début du document et son
+        premier en-tête. Les parties vides sont fusionnées.
+        
+        Returns:
+            Indices de début de chaque partie, suivis de len(lines)
+        """
+        classify = self.line_classifier.classify
+        
+        def next_header(index):
+            while index < len(lines):
+                line = lines[index].strip()
+                if line and classify(line).kind == HEADER:
+                    return index
+                index += 1
+            return index
+        
+        first_header = next_header(0)
+        bounds = [0]
+        remaining = len(lines) - first_header - 1
+        for k in range(1, shards):
+            cut = next_header(max(first_header + 1 + k * remaining // shards, bounds[-1] + 1))
+            if cut >= len(lines):
+                break
+            if cut > bounds[-1]:
+                bounds.append(cut)
+        bounds.append(len(lines))
+        return bounds
+    
+    def group_confidence(self, header: ClassifiedLine, body: List[ClassifiedLine]) -> float:
+        """
+        Confiance (0 à 1) dans le parse classique d'un groupe de tâche.
+        
+        Un groupe fiable a un en-tête numéroté ou codé (1., 2.5.1, DC-DM-001) et des
+        détails sous des libellés connus (Description :, Priorité : ...). Chaque indice
+        de texte mal structuré fait baisser la note : puce ou lettre au lieu d'un numéro,
+        nom de tâche démesuré, ligne orpheline (texte libre avant tout libellé, titre de
+        section au milieu d'une tâche) ou priorité non reconnue.
+        """
+        confidence = 1.0
+        if not header.code:
+            confidence -= 0.2
+        if len(header.name) > MAX_TASK_NAME_LENGTH:
+            confidence -= 0.4
+        
+        labelled = False
+        for line in body:
+            if line.kind == FIELD:
+                labelled = True
+                if line.field == 'priority' and line.value and not self.extract_priority(line.value):
+                    confidence -= 0.4
+            elif line.kind == IGNORE or not labelled:
+                confidence -= 0.25
+        return max(0.0, confidence)
+    
+    def plan_hybrid(self, text: str, threshold: float = HYBRID_CONFIDENCE_THRESHOLD
+                    ) -> Tuple[List[List[TeamworkRow]], List[Tuple[int, str]]]:
+        """
+        Parse classique groupe par groupe et sélection des groupes à confier à l'IA.
+        
+        Returns:
+            (lignes Teamwork de chaque groupe, groupes dont la confiance est sous
+            `threshold` sous forme de (index du groupe, texte du groupe))
+        """
+        lines = text.split('\n')
+        project_title = self._project_title_of(lines)
+        
+        group_rows = []
+        uncertain = []
+        classify = self.line_classifier.classify
+        header = None
+        body = []
+        group_lines = []
+        
+        def close_group():
+            index = len(group_rows)
+            current_main_task = header.name if header.is_main else None
+            group_rows.append(self._process_classified_group(header, body, project_title, current_main_task, index == 0))
+            if self.group_confidence(header, body) < threshold:
+                uncertain.append((index, '\n'.join(group_lines)))
         
-        return tasks
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            classified = classify(line)
+            if classified.kind == HEADER:
+                if header is not None:
+                    close_group()
+                header = classified
+                body = []
+                group_lines = [line]
+            elif header is not None:
+                body.append(classified)
+                group_lines.append(line)
+        if header is not None:
+            close_group()
+        return group_rows, uncertain
+    
+    def merge_hybrid(self, group_rows: List[List[TeamworkRow]], uncertain: List[Tuple[int, str]],
+                     ai_results: List[Optional[List[TeamworkRow]]]) -> List[TeamworkRow]:
+        """
+        Remplace les lignes des groupes incertains par celles de l'IA, dans l'ordre du document.
+        
+        Un groupe que l'IA n'a pas pu parser (None) garde les lignes du parser classique.
+        """
+        merged = list(group_rows)
+        for (index, _), ai_rows in zip(uncertain, ai_results):
+            if ai_rows is not None:
+                merged[index] = ai_rows
+        return [row for rows in merged for row in rows]
     
-    def process_task_group(self, task_lines: List[str], project_title: str, current_main_task: Optional[str], is_first_task: bool) -> List[Dict[str, str]]:
+    def clear_incremental_cache(self) -> None:
+        """Vide les caches du parsing incrémental."""
+        self._incremental = IncrementalState()
+    
+    def process_task_group(self, task_lines: List[str], project_title: str, current_main_task: Optional[str], is_first_task: bool) -> List[TeamworkRow]:
         """Traite un groupe de lignes représentant une tâche avec gestion hiérarchique."""
         if not task_lines:
             return []
@@ -397,74 +689,71 @@ class TextToTeamworkConverter:
         
         # Extraire les détails
         details = self.parse_task_details(task_lines)
+        
+        return self._build_task_entries(task_name, self.is_main_task(first_line), details, project_title, current_main_task, is_first_task)
+    
+    def _process_classified_group(self, header: ClassifiedLine, body: List[ClassifiedLine], project_title: str, current_main_task: Optional[str], is_first_task: bool) -> List[TeamworkRow]:
+        """Traite un groupe de lignes déjà classées (en-tête + corps)."""
+        details = self._collect_details(header.text, body)
+        return self._build_task_entries(header.name, header.is_main, details, project_title, current_main_task, is_first_task)
+    
+    def _build_task_entries(self, task_name: str, is_main: bool, details: Dict[str, str], project_title: str, current_main_task: Optional[str], is_first_task: bool) -> List[TeamworkRow]:
+        """Construit la ligne Teamwork d'une tâche principale ou d'une sous-tâche."""
         description = self.build_description(details)
+        priority = details['priority'] or ''
+        estimated_time = details.get('estimated_time', '') or ''
         
         # Si c'est une tâche principale (niveau 2, ex: 2.5)
-        if self.is_main_task(first_line):
-            # Créer une entrée pour la tâche principale (TASKLIST rempli, TASK vide)
-            main_task_entry = {
-                'TASKLIST': task_name,  # La tâche principale va dans TASKLIST
-                'TASK': '',  # TASK reste vide pour les tâches principales
-                'DESCRIPTION': description,
-                'ASSIGN TO': '',
-                'START DATE': '',
-                'DUE DATE': '',
-                'PRIORITY': details['priority'] or '',
-                'ESTIMATED TIME': details.get('estimated_time', '') or '',
-                'TAGS': '',
-                'STATUS': ''
-            }
-            return [main_task_entry]
-        
-        # Si c'est une sous-tâche (niveau 3+, ex: 2.5.1)
-        else:
-            # Créer l'entrée de sous-tâche
-            subtask_entry = {
-                'TASKLIST': '',  # TASKLIST vide pour les sous-tâches
-                'TASK': task_name,  # Le nom de la sous-tâche va dans TASK
-                'DESCRIPTION': description,
-                'ASSIGN TO': '',
-                'START DATE': '',
-                'DUE DATE': '',
-                'PRIORITY': details['priority'] or '',
-                'ESTIMATED TIME': details.get('estimated_time', '') or '',
-                'TAGS': '',
-                'STATUS': ''
-            }
-            
-            # Si c'est la première tâche du projet et qu'il n'y a pas de tâche principale
-            if is_first_task and not current_main_task:
-                subtask_entry['TASKLIST'] = project_title
-            
-            return [subtask_entry]
+        if is_main:
+            # La tâche principale va dans TASKLIST, TASK reste vide
+            return [TeamworkRow(task_name, '', description, priority=priority, estimated_time=estimated_time)]
+        
+        # Si c'est une sous-tâche (niveau 3+, ex: 2.5.1) : TASKLIST vide, sauf si c'est
+        # la première tâche du projet et qu'il n'y a pas de tâche principale
+        tasklist = project_title if is_first_task and not current_main_task else ''
+        return [TeamworkRow(tasklist, task_name, description, priority=priority, estimated_time=estimated_time)]
     
-    def convert_to_excel(self, text: str, output_path: str) -> bool:
-        """Convertit le texte en fichier Excel."""
+    def iter_rows(self, text: Union[str, Iterable[str]]) -> Iterator[TeamworkRow]:
+        """
+        Produit les lignes Teamwork du parser classique, priorités normalisées,
+        prêtes à être exportées (texte complet, fichier ouvert ou itérable de lignes).
+        """
+        lines = text.split('\n') if isinstance(text, str) else text
+        return self.iter_tasks(lines)
+    
+    def convert_to_excel(self, text: Union[str, Iterable[str]], output_path: str) -> bool:
+        """
+        Convertit le texte en fichier Excel.
+        
+        Les lignes passent directement du parser au classeur (mode write-only),
+        sans DataFrame intermédiaire. `text` peut aussi être un fichier ouvert
+        ou un itérable de lignes pour convertir de gros documents en mémoire constante.
+        """
+        return self.convert_to_file(text, output_path, 'xlsx')
+    
+    def convert_to_file(self, text: Union[str, Iterable[str]], output_path: str, fmt: Optional[str] = None) -> bool:
+        """
+        Convertit le texte en fichier Excel, CSV, JSONL ou Parquet (voir exporters.EXPORTERS).
+        
+        Comme convert_to_excel, les lignes passent du parser au fichier au fil de l'eau,
+        dans l'ordre des colonnes de `self.columns`. Sans `fmt`, le format est déduit de
+        l'extension de `output_path` (échec si elle n'est pas reconnue).
+        """
+        from exporters import format_for_path, write_rows
+        
         try:
-            # Parser le texte
-            tasks = self.parse_text_to_tasks(text)
+            fmt = fmt or format_for_path(output_path)
             
-            if not tasks:
-                return False
+            # Parser le texte au fil de l'eau
+            tasks = self.iter_rows(text)
             
-            # Créer le DataFrame
-            df = pd.DataFrame(tasks, columns=self.columns)
+            first_task = next(tasks, None)
+            if first_task is None:
+                return False
             
-            # Normaliser les priorités en anglais
-            df = self._normalize_priorities(df)
-            
-            # Sauvegarder en Excel
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Teamwork Import')
-                
-                # Ajuster la largeur des colonnes
-                worksheet = writer.sheets['Teamwork Import']
-                for idx, col in enumerate(df.columns):
-                    max_length = max(
-                        df[col].astype(str).map(len).max(),
-                        len(col)
-                    )
-                    worksheet.column_dimensions[chr(65 + idx)].width = min(max_length + 2, 50)
+            # Écrire le fichier (le parse au fil de l'eau est mesuré dans ses propres étapes)
+            with stage(self.instrumentation, STAGE_EXCEL if fmt == 'xlsx' else STAGE_EXPORT):
+                write_rows(chain([first_task], tasks), output_path, self.columns, fmt)
             
             return True
             
@@ -472,21 +761,38 @@ class TextToTeamworkConverter:
             print(f"Erreur lors de la conversion : {e}")
             return False
     
-    def preview_conversion(self, text: str) -> pd.DataFrame:
-        """Prévisualise la conversion sans sauvegarder."""
+    def preview_rows(self, text: str, incremental: Union[bool, IncrementalState] = False,
+                     on_row: Optional[Callable[[TeamworkRow], None]] = None) -> List[TeamworkRow]:
+        """
+        Lignes de la prévisualisation (IA si disponible, sinon parser classique), sans pandas.
+        
+        Avec `incremental`, le parser classique ne retraite que les groupes de tâche
+        modifiés depuis l'appel précédent (voir parse_incremental) ; un IncrementalState
+        garde ce travail hors du convertisseur (un par session). Avec `on_row`, la
+        réponse de l'IA est lue en streaming et chaque tâche est transmise dès sa réception
+        (en cas d'échec, le résultat retourné est celui du parser classique).
+        """
+        return self.preview_rows_with_source(text, incremental, on_row)[0]
+    
+    def preview_rows_with_source(self, text: str, incremental: Union[bool, IncrementalState] = False,
+                                 on_row: Optional[Callable[[TeamworkRow], None]] = None) -> Tuple[List[TeamworkRow], str]:
+        """
+        Comme preview_rows, avec l'origine des lignes : PREVIEW_AI, PREVIEW_CLASSIC, ou
+        PREVIEW_FALLBACK si l'IA était activée mais a échoué (erreur passagère possible :
+        un tel résultat ne doit pas être mémorisé comme celui de l'IA).
+        """
+        source = PREVIEW_CLASSIC
         
         # Essayer d'abord avec l'IA si disponible
         if self.use_ai and self.ai_parser:
+            source = PREVIEW_FALLBACK
             try:
                 project_title = self.extract_project_title(text)
-                ai_tasks = self.ai_parser.parse_with_ai(text, project_title)
+                ai_tasks = self.ai_parser.parse_with_ai(text, project_title, on_row=on_row)
                 
                 if ai_tasks:
                     print("✨ Parsing avec IA réussi")
-                    df = pd.DataFrame(ai_tasks, columns=self.columns)
-                    # Normaliser les priorités en anglais
-                    df = self._normalize_priorities(df)
-                    return df
+                    return ai_tasks, PREVIEW_AI
                 else:
                     print("⚠️ IA n'a pas pu parser - Fallback vers parser classique")
                     
@@ -495,12 +801,33 @@ class TextToTeamworkConverter:
         
         # Fallback vers le parser classique
         print("🔧 Utilisation du parser classique")
-        tasks = self.parse_text_to_tasks(text)
-        df = pd.DataFrame(tasks, columns=self.columns)
-        
-        # Normaliser les priorités en anglais
-        df = self._normalize_priorities(df)
-        return df
+        if incremental:
+            state = incremental if isinstance(incremental, IncrementalState) else None
+            return self.parse_incremental(text, state), source
+        return list(self.iter_rows(text)), source
+    
+    def preview_conversion(self, text: str, incremental: Union[bool, IncrementalState] = False,
+                           on_row: Optional[Callable[[TeamworkRow], None]] = None) -> 'pd.DataFrame':
+        """Prévisualise la conversion sans sauvegarder."""
+        return self.preview_conversion_with_source(text, incremental, on_row)[0]
+    
+    def preview_conversion_with_source(self, text: str, incremental: Union[bool, IncrementalState] = False,
+                                       on_row: Optional[Callable[[TeamworkRow], None]] = None) -> Tuple['pd.DataFrame', str]:
+        """Comme preview_conversion, avec l'origine des lignes (voir preview_rows_with_source)."""
+        # Priorités déjà normalisées en anglais à la construction des lignes
+        rows, source = self.preview_rows_with_source(text, incremental, on_row)
+        with stage(self.instrumentation, STAGE_DATAFRAME, len(rows)):
+            return rows_to_dataframe(rows), source
+
+def _init_shard_worker(converter: TextToTeamworkConverter) -> None:
+    """Reçoit le convertisseur une seule fois par processus du parsing parallèle."""
+    global _shard_converter
+    _shard_converter = converter
+
+def _parse_shard(shard: Tuple[List[str], str, bool]) -> List[Tuple[str, ...]]:
+    """Parse une partie de document dans un processus du pool (voir parse_parallel)."""
+    lines, project_title, is_first_task = shard
+    return [row.as_tuple() for row in _shard_converter._iter_task_rows(lines, project_title, is_first_task)]
 
 # Fonction utilitaire pour tester
 def test_converter():